@@ -0,0 +1,60 @@
+# Benchmark: rows/sec for single-row create_task vs batched create_tasks
+#
+# Run from the project root:
+#     python -m benchmarks.bench_bulk [single_rows] [batched_rows]
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from taskmaster import storage
+from taskmaster.models import Task, User
+from taskmaster.storage import DatabaseManager
+
+
+def make_tasks(user_id, count):
+    """Yield count new tasks for a user."""
+    for i in range(count):
+        yield Task(user_id, f"Task {i}", "Imported description", datetime(2030, 1, 1),
+                   "Medium", "Pending", "Work")
+
+
+def measure(label, func, count):
+    """Run func and print rows/sec for count rows."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<32} {count / elapsed:>10.0f} rows/sec")
+
+
+def main():
+    """Compare the single-row and batched insert paths."""
+    single = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    batched = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        storage.db_manager = manager
+        manager.init_db()
+        user = storage.create_user(User(username="bench", display_name="Bench"))
+
+        print("Inserts:")
+        measure(f"create_task x {single}",
+                lambda: [storage.create_task(task) for task in make_tasks(user.id, single)], single)
+        measure(f"create_tasks({batched})",
+                lambda: storage.create_tasks(make_tasks(user.id, batched)), batched)
+
+        print("Deletes:")
+        ids = [task.id for task in storage.iter_tasks(user.id)]
+        measure(f"delete_task x {single}",
+                lambda: [storage.delete_task(task_id) for task_id in ids[:single]], single)
+        rest = ids[single:]
+        measure(f"delete_tasks({len(rest)})", lambda: storage.delete_tasks(rest), len(rest))
+
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# Microbenchmark: pooled connections vs opening a connection per call
+#
+# Run from the project root:
+#     python -m benchmarks.bench_connections
+
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+from taskmaster import storage
+from taskmaster.models import User, Task
+from taskmaster.storage import DatabaseManager
+
+OPS = 2000
+
+
+def open_per_call_read(db_path, username):
+    """Old behavior: connect, run one SELECT, close."""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT id, username, display_name, created_at, updated_at
+        FROM users
+        WHERE username = ?
+    """, (username,))
+    cursor.fetchone()
+    conn.close()
+
+
+def open_per_call_write(db_path, task):
+    """Old behavior: connect, run one INSERT, commit, close."""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO tasks (user_id, title, description, due_date, priority, status, category, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (task.user_id, task.title, task.description, task.due_date,
+          task.priority, task.status, task.category, task.created_at, task.updated_at))
+    conn.commit()
+    conn.close()
+
+
+def pooled_read(username):
+    """Current behavior: one SELECT on a pooled connection (query cache emptied first)."""
+    storage.query_cache.clear()
+    storage.get_user_by_username(username)
+
+
+def measure(label, func, ops=OPS):
+    """Run func ops times and print ops/sec."""
+    start = time.perf_counter()
+    for _ in range(ops):
+        func()
+    elapsed = time.perf_counter() - start
+    rate = ops / elapsed
+    print(f"  {label:<28} {rate:>10.0f} ops/sec")
+    return rate
+
+
+def main():
+    """Compare ops/sec for reads and writes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        manager = DatabaseManager(db_path)
+        manager.init_db()
+
+        # Point the storage helpers at the benchmark database
+        storage.db_manager = manager
+
+        user = storage.create_user(User(username="bench", display_name="Bench"))
+        task = Task(user.id, "Benchmark task", "Description", datetime(2030, 1, 1),
+                    "Medium", "Pending", "Work")
+
+        print(f"Reads ({OPS} x get_user_by_username):")
+        old = measure("open per call", lambda: open_per_call_read(db_path, "bench"))
+        new = measure("pooled connection", lambda: pooled_read("bench"))
+        print(f"  speedup: {new / old:.1f}x")
+
+        print(f"Writes ({OPS} x create_task):")
+        old = measure("open per call", lambda: open_per_call_write(db_path, task))
+        new = measure("pooled connection", lambda: storage.create_task(task))
+        print(f"  speedup: {new / old:.1f}x")
+
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
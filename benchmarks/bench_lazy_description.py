@@ -0,0 +1,78 @@
+# Benchmark: loading task lists with and without their descriptions
+#
+# Run from the project root:
+#     python -m benchmarks.bench_lazy_description [tasks] [description_bytes]
+#
+# Reports load time and the memory held by the loaded Task list when
+# query_tasks selects every column vs only the columns the list shows,
+# plus the cost of fetching one description on demand (as TaskForm does).
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from taskmaster import storage
+from taskmaster.config import TASK_PAGE_SIZE
+from taskmaster.models import Task, User
+from taskmaster.storage import DatabaseManager
+
+
+def measure(label, load, repeat=5):
+    """
+    Print the best load time and the memory held by one loaded result.
+
+    The query cache is emptied before every load, so each one reads the
+    database.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        storage.query_cache.clear()
+        start = time.perf_counter()
+        load()
+        best = min(best, time.perf_counter() - start)
+
+    storage.query_cache.clear()
+    tracemalloc.start()
+    result = load()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"  {label:<32} {best * 1000:9.1f} ms  {held / 2 ** 20:8.2f} MiB held  ({len(result)} tasks)")
+
+
+def main():
+    """Compare full and list-column task loads."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 4096
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        storage.db_manager = manager
+        manager.init_db()
+
+        user = storage.create_user(User(username="bench", display_name="Bench"))
+        storage.create_tasks(Task(user.id, f"Task {i}", "x" * size, None, "Medium", "Pending", "Work")
+                             for i in range(count))
+
+        print(f"Loading {count} tasks with {size}-byte descriptions:")
+        measure("all tasks, with descriptions", lambda: storage.query_tasks(user.id, description=True))
+        measure("all tasks, list columns", lambda: storage.query_tasks(user.id))
+        measure("first page, with descriptions",
+                lambda: storage.query_tasks(user.id, limit=TASK_PAGE_SIZE, description=True))
+        measure("first page, list columns", lambda: storage.query_tasks(user.id, limit=TASK_PAGE_SIZE))
+
+        task_id = storage.query_tasks(user.id, limit=1)[0].id
+        repeat = 1000
+        start = time.perf_counter()
+        for _ in range(repeat):
+            storage.get_task_description(task_id)
+        elapsed = (time.perf_counter() - start) / repeat
+        print(f"  {'one description on demand':<32} {elapsed * 1000:9.3f} ms")
+
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# Benchmark: memory, construction and load time of the __slots__ Task model
+# vs the old classes
+#
+# Construction is timed on the same decoded rows for both models. Load time
+# also includes the SELECT and decoding: the legacy rows parse only the due
+# date and keep created_at/updated_at as strings, while Task.from_row rows
+# have sqlite3 decode three EPOCH columns, which costs about as much as
+# from_row saves. List views load LIST_COLUMNS instead: raw epoch seconds,
+# with the due date decoded through a cache and the other timestamps only
+# when read, which is where the load time is saved.
+#
+# Run from the project root:
+#     python -m benchmarks.bench_models [objects] [rows]
+
+import sqlite3
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from taskmaster import config
+from taskmaster.models import Task
+# Importing storage registers the datetime adapter and EPOCH converter
+from taskmaster.storage import TASK_COLUMNS, LIST_COLUMNS
+
+
+class LegacyBaseModel:
+    """Copy of the original dict-based BaseModel, for comparison."""
+
+    def __init__(self, id=None, created_at=None, updated_at=None):
+        self.id = id
+        self.created_at = created_at or datetime.utcnow()
+        self.updated_at = updated_at or datetime.utcnow()
+
+
+class LegacyTask(LegacyBaseModel):
+    """Copy of the original dict-based Task, for comparison."""
+
+    def __init__(self, user_id, title, description, due_date, priority, status, category,
+                 id=None, created_at=None, updated_at=None):
+        super().__init__(id, created_at, updated_at)
+        self.user_id = user_id
+        self.title = title
+        self.description = description
+        self.due_date = due_date
+        self.priority = priority if priority in config.PRIORITIES else "Medium"
+        self.status = status if status in config.STATUSES else "Pending"
+        self.category = category
+
+
+def legacy_row_to_task(row):
+    """The original get_tasks_for_user loop body."""
+    due_date = None
+    if row[4]:
+        try:
+            due_date = datetime.fromisoformat(row[4])
+        except (ValueError, AttributeError):
+            due_date = None
+    return LegacyTask(
+        user_id=row[1], title=row[2], description=row[3], due_date=due_date,
+        priority=row[5], status=row[6], category=row[7],
+        id=row[0], created_at=row[8], updated_at=row[9]
+    )
+
+
+def legacy_decoded_row_to_task(row):
+    """The original Task constructor applied to an already decoded row."""
+    return LegacyTask(
+        user_id=row[1], title=row[2], description=row[3], due_date=row[4],
+        priority=row[5], status=row[6], category=row[7],
+        id=row[0], created_at=row[8], updated_at=row[9]
+    )
+
+
+def make_rows(count, decoded=False):
+    """
+    Return count task rows shaped like a SELECT of TASK_COLUMNS.
+
+    Legacy rows hold timestamp strings; decoded rows hold datetimes, as
+    delivered by the EPOCH converter.
+    """
+    now = datetime.utcnow().replace(microsecond=0)
+    due = datetime(2030, 1, 1)
+    if not decoded:
+        now, due = str(now), str(due)
+    return [
+        (i, 1, f"Task {i}", "Description", due,
+         config.PRIORITIES[i % 3], config.STATUSES[i % 2], config.CATEGORIES[i % 3], now, now, 1)
+        for i in range(count)
+    ]
+
+
+def measure_memory(label, build, rows):
+    """Print bytes per object for objects built from rows."""
+    tracemalloc.start()
+    objects = [build(row) for row in rows]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_million = size / len(objects) * 1_000_000 / 2 ** 20
+    print(f"  {label:<24} {size / len(objects):8.0f} bytes/task  {per_million:8.0f} MiB per 1M tasks")
+    del objects
+
+
+def measure_build(label, build, rows):
+    """Print the best time to build objects from rows already in memory."""
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        [build(row) for row in rows]
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<24} {best * 1000:8.1f} ms per {len(rows)} rows")
+
+
+def measure_load(label, build, conn, count, columns=TASK_COLUMNS):
+    """Print the best time to select count rows and build objects (if build) from them."""
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        rows = conn.execute(f"SELECT {columns} FROM tasks").fetchall()
+        if build is not None:
+            [build(row) for row in rows]
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<24} {best * 1000:8.1f} ms per {count} rows")
+
+
+def make_table(count, timestamp_type, detect_types=0):
+    """Return an in-memory connection holding count task rows."""
+    conn = sqlite3.connect(":memory:", detect_types=detect_types)
+    conn.execute(f"""
+        CREATE TABLE tasks (id INTEGER PRIMARY KEY, user_id, title, description, due_date {timestamp_type},
+                            priority, status, category, created_at {timestamp_type}, updated_at {timestamp_type},
+                            version)
+    """)
+    conn.executemany("INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                     make_rows(count, decoded=timestamp_type == "EPOCH"))
+    return conn
+
+
+def main():
+    """Compare the legacy and slotted models."""
+    objects = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+
+    print(f"Memory ({objects} tasks, rows excluded):")
+    measure_memory("legacy Task", legacy_row_to_task, make_rows(objects))
+    measure_memory("Task.from_row", Task.from_row, make_rows(objects, decoded=True))
+
+    print(f"Construction ({count} decoded rows, no SQLite):")
+    rows = make_rows(count, decoded=True)
+    measure_build("legacy Task", legacy_decoded_row_to_task, rows)
+    measure_build("Task.from_row", Task.from_row, rows)
+    del rows
+
+    print(f"Load time ({count} rows from SQLite, including decoding):")
+    conn = make_table(count, "TEXT")
+    measure_load("TEXT rows only", None, conn, count)
+    measure_load("legacy Task", legacy_row_to_task, conn, count)
+    conn.close()
+
+    conn = make_table(count, "EPOCH", detect_types=sqlite3.PARSE_DECLTYPES)
+    measure_load("EPOCH rows only", None, conn, count)
+    measure_load("Task.from_row", Task.from_row, conn, count)
+    measure_load("LIST_COLUMNS rows only", None, conn, count, LIST_COLUMNS)
+    measure_load("Task.from_list_row", Task.from_list_row, conn, count, LIST_COLUMNS)
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
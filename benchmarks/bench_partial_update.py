@@ -0,0 +1,92 @@
+# Benchmark: completing tasks with full-row vs changed-column updates
+#
+# Run from the project root:
+#     python -m benchmarks.bench_partial_update [tasks] [description_bytes]
+#
+# Reports time and WAL growth for completing every task three ways: the old
+# full-row UPDATE, update_task writing only changed columns, and one
+# complete_tasks call.
+
+import os
+import sys
+import tempfile
+import time
+
+from taskmaster import storage
+from taskmaster.models import Task, User
+from taskmaster.storage import DatabaseManager
+
+
+def reset(manager, user_id):
+    """Mark every task pending again and empty the WAL."""
+    with manager.transaction(immediate=True) as conn:
+        conn.execute("UPDATE tasks SET status = 'Pending' WHERE user_id = ?", (user_id,))
+    with manager.connection() as conn:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def full_row_update(task):
+    """The old update_task: rewrite every column."""
+    with storage.db_manager.transaction(immediate=True) as conn:
+        conn.execute("""
+            UPDATE tasks
+            SET user_id = ?, title = ?, description = ?, due_date = ?,
+                priority = ?, status = ?, category = ?, updated_at = ?
+            WHERE id = ?
+        """, (task.user_id, task.title, task.description, task.due_date,
+              task.priority, task.status, task.category, task.updated_at, task.id))
+
+
+def measure(label, manager, func, count):
+    """Run func and print its time and how many bytes it added to the WAL."""
+    wal_path = manager.db_path + "-wal"
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    wal = os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+    print(f"  {label:<28} {count / elapsed:>10.0f} tasks/sec  {wal / 2 ** 20:8.1f} MiB WAL")
+
+
+def complete_each(tasks, update):
+    """Complete tasks one at a time with an update function."""
+    for task in tasks:
+        task.mark_completed()
+        update(task)
+
+
+def main():
+    """Compare ways of completing every task."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 4096
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        storage.db_manager = manager
+        manager.init_db()
+        # Keep the WAL from being checkpointed mid-run so its size is comparable
+        with manager.connection() as conn:
+            conn.execute("PRAGMA wal_autocheckpoint = 0")
+
+        user = storage.create_user(User(username="bench", display_name="Bench"))
+        storage.create_tasks(Task(user.id, f"Task {i}", "x" * size, None, "Medium", "Pending", "Work")
+                             for i in range(count))
+
+        print(f"Completing {count} tasks with {size}-byte descriptions:")
+        reset(manager, user.id)
+        measure("full-row update_task", manager,
+                lambda: complete_each(storage.query_tasks(user.id, description=True), full_row_update),
+                count)
+
+        reset(manager, user.id)
+        measure("changed-column update_task", manager,
+                lambda: complete_each(storage.query_tasks(user.id), storage.update_task), count)
+
+        reset(manager, user.id)
+        ids = [task.id for task in storage.query_tasks(user.id)]
+        measure("complete_tasks(ids)", manager, lambda: storage.complete_tasks(ids), count)
+
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# Load test: latency percentiles and requests/sec of the HTTP/JSON server
+#
+# Run from the project root:
+#     python -m benchmarks.bench_server [clients] [requests_per_client] [--url URL]
+#
+# Without --url a local server is started on a temporary database.
+
+import argparse
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from taskmaster import server, storage
+from taskmaster.models import Task, User
+from taskmaster.storage import DatabaseManager
+
+USERNAME = "loadtest"
+SEED_TASKS = 5000
+
+
+def request(conn, method, path, body=None):
+    """Send one request on a keep-alive connection and return the decoded JSON."""
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    conn.request(method, path, json.dumps(body) if body is not None else None, headers)
+    response = conn.getresponse()
+    data = response.read()
+    if response.status >= 400:
+        raise RuntimeError(f"{method} {path} -> {response.status} {data!r}")
+    return json.loads(data) if data else None
+
+
+def client(host, port, count, index, latencies):
+    """Run count mixed requests and record each latency in seconds."""
+    conn = http.client.HTTPConnection(host, port)
+    paths = [
+        f"/users/{USERNAME}/tasks?limit=100",
+        f"/users/{USERNAME}/tasks?status=Pending&order_by=due_date&limit=50",
+        f"/users/{USERNAME}/search?q=task+1",
+        f"/users/{USERNAME}/report",
+    ]
+
+    for i in range(count):
+        start = time.perf_counter()
+        if i % 10 == 0:
+            request(conn, "POST", f"/users/{USERNAME}/tasks",
+                    {"title": f"Load {index}-{i}", "priority": "High", "category": "Work"})
+        else:
+            request(conn, "GET", paths[i % len(paths)])
+        latencies.append(time.perf_counter() - start)
+
+    conn.close()
+
+
+def percentile(values, fraction):
+    """Return the value at a fraction (0-1) of the sorted values."""
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(host, port, clients, count):
+    """Run the load test against a server and print the results."""
+    conn = http.client.HTTPConnection(host, port)
+    try:
+        request(conn, "GET", f"/users/{USERNAME}")
+    except RuntimeError:
+        request(conn, "POST", "/users", {"username": USERNAME})
+    conn.close()
+
+    latencies = []
+    threads = [threading.Thread(target=client, args=(host, port, count, i, latencies))
+               for i in range(clients)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{len(latencies)} requests from {clients} clients in {elapsed:.2f}s")
+    print(f"  throughput: {len(latencies) / elapsed:10.0f} req/sec")
+    print(f"  p50:        {percentile(latencies, 0.50) * 1000:10.2f} ms")
+    print(f"  p99:        {percentile(latencies, 0.99) * 1000:10.2f} ms")
+
+
+def main():
+    """Load test a running server, or a local one on a temporary database."""
+    parser = argparse.ArgumentParser(description="Load test the TaskMaster JSON API.")
+    parser.add_argument("clients", type=int, nargs="?", default=8)
+    parser.add_argument("requests", type=int, nargs="?", default=500)
+    parser.add_argument("--url", help="base URL of a running server")
+    args = parser.parse_args()
+
+    if args.url:
+        url = urlsplit(args.url)
+        run(url.hostname, url.port or 80, args.clients, args.requests)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        storage.db_manager = manager
+        manager.init_db()
+
+        # Seed a user with enough tasks for realistic pages and reports
+        user = storage.create_user(User(username=USERNAME, display_name="Load Test"))
+        storage.create_tasks(
+            Task(user.id, f"Task {i}", "Seeded description", datetime(2030, 1, 1 + i % 28),
+                 ("Low", "Medium", "High")[i % 3], ("Pending", "Completed")[i % 2], "Work")
+            for i in range(SEED_TASKS)
+        )
+
+        httpd = server.make_server(port=0)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        host, port = httpd.server_address[:2]
+
+        try:
+            run(host, port, args.clients, args.requests)
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            manager.close()
+
+
+if __name__ == "__main__":
+    main()
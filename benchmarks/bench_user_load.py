@@ -0,0 +1,107 @@
+# Benchmark: per-user task load time with and without the per-user task indexes
+#
+# Run from the project root:
+#     python -m benchmarks.bench_user_load [total_rows] [users]
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from taskmaster import storage
+from taskmaster.config import PRIORITIES, STATUSES, CATEGORIES
+from taskmaster.storage import DatabaseManager
+
+SAMPLE_USERS = 50
+
+
+def fill_tasks(manager, total_rows, users):
+    """Insert users and total_rows tasks spread evenly across them."""
+    now = datetime.utcnow()
+    rng = random.Random(42)
+
+    with manager.transaction() as conn:
+        conn.executemany("""
+            INSERT INTO users (username, display_name, created_at, updated_at)
+            VALUES (?, ?, ?, ?)
+        """, ((f"user{i}", f"User {i}", now, now) for i in range(users)))
+
+        rows = (
+            (rng.randint(1, users), f"Task {i}", "Description",
+             now + timedelta(days=rng.randint(-30, 60)),
+             rng.choice(PRIORITIES), rng.choice(STATUSES), rng.choice(CATEGORIES),
+             now, now)
+            for i in range(total_rows)
+        )
+        conn.executemany("""
+            INSERT INTO tasks (user_id, title, description, due_date, priority, status, category, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
+
+def user_indexes(conn):
+    """
+    Return (name, sql) for every tasks index whose first column is user_id.
+
+    Read from sqlite_master, so indexes added by later migrations
+    (sort keys, partial indexes) are included.
+    """
+    indexes = []
+    for name, sql in conn.execute("""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND tbl_name = 'tasks' AND sql IS NOT NULL
+    """).fetchall():
+        first = conn.execute(f"PRAGMA index_info({name})").fetchone()
+        if first is not None and first[2] == "user_id":
+            indexes.append((name, sql))
+    return indexes
+
+
+def time_loads(user_ids):
+    """Return the mean seconds per get_tasks_for_user call (query cache emptied first)."""
+    start = time.perf_counter()
+    for user_id in user_ids:
+        storage.query_cache.clear()
+        storage.get_tasks_for_user(user_id)
+    return (time.perf_counter() - start) / len(user_ids)
+
+
+def main():
+    """Compare per-user load time with and without the task indexes."""
+    total_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        storage.db_manager = manager
+
+        # Start from the current schema without any index leading on user_id
+        manager.init_db()
+        with manager.connection() as conn:
+            indexes = user_indexes(conn)
+            for name, _ in indexes:
+                conn.execute(f"DROP INDEX {name}")
+
+        print(f"Filling {total_rows} tasks across {users} users...")
+        fill_tasks(manager, total_rows, users)
+        sample = random.Random(7).sample(range(1, users + 1), min(SAMPLE_USERS, users))
+
+        before = time_loads(sample)
+        print(f"  without indexes: {before * 1000:8.2f} ms per user")
+
+        # Recreate the dropped indexes from their original definitions
+        with manager.transaction() as conn:
+            for _, sql in indexes:
+                conn.execute(sql)
+            conn.execute("ANALYZE")
+        after = time_loads(sample)
+        print(f"  with indexes:    {after * 1000:8.2f} ms per user")
+        print(f"  speedup: {before / after:.1f}x")
+
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# Stress test: concurrent read-modify-write updates from several processes
+#
+# Run from the project root:
+#     python -m benchmarks.stress_concurrency [processes] [updates_per_process] [tasks]
+#
+# Every process repeatedly loads a random task, increments a counter kept in
+# its description and saves it. With optimistic locking a stale save raises
+# ConflictError and is retried, so the final counters must add up to every
+# update made. The same workload without the version check is run first to
+# show the lost updates it causes.
+
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+from taskmaster import storage
+from taskmaster.models import Task, User
+from taskmaster.storage import DatabaseManager, ConflictError
+
+
+def blind_update(task):
+    """The old update_task: overwrite the row whatever its version."""
+    with storage.db_manager.transaction(immediate=True) as conn:
+        conn.execute("UPDATE tasks SET description = ?, updated_at = ? WHERE id = ?",
+                     (task.description, task.updated_at, task.id))
+
+
+def worker(db_path, task_ids, updates, seed, checked):
+    """Increment random task counters; returns the number of conflicts retried."""
+    storage.db_manager = DatabaseManager(db_path, pool_size=1)
+    rng = random.Random(seed)
+    conflicts = 0
+
+    for _ in range(updates):
+        task_id = rng.choice(task_ids)
+        while True:
+            task = storage.get_task(task_id)
+            task.description = str(int(task.description) + 1)
+            task.touch()
+            try:
+                if checked:
+                    storage.update_task(task)
+                else:
+                    blind_update(task)
+                break
+            except ConflictError:
+                conflicts += 1
+
+    storage.db_manager.close()
+    return conflicts
+
+
+def run(db_path, task_ids, processes, updates, checked):
+    """Run the workload and print how many updates survived."""
+    # Reset every counter
+    with storage.db_manager.transaction(immediate=True) as conn:
+        conn.execute("UPDATE tasks SET description = '0'")
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        conflicts = pool.starmap(worker, [(db_path, task_ids, updates, seed, checked)
+                                          for seed in range(processes)])
+    elapsed = time.perf_counter() - start
+
+    with storage.db_manager.connection() as conn:
+        total = conn.execute("SELECT SUM(CAST(description AS INTEGER)) FROM tasks").fetchone()[0]
+
+    expected = processes * updates
+    label = "optimistic locking" if checked else "blind overwrites"
+    print(f"{label}:")
+    print(f"  {expected} updates in {elapsed:.2f}s ({expected / elapsed:.0f} updates/sec)")
+    print(f"  stored total {total}, lost {expected - total}, conflicts retried {sum(conflicts)}")
+    return expected - total
+
+
+def main():
+    """Compare blind overwrites with version-checked updates."""
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    updates = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    task_count = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "stress.db")
+        storage.db_manager = DatabaseManager(db_path)
+        storage.db_manager.init_db()
+
+        user = storage.create_user(User(username="stress", display_name="Stress"))
+        tasks = [Task(user.id, f"Counter {i}", "0", None, "Medium", "Pending", "Work")
+                 for i in range(task_count)]
+        storage.create_tasks(tasks)
+        task_ids = [task.id for task in tasks]
+
+        run(db_path, task_ids, processes, updates, checked=False)
+        lost = run(db_path, task_ids, processes, updates, checked=True)
+
+        storage.db_manager.close()
+
+    if lost:
+        print("FAILED: updates were lost with optimistic locking")
+        return 1
+    print("OK: no updates lost with optimistic locking")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,127 @@
 # Global in-memory state (current user, tasks)
 
+import bisect
+from collections import defaultdict
+
+
+class TaskStore:
+    """In-memory task collection indexed by id, status, priority, category and due date.
+
+    Every index is kept up to date by add, update, remove and complete, so
+    lookups by id are O(1) and filters are set intersections instead of
+    scans over every task.
+    """
+
+    def __init__(self, tasks=(), complete=False):
+        """
+        Initialize TaskStore with optional tasks.
+
+        complete marks the store as holding every task of the current user,
+        which lets callers filter in memory instead of querying storage.
+        """
+        self.complete = complete
+        self._by_id = {}
+        self._by_status = defaultdict(set)
+        self._by_priority = defaultdict(set)
+        self._by_category = defaultdict(set)
+
+        # Sorted (due_date, id) pairs for tasks that have a due date
+        self._by_due_date = []
+
+        # Indexed values per id, so updates can find the old entries
+        self._indexed = {}
+
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(list(self._by_id.values()))
+
+    def __contains__(self, task_id):
+        return task_id in self._by_id
+
+    def get(self, task_id):
+        """Return the task with the given id, or None."""
+        return self._by_id.get(task_id)
+
+    def _index(self, task):
+        """Add a task to the secondary indexes."""
+        self._by_status[task.status].add(task.id)
+        self._by_priority[task.priority].add(task.id)
+        self._by_category[task.category].add(task.id)
+        if task.due_date is not None:
+            bisect.insort(self._by_due_date, (task.due_date, task.id))
+        self._indexed[task.id] = (task.status, task.priority, task.category, task.due_date)
+
+    def _unindex(self, task_id):
+        """Remove a task from the secondary indexes."""
+        status, priority, category, due_date = self._indexed.pop(task_id)
+        self._by_status[status].discard(task_id)
+        self._by_priority[priority].discard(task_id)
+        self._by_category[category].discard(task_id)
+        if due_date is not None:
+            index = bisect.bisect_left(self._by_due_date, (due_date, task_id))
+            del self._by_due_date[index]
+
+    def add(self, task):
+        """Add a task, or re-index it if it is already present."""
+        if task.id in self._by_id:
+            self._unindex(task.id)
+        self._by_id[task.id] = task
+        self._index(task)
+
+    def update(self, task):
+        """Store the task's current field values in every index."""
+        self.add(task)
+
+    def remove(self, task_id):
+        """Remove a task by id. Missing ids are ignored."""
+        if self._by_id.pop(task_id, None) is not None:
+            self._unindex(task_id)
+
+    def clear(self):
+        """Remove every task."""
+        self.__init__()
+
+    def filter(self, status=None, priority=None, category=None, due_before=None):
+        """
+        Return tasks matching every given filter, ordered by id.
+
+        Filters left as None are not applied.
+        """
+        candidates = []
+        if status is not None:
+            candidates.append(self._by_status.get(status, set()))
+        if priority is not None:
+            candidates.append(self._by_priority.get(priority, set()))
+        if category is not None:
+            candidates.append(self._by_category.get(category, set()))
+        if due_before is not None:
+            end = bisect.bisect_left(self._by_due_date, (due_before,))
+            candidates.append({task_id for _, task_id in self._by_due_date[:end]})
+
+        if not candidates:
+            ids = self._by_id.keys()
+        else:
+            # Intersect starting from the smallest set
+            candidates.sort(key=len)
+            ids = candidates[0].intersection(*candidates[1:])
+
+        return [self._by_id[task_id] for task_id in sorted(ids)]
+
 
 class AppState:
     """Central in-memory state container for the application."""
-    
+
     def __init__(self):
         """Initialize AppState with empty/None values."""
         self.current_user = None
-        self.tasks = []
+        # Tasks loaded from storage for the current user
+        self.tasks = TaskStore()
 
 
 # Module-level app state instance
 app_state = AppState()
-
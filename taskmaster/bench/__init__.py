@@ -0,0 +1,9 @@
+# Benchmark suite: synthetic data generator and timing harnesses
+#
+# Usage:
+#     python -m taskmaster.bench generate DB_PATH --tasks 1000000 --users 1000
+#     python -m taskmaster.bench run --tasks 100000 --output results.json
+#     python -m taskmaster.bench compare before.json after.json
+
+from taskmaster.bench.datagen import DataProfile, fill_database
+from taskmaster.bench.harness import SCENARIOS, run_suite, write_results, compare_results
@@ -0,0 +1,121 @@
+# Command-line entry point: python -m taskmaster.bench
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from taskmaster.bench.datagen import DataProfile, fill_database
+from taskmaster.bench.harness import SCENARIOS, run_suite, write_results, compare_results
+from taskmaster.storage import DatabaseManager
+
+
+def _open(path):
+    """Return an initialized DatabaseManager for path."""
+    manager = DatabaseManager(path)
+    manager.init_db()
+    return manager
+
+
+def _fill(manager, args):
+    """Fill a database with synthetic data, printing progress."""
+    start = time.perf_counter()
+    step = max(args.tasks // 10, 1)
+    next_report = step
+
+    def progress(inserted):
+        nonlocal next_report
+        if inserted >= next_report or inserted == args.tasks:
+            next_report = inserted + step
+            rate = inserted / (time.perf_counter() - start)
+            print(f"  {inserted:>10} tasks  ({rate:.0f} rows/sec)", flush=True)
+
+    print(f"Generating {args.tasks} tasks for {args.users} users (seed {args.seed})...")
+    fill_database(manager, args.tasks, args.users, DataProfile(seed=args.seed), progress=progress)
+
+
+def command_generate(args):
+    """Fill a database file with synthetic data."""
+    manager = _open(args.db)
+    _fill(manager, args)
+    manager.close()
+    return 0
+
+
+def command_run(args):
+    """Run the scenarios and optionally write JSON results."""
+    names = args.scenarios.split(",") if args.scenarios else None
+    unknown = [name for name in names or () if name not in SCENARIOS]
+    if unknown:
+        print(f"Unknown scenarios: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})",
+              file=sys.stderr)
+        return 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.db:
+            manager = _open(args.db)
+        else:
+            manager = _open(os.path.join(tmp, "bench.db"))
+            _fill(manager, args)
+
+        print(f"Running {args.repeat} timed runs per scenario:")
+        results = run_suite(manager, names, repeat=args.repeat, warmup=args.warmup)
+        manager.close()
+
+    if args.output:
+        write_results(args.output, results)
+        print(f"Results written to {args.output}")
+    return 1 if any("failed" in result for result in results["results"].values()) else 0
+
+
+def command_compare(args):
+    """Compare two JSON result files."""
+    with open(args.before, encoding="utf-8") as f:
+        before = json.load(f)
+    with open(args.after, encoding="utf-8") as f:
+        after = json.load(f)
+
+    print(f"Median times, {args.before} -> {args.after}:")
+    for line in compare_results(before, after):
+        print(line)
+    return 0
+
+
+def main(argv=None):
+    """Parse arguments and run a command."""
+    parser = argparse.ArgumentParser(prog="python -m taskmaster.bench",
+                                     description="Benchmark TaskMaster on synthetic data.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_data_options(command):
+        command.add_argument("--tasks", type=int, default=100_000, help="tasks to generate")
+        command.add_argument("--users", type=int, default=100, help="users to generate")
+        command.add_argument("--seed", type=int, default=42, help="random seed")
+
+    generate = commands.add_parser("generate", help="fill a database file with synthetic data")
+    generate.add_argument("db", help="database file (created if missing)")
+    add_data_options(generate)
+    generate.set_defaults(func=command_generate)
+
+    run = commands.add_parser("run", help="time the hot paths")
+    run.add_argument("--db", help="existing benchmark database (it is modified); "
+                                  "default: generate a temporary one")
+    run.add_argument("--scenarios", help=f"comma-separated subset of: {', '.join(SCENARIOS)}")
+    run.add_argument("--repeat", type=int, default=5, help="timed runs per scenario")
+    run.add_argument("--warmup", type=int, default=1, help="untimed runs per scenario")
+    run.add_argument("--output", help="write results to this JSON file")
+    add_data_options(run)
+    run.set_defaults(func=command_run)
+
+    compare = commands.add_parser("compare", help="compare two JSON result files")
+    compare.add_argument("before")
+    compare.add_argument("after")
+    compare.set_defaults(func=command_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
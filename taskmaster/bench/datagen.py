@@ -0,0 +1,197 @@
+# Synthetic users and tasks for benchmarks
+
+import random
+from bisect import bisect
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import accumulate, islice
+from taskmaster.config import BULK_CHUNK_SIZE
+from taskmaster.storage import TASK_DAILY_SELECT, TASK_STATS_SELECT
+
+# Words used to build titles and descriptions
+WORDS = (
+    "review report draft meeting email budget plan update schedule client design test deploy "
+    "fix research notes slides invoice call follow-up outline submit read write study prepare "
+    "homework project paper lab groceries dentist gym laundry backup refactor release sprint"
+).split()
+
+
+class DataProfile:
+    """Distributions used to generate tasks.
+
+    Weights are relative (they need not sum to 1). Every random choice
+    comes from one seeded generator, so the same profile and seed always
+    produce the same data.
+    """
+
+    def __init__(self, seed=42):
+        """
+        Initialize DataProfile with default, roughly realistic distributions.
+
+        """
+        self.seed = seed
+        self.priorities = {"Low": 3, "Medium": 5, "High": 2}
+        self.statuses = {"Pending": 6, "Completed": 4}
+        self.categories = {"School": 3, "Work": 4, "Personal": 3, "": 1}
+
+        # Due dates: fraction without one, then days from now (uniform)
+        self.no_due_date = 0.2
+        self.due_days = (-60, 120)
+
+        # Description length in characters (log-normal, capped)
+        self.description_mu = 4.0
+        self.description_sigma = 1.2
+        self.description_max = 8192
+
+        # Task ownership: user i gets weight 1 / (i + 1) ** user_skew, so a
+        # few heavy users own most tasks (0 spreads them evenly)
+        self.user_skew = 1.0
+
+
+def _chooser(rng, weights):
+    """Return a function picking a key of weights with probability by weight."""
+    keys = list(weights)
+    cumulative = list(accumulate(weights[key] for key in keys))
+    total = cumulative[-1]
+    return lambda: keys[bisect(cumulative, rng.random() * total)]
+
+
+def _text(rng, length):
+    """Return about length characters of random words."""
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+
+def generate_users(count, start=0, now=None):
+    """Yield (username, display_name, created_at, updated_at) rows for count users."""
+    now = now or datetime.utcnow()
+    for i in range(start, start + count):
+        yield (f"user{i}", f"User {i}", now, now)
+
+
+def generate_task_rows(profile, user_ids, count, now=None):
+    """
+    Yield count task rows for the given users.
+
+    Rows are (user_id, title, description, due_date, priority, status,
+    category, created_at, updated_at) tuples, ready for executemany.
+    Completed tasks were last updated (completed) some time after they
+    were created.
+    """
+    rng = random.Random(profile.seed)
+    # Separate generator, so completion times do not shift the other choices
+    completion_rng = random.Random(profile.seed + 1)
+    now = (now or datetime.utcnow()).replace(microsecond=0)
+
+    priority = _chooser(rng, profile.priorities)
+    status = _chooser(rng, profile.statuses)
+    category = _chooser(rng, profile.categories)
+    user = _chooser(rng, {user_id: 1 / (rank + 1) ** profile.user_skew
+                          for rank, user_id in enumerate(user_ids)})
+    low, high = profile.due_days
+
+    for i in range(count):
+        due_date = None
+        if rng.random() >= profile.no_due_date:
+            due_date = now + timedelta(days=rng.randint(low, high))
+
+        length = min(int(rng.lognormvariate(profile.description_mu, profile.description_sigma)),
+                     profile.description_max)
+        created_at = now - timedelta(seconds=rng.randint(0, 365 * 86400))
+
+        owner = user()
+        title = f"{_text(rng, 24).capitalize()} #{i}"
+        description = _text(rng, length)
+        task_priority, task_status, task_category = priority(), status(), category()
+
+        updated_at = created_at
+        if task_status == "Completed":
+            age = int((now - created_at).total_seconds())
+            updated_at = created_at + timedelta(seconds=completion_rng.randint(0, age))
+
+        yield (owner, title, description, due_date, task_priority, task_status, task_category,
+               created_at, updated_at)
+
+
+@contextmanager
+def _bulk_load(manager):
+    """
+    Drop the tasks indexes and triggers for a with block, then rebuild them.
+
+    Building an index once over sorted data is far cheaper than updating
+    every index, the FTS table and the report tables for every inserted row. The
+    original definitions are read back from sqlite_master, so this stays
+    in step with the migrations.
+    """
+    with manager.transaction(immediate=True) as conn:
+        objects = conn.execute("""
+            SELECT type, name, sql FROM sqlite_master
+            WHERE tbl_name = 'tasks' AND type IN ('index', 'trigger') AND sql IS NOT NULL
+        """).fetchall()
+        for kind, name, _ in objects:
+            conn.execute(f"DROP {kind.upper()} {name}")
+
+    try:
+        yield
+    finally:
+        with manager.transaction(immediate=True) as conn:
+            for _, _, sql in objects:
+                conn.execute(sql)
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'").fetchone():
+                conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'task_stats'").fetchone():
+                conn.execute("DELETE FROM task_stats")
+                conn.execute(f"INSERT INTO task_stats (user_id, dimension, value, count) {TASK_STATS_SELECT}")
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'task_daily'").fetchone():
+                conn.execute("DELETE FROM task_daily")
+                conn.execute(f"""
+                    INSERT INTO task_daily (user_id, day, created, completed, open_delta, overdue_delta)
+                    {TASK_DAILY_SELECT}
+                """)
+
+
+def fill_database(manager, tasks, users, profile=None, chunk_size=BULK_CHUNK_SIZE, progress=None):
+    """
+    Insert users and synthetic tasks into an initialized database.
+
+    Rows are streamed into executemany batches of chunk_size, one
+    transaction each, so 10M rows need no more memory than 10k. Indexes
+    and the search index are rebuilt once at the end. progress(inserted)
+    is called after every batch. Returns the list of new user ids.
+    """
+    profile = profile or DataProfile()
+
+    with manager.transaction(immediate=True) as conn:
+        first = conn.execute("SELECT IFNULL(MAX(id), 0) FROM users").fetchone()[0]
+        conn.executemany("""
+            INSERT INTO users (username, display_name, created_at, updated_at)
+            VALUES (?, ?, ?, ?)
+        """, generate_users(users, start=first))
+        user_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE id > ? ORDER BY id", (first,))]
+
+    inserted = 0
+    rows = generate_task_rows(profile, user_ids, tasks)
+    with _bulk_load(manager):
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            with manager.transaction(immediate=True) as conn:
+                conn.executemany("""
+                    INSERT INTO tasks (user_id, title, description, due_date, priority, status, category, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, chunk)
+            inserted += len(chunk)
+            if progress:
+                progress(inserted)
+
+    # Refresh planner statistics for the new data
+    with manager.connection() as conn:
+        conn.execute("ANALYZE")
+
+    return user_ids
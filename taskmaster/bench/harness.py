@@ -0,0 +1,303 @@
+# Repeatable timing harnesses for the TaskMaster hot paths
+
+import json
+import platform
+import sqlite3
+import statistics
+import time
+from datetime import datetime
+from taskmaster import storage
+from taskmaster.app_state import app_state, TaskStore
+from taskmaster.config import PRIORITIES, TASK_PAGE_SIZE, TASK_WINDOW_PAGES
+from taskmaster.reports import build_trends, report_from_db, report_from_tasks
+from taskmaster.watcher import ChangeWatcher
+
+# Errors meaning a scenario cannot run here (e.g. Tk without a display),
+# as opposed to a scenario that ran and went wrong
+try:
+    from tkinter import TclError
+    SKIP_ERRORS = (ImportError, TclError)
+except ImportError:
+    SKIP_ERRORS = (ImportError,)
+
+
+class BenchContext:
+    """Data shared by the scenarios of one run.
+
+    The benchmarked user is the one owning the most tasks, which is the
+    worst case for loads, filters and reports.
+    """
+
+    def __init__(self, manager):
+        """
+        Initialize BenchContext by loading the heaviest user and their tasks.
+
+        """
+        with manager.connection() as conn:
+            row = conn.execute("""
+                SELECT users.id, users.username, COUNT(*)
+                FROM tasks JOIN users ON users.id = tasks.user_id
+                GROUP BY tasks.user_id
+                ORDER BY COUNT(*) DESC
+                LIMIT 1
+            """).fetchone()
+        if row is None:
+            raise ValueError("The database has no tasks to benchmark")
+
+        self.user_id, self.username, self.task_count = row
+        self.now = datetime.now()
+        self.tasks = storage.get_tasks_for_user(self.user_id)
+        self.store = TaskStore(self.tasks, complete=True)
+        self.edit_ids = [task.id for task in self.tasks[:100]]
+        self.edits = 0
+        self.priorities = {task.id: task.priority for task in self.tasks[:100]}
+        self.watcher = ChangeWatcher(self.user_id)
+        self.watcher.sync()
+        self._view = None
+
+    def view(self):
+        """Return a MainView on a withdrawn Tk root (created on first use)."""
+        if self._view is None:
+            import tkinter as tk
+            from taskmaster.gui.main_view import MainView
+
+            # MainView loads the current user's deadlines and follows their changes
+            app_state.current_user = storage.get_user_by_username(self.username)
+            root = tk.Tk()
+            root.withdraw()
+            self._view = MainView(root)
+            self._view.pack()
+        return self._view
+
+
+def scenario_login(ctx):
+    """Look up the user by name, as LoginView does."""
+    return storage.get_user_by_username(ctx.username)
+
+
+def scenario_initial_load(ctx):
+    """Load the first page of the task list."""
+    return storage.query_tasks(ctx.user_id, limit=TASK_PAGE_SIZE)
+
+
+def scenario_load_all(ctx):
+    """Load every task of the user."""
+    return storage.get_tasks_for_user(ctx.user_id)
+
+
+def scenario_refresh_cached(ctx):
+    """Reload the first page with nothing changed (served by the query cache)."""
+    return storage.query_tasks(ctx.user_id, limit=TASK_PAGE_SIZE)
+
+
+def scenario_filter_sql(ctx):
+    """Load the first page of a status + priority filter from SQLite."""
+    return storage.query_tasks(ctx.user_id, status="Pending", priority="High", limit=TASK_PAGE_SIZE)
+
+
+def scenario_filter_sorted(ctx):
+    """Load the first page sorted by due date."""
+    return storage.query_tasks(ctx.user_id, order_by="due_date", limit=TASK_PAGE_SIZE)
+
+
+def scenario_filter_memory(ctx):
+    """Filter the in-memory TaskStore by status and priority."""
+    return ctx.store.filter(status="Pending", priority="High")
+
+
+def scenario_search(ctx):
+    """Full-text search the user's tasks."""
+    return storage.search_tasks(ctx.user_id, "report", limit=TASK_PAGE_SIZE)
+
+
+def scenario_edit_complete(ctx):
+    """Edit a task's title (reopening it), then complete it."""
+    task_id = ctx.edit_ids[ctx.edits % len(ctx.edit_ids)]
+    ctx.edits += 1
+
+    # Reopen the task, so completing it is a real change on every pass
+    task = storage.get_task(task_id)
+    task.title = f"Edited {ctx.edits}"
+    task.status = "Pending"
+    task.touch()
+    storage.update_task(task)
+
+    versions = storage.complete_tasks([task_id])
+    if task_id not in versions:
+        raise RuntimeError(f"Completing task {task_id} changed nothing")
+    return versions
+
+
+def scenario_poll_idle(ctx):
+    """Check for changes by other clients when there are none."""
+    return ctx.watcher.poll()[0]
+
+
+def scenario_poll_changes(ctx):
+    """Edit a task, then fetch it as a change, as another window would."""
+    task_id = ctx.edit_ids[ctx.edits % len(ctx.edit_ids)]
+    ctx.edits += 1
+
+    # Move to the next priority, so every call writes a real change
+    current = ctx.priorities[task_id]
+    priority = PRIORITIES[(PRIORITIES.index(current) + 1) % len(PRIORITIES)]
+    storage.set_tasks_priority([task_id], priority)
+    ctx.priorities[task_id] = priority
+
+    tasks = ctx.watcher.poll()[0]
+    if not any(task.id == task_id for task in tasks):
+        raise RuntimeError(f"Polling did not return the edited task {task_id}")
+    return tasks
+
+
+def scenario_report_db(ctx):
+    """Compute every report breakdown with SQL."""
+    return report_from_db(ctx.user_id, ctx.now)
+
+
+def scenario_report_memory(ctx):
+    """Compute every report breakdown from the loaded tasks."""
+    return report_from_tasks(ctx.tasks, ctx.now)
+
+
+def scenario_report_trends(ctx):
+    """Build a year of daily trends from the rollup table."""
+    return build_trends(ctx.user_id, 365, "day", ctx.now.date())
+
+
+def scenario_treeview_populate(ctx):
+    """Fill the MainView Treeview with one full window of rows."""
+    view = ctx.view()
+    tasks = ctx.tasks[:TASK_PAGE_SIZE * TASK_WINDOW_PAGES]
+    view.populate_tasks(tasks)
+    view.update_idletasks()
+    return tasks
+
+
+# name -> scenario(ctx); each call is one timed iteration
+SCENARIOS = {
+    "login": scenario_login,
+    "initial_load": scenario_initial_load,
+    "load_all": scenario_load_all,
+    "refresh_cached": scenario_refresh_cached,
+    "filter_sql": scenario_filter_sql,
+    "filter_sorted": scenario_filter_sorted,
+    "filter_memory": scenario_filter_memory,
+    "search": scenario_search,
+    "edit_complete": scenario_edit_complete,
+    "poll_idle": scenario_poll_idle,
+    "poll_changes": scenario_poll_changes,
+    "report_db": scenario_report_db,
+    "report_memory": scenario_report_memory,
+    "report_trends": scenario_report_trends,
+    "treeview_populate": scenario_treeview_populate,
+}
+
+# Scenarios timed with a warm query cache; the others empty it before each
+# call so they keep measuring the queries themselves
+CACHED_SCENARIOS = {"refresh_cached"}
+
+
+def time_scenario(scenario, ctx, repeat=5, warmup=1, clear_cache=True):
+    """
+    Time repeat calls of a scenario after warmup untimed calls.
+
+    clear_cache empties the query cache before every call.
+
+    Returns a dict of timings in milliseconds, plus the number of rows the
+    scenario returned.
+    """
+    for _ in range(warmup):
+        if clear_cache:
+            storage.query_cache.clear()
+        scenario(ctx)
+
+    timings = []
+    result = None
+    for _ in range(repeat):
+        if clear_cache:
+            storage.query_cache.clear()
+        start = time.perf_counter()
+        result = scenario(ctx)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    return {
+        "runs": repeat,
+        "min_ms": timings[0],
+        "median_ms": statistics.median(timings),
+        "mean_ms": statistics.fmean(timings),
+        "max_ms": timings[-1],
+        "rows": len(result) if hasattr(result, "__len__") else None,
+    }
+
+
+def run_suite(manager, names=None, repeat=5, warmup=1, log=print):
+    """
+    Run scenarios against an initialized database.
+
+    names selects scenarios (default: all). A scenario that cannot run here
+    (e.g. no display for Tk) is recorded as skipped, and one that raises any
+    other error as failed, with the error instead of timings.
+    Returns {"meta": ..., "results": {name: timings}}.
+    """
+    storage.db_manager = manager
+    ctx = BenchContext(manager)
+
+    results = {}
+    for name in names or SCENARIOS:
+        try:
+            results[name] = time_scenario(SCENARIOS[name], ctx, repeat, warmup,
+                                          clear_cache=name not in CACHED_SCENARIOS)
+        except SKIP_ERRORS as error:
+            results[name] = {"skipped": f"{type(error).__name__}: {error}"}
+        except Exception as error:
+            results[name] = {"failed": f"{type(error).__name__}: {error}"}
+        if log:
+            log(_format_result(name, results[name]))
+
+    with manager.connection() as conn:
+        total_tasks = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    meta = {
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "total_tasks": total_tasks,
+        "user_tasks": ctx.task_count,
+        "repeat": repeat,
+    }
+    return {"meta": meta, "results": results}
+
+
+def _format_result(name, result):
+    """Return one printable line for a scenario result."""
+    if "skipped" in result:
+        return f"  {name:<20} skipped ({result['skipped']})"
+    if "failed" in result:
+        return f"  {name:<20} FAILED ({result['failed']})"
+    return (f"  {name:<20} median {result['median_ms']:9.2f} ms   "
+            f"min {result['min_ms']:9.2f} ms   rows {result['rows']}")
+
+
+def write_results(path, results):
+    """Write suite results as JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def compare_results(before, after):
+    """
+    Yield one line per scenario comparing the medians of two result sets.
+
+    Ratios above 1 mean the scenario got slower.
+    """
+    for name, new in after["results"].items():
+        old = before["results"].get(name)
+        if not old or "median_ms" not in old or "median_ms" not in new:
+            yield f"  {name:<20} (not comparable)"
+            continue
+        ratio = new["median_ms"] / old["median_ms"] if old["median_ms"] else float("inf")
+        yield (f"  {name:<20} {old['median_ms']:9.2f} ms -> {new['median_ms']:9.2f} ms   "
+               f"x{ratio:.2f}")
@@ -0,0 +1,162 @@
+# Bounded LRU/TTL cache of query results, invalidated by tags
+
+import threading
+import time
+from collections import OrderedDict
+from taskmaster.config import QUERY_CACHE_MAX_ROWS, QUERY_CACHE_TTL_SECONDS
+
+
+class QueryCache:
+    """Query results keyed by (sql, params), oldest-used evicted first.
+
+    Each entry holds a list of rows and a set of tags (such as
+    ("user", 3)); invalidate(tag) drops every entry carrying the tag.
+    Entries expire after ttl seconds, and the total number of cached rows
+    stays under max_rows.
+
+    version() returns a token that changes when the database may have been
+    changed by another connection (see DatabaseManager.data_version).
+    validate() compares it with the token seen last and empties the cache
+    on a change; mark_synced() records the current token after a write
+    whose effects were invalidated precisely.
+    """
+
+    def __init__(self, version, max_rows=QUERY_CACHE_MAX_ROWS, ttl=QUERY_CACHE_TTL_SECONDS):
+        """
+        Initialize an empty QueryCache.
+
+        """
+        self.version = version
+        self.max_rows = max_rows
+        self.ttl = ttl
+
+        # key -> (rows, expires_at, tags), least recently used first
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._rows = 0
+        self._seen = None
+
+        # Bumped by every invalidation, so a result read before one is
+        # never stored after it
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.external_changes = 0
+
+    def __len__(self):
+        """Number of cached results."""
+        return len(self._entries)
+
+    def validate(self):
+        """Empty the cache if the database changed since it was last checked."""
+        version = self.version()
+        with self._lock:
+            if version != self._seen:
+                if self._seen is not None and self._entries:
+                    self.external_changes += 1
+                self._clear()
+                self._seen = version
+
+    def mark_synced(self):
+        """Accept the current database version (after invalidating a write's effects)."""
+        version = self.version()
+        with self._lock:
+            self._seen = version
+
+    def get(self, key):
+        """
+        Return (rows, epoch) for a key.
+
+        rows is None on a miss; pass epoch to put with the freshly read rows.
+        """
+        self.validate()
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] < now:
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None, self._epoch
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], self._epoch
+
+    def put(self, key, rows, tags, epoch):
+        """
+        Cache rows read for key, unless something was invalidated since epoch.
+
+        Results larger than max_rows are not cached.
+        """
+        size = len(rows)
+        if size > self.max_rows:
+            return
+
+        with self._lock:
+            if epoch != self._epoch:
+                return
+            if key in self._entries:
+                self._drop(key)
+
+            self._entries[key] = (rows, time.monotonic() + self.ttl, frozenset(tags))
+            self._rows += size
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while self._rows > self.max_rows:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, *tags):
+        """Drop every entry carrying any of the tags."""
+        with self._lock:
+            self._epoch += 1
+            self.invalidations += 1
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    if key in self._entries:
+                        self._drop(key)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        """Drop every entry (lock held)."""
+        self._epoch += 1
+        self._entries.clear()
+        self._tags.clear()
+        self._rows = 0
+
+    def _drop(self, key):
+        """Remove one entry and its tag references (lock held)."""
+        rows, _, tags = self._entries.pop(key)
+        self._rows -= len(rows)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def stats(self):
+        """Return hit/miss counters and the current size as a JSON-ready dict."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "rows": self._rows,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "external_changes": self.external_changes,
+            }
@@ -12,3 +12,62 @@ PRIORITIES = ["Low", "Medium", "High"]
 STATUSES = ["Pending", "Completed"]
 CATEGORIES = ["School", "Work", "Personal"]
 
+
+# Database connection settings
+DB_POOL_SIZE = 5
+DB_STATEMENT_CACHE_SIZE = 256
+DB_CACHE_SIZE_KB = 16384
+DB_MMAP_SIZE = 256 * 1024 * 1024
+
+# Waiting for other writers: SQLite's busy timeout per attempt, then
+# retries of BEGIN IMMEDIATE with jittered exponential backoff
+DB_BUSY_TIMEOUT_MS = 5000
+DB_BUSY_RETRIES = 5
+DB_BUSY_BACKOFF_SECONDS = 0.05
+
+# Task list paging (rows per page, pages kept loaded in the Treeview)
+TASK_PAGE_SIZE = 100
+TASK_WINDOW_PAGES = 5
+
+# Cache of repeated reads (user lookups, task list pages): total rows kept,
+# and seconds before an entry is read again even if nothing was noticed
+QUERY_CACHE_MAX_ROWS = 20000
+QUERY_CACHE_TTL_SECONDS = 60
+
+# Background database worker
+DB_READ_WORKERS = 3
+DB_POLL_INTERVAL_MS = 20
+
+# Reports are computed in Python when at most this many tasks are in memory,
+# otherwise from the trigger-maintained task_stats counts
+REPORT_IN_MEMORY_LIMIT = 5000
+
+# Changes made by other windows and processes: how often the task list
+# checks for them, and the most changes applied one by one (more than
+# that reloads the list instead)
+CHANGE_POLL_INTERVAL_MS = 1000
+CHANGE_BATCH_LIMIT = 1000
+
+# Due date reminders: upcoming deadlines within this many hours are kept
+# in memory, and reloaded when that horizon is reached
+DUE_HORIZON_HOURS = 24
+
+# Rows per transaction for bulk inserts/updates/deletes and streaming reads
+BULK_CHUNK_SIZE = 1000
+
+# Task search box
+SEARCH_DEBOUNCE_MS = 250
+SEARCH_LIMIT = 200
+
+# Headless HTTP/JSON server (python -m taskmaster.server)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8080
+SERVER_MAX_PAGE_SIZE = 500
+
+# Instrumentation (taskmaster.instrumentation): TASKMASTER_INSTRUMENT=1 records
+# call timings; calls slower than SLOW_CALL_MS are logged with their SQL.
+# TASKMASTER_PROFILE=path captures a cProfile of the GUI run into path.
+INSTRUMENT = os.environ.get("TASKMASTER_INSTRUMENT", "") not in ("", "0")
+PROFILE_PATH = os.environ.get("TASKMASTER_PROFILE") or None
+SLOW_CALL_MS = 100
+SLOW_LOG_SIZE = 50
@@ -0,0 +1,115 @@
+# Background worker that runs storage calls off the Tk main thread
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from taskmaster.config import DB_READ_WORKERS, DB_POLL_INTERVAL_MS
+from taskmaster.utils import logger
+
+
+class DBWorker:
+    """Runs storage operations on background threads.
+
+    Writes run one at a time, in submission order, on a single writer
+    thread. Reads run concurrently on a small pool, but a read never starts
+    before the writes submitted ahead of it have finished, so a user's
+    operations keep their order. Callbacks are never run on the worker
+    threads: results are queued and delivered on the Tk thread by poll().
+    """
+
+    def __init__(self, max_readers=DB_READ_WORKERS):
+        """
+        Initialize DBWorker with the number of concurrent readers.
+
+        """
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="taskmaster-db-write")
+        self._readers = ThreadPoolExecutor(max_workers=max_readers, thread_name_prefix="taskmaster-db-read")
+
+        # (callback, value) pairs waiting to be delivered on the Tk thread
+        self._results = queue.SimpleQueue()
+
+        # Future of the most recently submitted write
+        self._last_write = None
+        self._lock = threading.Lock()
+
+        self._root = None
+
+    def _run(self, wait_for, func, args, kwargs, on_done, on_error):
+        """Run func on a worker thread and queue its result or error."""
+        if wait_for is not None:
+            # Only the ordering matters here; the write reports its own errors
+            try:
+                wait_for.result()
+            except Exception:
+                pass
+
+        try:
+            result = func(*args, **kwargs)
+        except Exception as error:
+            if on_error is None:
+                logger.exception("Background database call %s failed", getattr(func, "__name__", func))
+            else:
+                self._results.put((on_error, error))
+            raise
+
+        if on_done is not None:
+            self._results.put((on_done, result))
+        return result
+
+    def submit_read(self, func, *args, on_done=None, on_error=None, **kwargs):
+        """
+        Run a read-only storage call in the background.
+
+        on_done(result) or on_error(exception) is called on the Tk thread.
+        Returns the Future, which can be cancelled while still queued.
+        """
+        with self._lock:
+            wait_for = self._last_write
+        return self._readers.submit(self._run, wait_for, func, args, kwargs, on_done, on_error)
+
+    def submit_write(self, func, *args, on_done=None, on_error=None, **kwargs):
+        """
+        Run a storage call that writes, after every earlier write.
+
+        on_done(result) or on_error(exception) is called on the Tk thread.
+        """
+        with self._lock:
+            future = self._writer.submit(self._run, None, func, args, kwargs, on_done, on_error)
+            self._last_write = future
+        return future
+
+    def poll(self):
+        """Deliver every finished result to its callback (Tk thread only)."""
+        while True:
+            try:
+                callback, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            try:
+                callback(value)
+            except Exception:
+                logger.exception("Database callback %s failed", getattr(callback, "__name__", callback))
+
+    def start(self, root, interval=DB_POLL_INTERVAL_MS):
+        """Start delivering results with root.after polling."""
+        self._root = root
+
+        def tick():
+            if self._root is None:
+                return
+            self.poll()
+            root.after(interval, tick)
+
+        tick()
+
+    def shutdown(self):
+        """Stop polling and wait for queued operations to finish."""
+        self._root = None
+
+        # Let pending writes finish so no saved change is lost
+        self._readers.shutdown(wait=True, cancel_futures=True)
+        self._writer.shutdown(wait=True)
+
+
+db_worker = DBWorker()
@@ -1,14 +1,21 @@
 
 
 import tkinter as tk
-from taskmaster.storage import db_manager, get_tasks_for_user
+from taskmaster import instrumentation
+from taskmaster.config import PROFILE_PATH
+from taskmaster.storage import db_manager, query_cache
+from taskmaster.utils import logger
+from taskmaster.db_worker import db_worker
 from taskmaster.gui.login_view import LoginView
 from taskmaster.gui.main_view import MainView
-from taskmaster.app_state import app_state
 
 
 def main():
     """Main entry point for the GUI app"""
+    # Optional cProfile capture of the whole run (TASKMASTER_PROFILE=path)
+    if PROFILE_PATH:
+        instrumentation.start_profiling()
+    
     # Initialize database before starting GUI
     db_manager.init_db()
     
@@ -17,23 +24,27 @@ def main():
     root.title("Task Master")
     root.geometry("600x400")
     
+    # Deliver background database results on the Tk thread
+    db_worker.start(root)
+    
+    # F12 writes the instrumentation and query cache stats to the log
+    def dump_stats(event):
+        instrumentation.dump(with_plans=True)
+        logger.info("Query cache: %s", query_cache.stats())
+    
+    root.bind("<F12>", dump_stats)
+    
 
     def on_login_success():
-        # Load tasks for the current user
-        app_state.tasks = get_tasks_for_user(app_state.current_user.id)
-        
         # Hide/destroy LoginView
         login_view.pack_forget()
         login_view.destroy()
         
         root.geometry("700x600")
         
-        # Create and display MainView
+        # Create and display MainView (it loads the current user's tasks)
         main_view = MainView(root)
         main_view.pack(fill=tk.BOTH, expand=True)
-        
-        # Populate tasks in MainView
-        main_view.populate_tasks(app_state.tasks)
     
     # Create and display LoginView
     login_view = LoginView(root, on_login_success=on_login_success)
@@ -41,4 +52,13 @@ def main():
     
     # Start  main event loop
     root.mainloop()
+    
+    # Finish pending writes, then close pooled database connections
+    db_worker.shutdown()
+    
+    if instrumentation.enabled:
+        instrumentation.dump(with_plans=True)
+    if PROFILE_PATH:
+        instrumentation.stop_profiling(PROFILE_PATH)
+    db_manager.close()
 
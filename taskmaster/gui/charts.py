@@ -0,0 +1,88 @@
+# Small bar and line charts drawn on a Tk Canvas
+
+# Space around the plot area for the title, axis labels and legend
+_LEFT = 40
+_TOP = 22
+_RIGHT = 10
+_BOTTOM = 34
+
+_FONT = ("Arial", 8)
+_TITLE_FONT = ("Arial", 10, "bold")
+
+
+def _draw_frame(canvas, x, y, width, height, title, starts, maximum, series):
+    """
+    Draw the title, axes, labels and legend of a chart.
+
+    Returns the plot area as (left, top, right, bottom).
+    """
+    left, top = x + _LEFT, y + _TOP
+    right, bottom = x + width - _RIGHT, y + height - _BOTTOM
+
+    canvas.create_text(x + 4, y + 2, text=title, anchor="nw", font=_TITLE_FONT)
+    canvas.create_line(left, top, left, bottom, right, bottom, fill="#888888")
+    canvas.create_text(left - 4, top, text=str(maximum), anchor="e", font=_FONT)
+    canvas.create_text(left - 4, bottom, text="0", anchor="e", font=_FONT)
+
+    if starts:
+        canvas.create_text(left, bottom + 3, text=starts[0].strftime("%m/%d/%y"), anchor="nw", font=_FONT)
+        canvas.create_text(right, bottom + 3, text=starts[-1].strftime("%m/%d/%y"), anchor="ne", font=_FONT)
+
+    # Legend, right-aligned above the plot
+    legend_x = right
+    for label, _, color in reversed(series):
+        item = canvas.create_text(legend_x, y + 4, text=label, anchor="ne", font=_FONT)
+        text_left = canvas.bbox(item)[0]
+        canvas.create_rectangle(text_left - 12, y + 6, text_left - 4, y + 14, fill=color, outline="")
+        legend_x = text_left - 20
+
+    return left, top, right, bottom
+
+
+def draw_bar_chart(canvas, x, y, width, height, title, starts, series):
+    """
+    Draw grouped bars, one group per bucket.
+
+    series is a list of (label, values, color), each with one value per
+    entry of starts (the bucket dates). Bars narrow to a pixel when there
+    are more buckets than fit.
+    """
+    maximum = max((max(values, default=0) for _, values, _ in series), default=0) or 1
+    left, top, right, bottom = _draw_frame(canvas, x, y, width, height, title, starts, maximum, series)
+    if not starts:
+        return
+
+    slot = (right - left) / len(starts)
+    bar = max(slot * 0.8 / len(series), 1)
+    scale = (bottom - top) / maximum
+
+    for offset, (_, values, color) in enumerate(series):
+        for index, value in enumerate(values):
+            if value:
+                bar_left = left + index * slot + slot * 0.1 + offset * bar
+                canvas.create_rectangle(bar_left, bottom - value * scale, bar_left + bar, bottom,
+                                        fill=color, outline="")
+
+
+def draw_line_chart(canvas, x, y, width, height, title, starts, series):
+    """
+    Draw one line per series, with a point per bucket.
+
+    series is a list of (label, values, color) as in draw_bar_chart. Each
+    line is a single canvas item, so long series stay cheap to draw.
+    """
+    maximum = max((max(values, default=0) for _, values, _ in series), default=0) or 1
+    left, top, right, bottom = _draw_frame(canvas, x, y, width, height, title, starts, maximum, series)
+    if not starts:
+        return
+
+    step = (right - left) / max(len(starts) - 1, 1)
+    scale = (bottom - top) / maximum
+
+    for _, values, color in series:
+        points = []
+        for index, value in enumerate(values):
+            points.extend((left + index * step, bottom - value * scale))
+        if len(points) == 2:
+            points.extend(points)
+        canvas.create_line(*points, fill=color, width=2)
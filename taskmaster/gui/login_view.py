@@ -5,6 +5,16 @@ from tkinter import ttk
 from taskmaster.storage import get_user_by_username, create_user
 from taskmaster.models import User
 from taskmaster.app_state import app_state
+from taskmaster.db_worker import db_worker
+
+
+def _load_or_create_user(username):
+    """Fetch a user by username, creating it if needed (runs on the DB worker)."""
+    user = get_user_by_username(username)
+    if user is None:
+        user = User(username=username, display_name=username.capitalize())
+        create_user(user)
+    return user
 
 
 class LoginView(tk.Frame):
@@ -44,7 +54,7 @@ class LoginView(tk.Frame):
         tk.Frame(self, height=20).pack()
         
         # Login button
-        login_button = tk.Button(
+        self.login_button = tk.Button(
             self, 
             text="Login", 
             font=("Arial", 14, "bold"), 
@@ -55,7 +65,11 @@ class LoginView(tk.Frame):
             fg="black",
             activebackground="#45a049"
         )
-        login_button.pack(pady=10, ipadx=50, ipady=12)
+        self.login_button.pack(pady=10, ipadx=50, ipady=12)
+        
+        # Status line for pending/error messages
+        self.status_label = tk.Label(self, text="", font=("Arial", 11))
+        self.status_label.pack(pady=5)
     
     def _on_login_click(self):
         """Handle login button click."""
@@ -65,18 +79,24 @@ class LoginView(tk.Frame):
         if not username:
             return
         
-        # Try to get existing user
-        user = get_user_by_username(username)
-        
-        # If user doesn't exist, create new user
-        if user is None:
-            user = User(username=username, display_name=username.capitalize())
-            create_user(user)
-        
-  
+        # Look up (or create) the user in the background
+        self.login_button.config(state=tk.DISABLED)
+        self.status_label.config(text="Logging in...")
+        db_worker.submit_write(
+            _load_or_create_user, username,
+            on_done=self._on_user_loaded,
+            on_error=self._on_login_error
+        )
+    
+    def _on_user_loaded(self, user):
+        """Finish logging in once the user is loaded."""
         app_state.current_user = user
         
         # Call success callback if provided
         if self.on_login_success:
             self.on_login_success()
-
+    
+    def _on_login_error(self, error):
+        """Re-enable the form and report a failed login."""
+        self.login_button.config(state=tk.NORMAL)
+        self.status_label.config(text=f"Login failed: {error}")
@@ -1,15 +1,56 @@
 # Main task list view (CRUD + filters)
 
+import bisect
 import tkinter as tk
-from tkinter import ttk
-from taskmaster.storage import get_tasks_for_user, delete_task, update_task
-from taskmaster.app_state import app_state
+from datetime import datetime
+from tkinter import ttk, messagebox, simpledialog
+from taskmaster.config import (
+    PRIORITIES, CATEGORIES, TASK_PAGE_SIZE, TASK_WINDOW_PAGES, SEARCH_DEBOUNCE_MS, SEARCH_LIMIT,
+    CHANGE_POLL_INTERVAL_MS
+)
+from taskmaster.storage import (
+    query_tasks, search_tasks, delete_tasks, complete_tasks, set_tasks_priority, set_tasks_category,
+    task_sort_key, get_task, get_upcoming_due, ConflictError
+)
+from taskmaster.app_state import app_state, TaskStore
+from taskmaster.db_worker import db_worker
+from taskmaster.instrumentation import timed
+from taskmaster.scheduler import DueScheduler
+from taskmaster.watcher import ChangeWatcher
 from taskmaster.gui.task_form import TaskForm
 from taskmaster.gui.reports_view import ReportsView
 
 
+# Treeview column -> storage sort key
+SORT_COLUMNS = {
+    "Title": "title",
+    "Due Date": "due_date",
+    "Priority": "priority",
+    "Status": "status",
+    "Category": "category",
+}
+
+
+class _Descending:
+    """Sort key wrapper that reverses comparisons (for bisect on descending lists)."""
+    
+    __slots__ = ("key",)
+    
+    def __init__(self, key):
+        self.key = key
+    
+    def __lt__(self, other):
+        return other.key < self.key
+
+
 class MainView(tk.Frame):
-    """Main task list view with CRUD and filters."""
+    """Main task list view with CRUD and filters.
+    
+    The Treeview is virtualized: only a window of TASK_WINDOW_PAGES pages
+    is loaded at a time, and pages are fetched from storage (and dropped
+    from the other end) as the user scrolls. Pages are located with keyset
+    cursors on the current sort column, so every page costs the same.
+    """
     
     def __init__(self, parent):
         """
@@ -17,7 +58,46 @@ class MainView(tk.Frame):
         
         """
         super().__init__(parent)
+        
+        # Loaded rows in display order, and the keyset cursor of the row just
+        # before the window (None when the window starts at the first row)
+        self._window = []
+        self._window_after = None
+        
+        # Current sort column (a storage sort key) and direction
+        self._sort_column = "id"
+        self._descending = False
+        # True once the last page of the filtered list has been loaded
+        self._at_end = False
+        # True while a page load triggered by scrolling is in flight
+        self._page_loading = False
+        # Bumped on every full reload so stale page loads are dropped
+        self._generation = 0
+        # Background operations still in flight
+        self._pending_reads = 0
+        self._pending_writes = 0
+        
+        # Active search text, pending debounce job and in-flight search
+        self._search_text = ""
+        self._search_job = None
+        self._search_future = None
+        
         self._build_ui()
+        
+        # Wakes at the next deadline to mark rows overdue
+        self.scheduler = DueScheduler(self._on_tasks_due, self._load_due_dates, root=self)
+        self._load_due_dates()
+        
+        # Follows changes committed by other windows and processes. Synced
+        # on the DB worker (two O(1) lookups), and the tasks are first
+        # loaded once it is, so no change falls between the two
+        self.watcher = ChangeWatcher(app_state.current_user.id)
+        self._watching = True
+        self._watch_job = None
+        db_worker.submit_read(self.watcher.sync, on_done=self._on_watcher_synced,
+                              on_error=self._on_sync_error)
+        
+        self.bind("<Destroy>", self._on_destroy)
     
     def _build_ui(self):
         """Build the main view UI layout."""
@@ -30,26 +110,34 @@ class MainView(tk.Frame):
         self.status_filter = ttk.Combobox(filter_frame, values=["All", "Pending", "Completed"], state="readonly", width=15, font=("Arial", 10), height=10)
         self.status_filter.set("All")
         self.status_filter.pack(side=tk.LEFT, padx=5, ipady=3)
+        self.status_filter.bind("<<ComboboxSelected>>", lambda event: self._on_filter_change())
         
         # Priority filter
         tk.Label(filter_frame, text="Priority:", font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
         self.priority_filter = ttk.Combobox(filter_frame, values=["All", "Low", "Medium", "High"], state="readonly", width=15, font=("Arial", 10), height=10)
         self.priority_filter.set("All")
         self.priority_filter.pack(side=tk.LEFT, padx=5, ipady=3)
+        self.priority_filter.bind("<<ComboboxSelected>>", lambda event: self._on_filter_change())
+        
+        # Search box (queries as you type)
+        search_frame = tk.Frame(self)
+        search_frame.pack(fill=tk.X, padx=10)
+        tk.Label(search_frame, text="Search:", font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+        self.search_entry = tk.Entry(search_frame, font=("Arial", 10), relief=tk.SOLID, bd=1)
+        self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5, ipady=3)
+        self.search_entry.bind("<KeyRelease>", self._on_search_key)
         
         # Treeview for task list
         tree_frame = tk.Frame(self)
         tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # Create Treeview with columns
-        self.tree = ttk.Treeview(tree_frame, columns=("Title", "Due Date", "Priority", "Status", "Category"), show="headings")
+        # Create Treeview with columns (Ctrl/Shift-click selects several rows)
+        self.tree = ttk.Treeview(tree_frame, columns=("Title", "Due Date", "Priority", "Status", "Category"),
+                                 show="headings", selectmode="extended")
         
-        # Define column headings
-        self.tree.heading("Title", text="Title")
-        self.tree.heading("Due Date", text="Due Date")
-        self.tree.heading("Priority", text="Priority")
-        self.tree.heading("Status", text="Status")
-        self.tree.heading("Category", text="Category")
+        # Define column headings (click to sort)
+        for column in SORT_COLUMNS:
+            self.tree.heading(column, text=column, command=lambda c=column: self._on_sort(c))
         
         # Define column widths
         self.tree.column("Title", width=200)
@@ -59,11 +147,14 @@ class MainView(tk.Frame):
         self.tree.column("Category", width=100)
         
         # Add scrollbar
-        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
+        
+        # Open tasks past their due date
+        self.tree.tag_configure("overdue", foreground="#C62828")
         
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         # Button frame
         button_frame = tk.Frame(self)
@@ -80,65 +171,615 @@ class MainView(tk.Frame):
         tk.Button(button_frame, text="Edit Task", command=self._on_edit_task, **button_config).pack(side=tk.LEFT, padx=5, pady=5, ipadx=10, ipady=5)
         tk.Button(button_frame, text="Delete Task", command=self._on_delete_task, **button_config).pack(side=tk.LEFT, padx=5, pady=5, ipadx=10, ipady=5)
         tk.Button(button_frame, text="Complete Task", command=self._on_complete_task, **button_config).pack(side=tk.LEFT, padx=5, pady=5, ipadx=10, ipady=5)
+        
+        # Set Priority / Set Category menus apply to every selected task
+        priority_button = tk.Menubutton(button_frame, text="Set Priority", **button_config)
+        priority_menu = tk.Menu(priority_button, tearoff=False)
+        for priority in PRIORITIES:
+            priority_menu.add_command(label=priority, command=lambda p=priority: self._on_set_priority(p))
+        priority_button.config(menu=priority_menu)
+        priority_button.pack(side=tk.LEFT, padx=5, pady=5, ipadx=10, ipady=5)
+        
+        category_button = tk.Menubutton(button_frame, text="Set Category", **button_config)
+        category_menu = tk.Menu(category_button, tearoff=False)
+        for category in CATEGORIES:
+            category_menu.add_command(label=category, command=lambda c=category: self._on_set_category(c))
+        category_menu.add_separator()
+        category_menu.add_command(label="Other...", command=self._on_set_other_category)
+        category_button.config(menu=category_menu)
+        category_button.pack(side=tk.LEFT, padx=5, pady=5, ipadx=10, ipady=5)
+        
         tk.Button(button_frame, text="Refresh", command=self._on_refresh, **button_config).pack(side=tk.LEFT, padx=5, pady=5, ipadx=10, ipady=5)
         tk.Button(button_frame, text="Reports", command=self._on_reports, **button_config).pack(side=tk.LEFT, padx=5, pady=5, ipadx=10, ipady=5)
+        
+        # Status line for background loads and saves
+        self.status_label = tk.Label(self, text="", font=("Arial", 10), anchor=tk.W)
+        self.status_label.pack(fill=tk.X, padx=15, pady=(0, 5))
+    
+    def _row_values(self, task):
+        """Return the Treeview column values for a task."""
+        due_date_str = task.due_date.strftime("%m/%d/%Y") if task.due_date else ""
+        return (
+            task.title,
+            due_date_str,
+            task.priority,
+            task.status,
+            task.category or ""
+        )
     
+    def _row_tags(self, task, now=None):
+        """Return the Treeview tags for a task (marks tasks overdue at local time now)."""
+        return ("overdue",) if task.is_overdue(now or datetime.now()) else ()
+    
+    @timed()
     def populate_tasks(self, tasks):
         """
         Display a list of tasks in the Treeview.
         
         """
-        # Clear existing rows
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # Clear existing rows in a single call
+        self.tree.delete(*self.tree.get_children())
         
         # Insert new rows
+        now = datetime.now()
         for task in tasks:
+            self.tree.insert("", tk.END, iid=str(task.id), values=self._row_values(task),
+                             tags=self._row_tags(task, now))
     
-            due_date_str = task.due_date.strftime("%m/%d/%Y") if task.due_date else ""
-            
-            # Insert row with task data
-            self.tree.insert("", tk.END, iid=str(task.id), values=(
-                task.title,
-                due_date_str,
-                task.priority,
-                task.status,
-                task.category or ""
-            ))
-    
-    def get_filtered_tasks(self):
-        """
-        Filter tasks based on status and priority filters.
-
+    def _top_index(self):
+        """Return the index of the first visible row."""
+        count = len(self.tree.get_children())
+        return round(float(self.tree.yview()[0]) * count)
+    
+    def _scroll_to_index(self, index):
+        """Scroll so that the row at index is the first visible row."""
+        count = len(self.tree.get_children())
+        if count:
+            self.tree.yview_moveto(min(index, count) / count)
+    
+    def _on_tree_scroll(self, first, last):
+        """Update the scrollbar and fetch another page near either edge."""
+        self.scrollbar.set(first, last)
+        
+        count = len(self._window)
+        margin = TASK_PAGE_SIZE / 2
+        
+        if self._page_loading or self._generation == 0:
+            return
+        
+        if not self._at_end and float(last) * count >= count - margin:
+            self._page_loading = True
+            self._load_next_page()
+        elif self._window_after is not None and float(first) * count <= margin:
+            self._page_loading = True
+            self._load_previous_page()
+    
+    def _update_status(self):
+        """Show whether loads or saves are still in flight."""
+        if self._pending_reads:
+            self.status_label.config(text="Loading tasks...")
+        elif self._pending_writes:
+            self.status_label.config(text="Saving...")
+        else:
+            self.status_label.config(text="")
+    
+    def _on_db_error(self, error):
+        """Report a failed background database call."""
+        if isinstance(error, ConflictError):
+            # Another client changed the task: reload to show its version
+            self.status_label.config(text="A task was changed elsewhere; reloading")
+            self.refresh_tasks()
+            return
+        self.status_label.config(text=f"Database error: {error}")
+    
+    def _submit_read(self, func, *args, on_done, **kwargs):
+        """
+        Run a storage read on the DB worker while showing it as pending.
+        
+        on_done(result) is called on the Tk thread unless a newer load has
+        superseded this one. Returns the worker Future.
+        """
+        generation = self._generation
+        self._pending_reads += 1
+        self._update_status()
+        
+        def deliver(tasks):
+            self._pending_reads -= 1
+            self._update_status()
+            if generation == self._generation:
+                on_done(tasks)
+        
+        def fail(error):
+            self._pending_reads -= 1
+            self._page_loading = False
+            self._update_status()
+            if generation != self._generation:
+                return
+            self._on_db_error(error)
+            if not isinstance(error, ConflictError):
+                messagebox.showerror("Load Tasks", f"Could not load tasks: {error}", parent=self)
+        
+        return db_worker.submit_read(func, *args, on_done=deliver, on_error=fail, **kwargs)
+    
+    def _cancel_read(self, future):
+        """Cancel a read that has not started yet (it then never delivers)."""
+        if future is not None and future.cancel():
+            self._pending_reads -= 1
+            self._update_status()
+    
+    def get_filtered_tasks(self, limit, on_done, after=None, before=None):
+        """
+        Load a page of tasks matching the status and priority filters.
+        
+        The query runs on the background DB worker with the filters and the
+        current sort applied in SQL, so non-matching rows are never loaded.
+        after/before are keyset cursors (see storage.query_tasks).
+        on_done(tasks) is called on the Tk thread unless a newer load has
+        superseded this one. Not timed itself: it returns once the load is
+        queued, and query_tasks is timed where it runs.
         """
-        # Start with all tasks
-        filtered = app_state.tasks[:]
+        return self._submit_read(
+            query_tasks,
+            app_state.current_user.id,
+            status=self._filter_value(self.status_filter),
+            priority=self._filter_value(self.priority_filter),
+            order_by=self._order_by(),
+            limit=limit,
+            after=after,
+            before=before,
+            on_done=on_done
+        )
+    
+    def submit_write(self, func, *args, on_done=None):
+        """Run a storage write in the background and show it as pending."""
+        self._pending_writes += 1
+        self._update_status()
+        
+        def deliver(result):
+            self._pending_writes -= 1
+            self._update_status()
+            if on_done:
+                on_done(result)
+        
+        def fail(error):
+            self._pending_writes -= 1
+            self._on_db_error(error)
+        
+        db_worker.submit_write(func, *args, on_done=deliver, on_error=fail)
+    
+    def _store_tasks(self, tasks):
+        """Add newly loaded tasks to the in-memory store."""
+        for task in tasks:
+            app_state.tasks.add(task)
+    
+    def _forget_tasks(self, tasks):
+        """Remove trimmed tasks from the Treeview and the in-memory store."""
+        self.tree.delete(*[str(task.id) for task in tasks])
+        for task in tasks:
+            app_state.tasks.remove(task.id)
+        app_state.tasks.complete = False
+    
+    def _load_next_page(self):
+        """Load the page after the window in the background."""
+        self.get_filtered_tasks(
+            TASK_PAGE_SIZE, self._on_next_page_loaded,
+            after=task_sort_key(self._window[-1], self._sort_column) if self._window else self._window_after
+        )
+    
+    def _on_next_page_loaded(self, tasks):
+        """Append the next page and drop rows beyond the window at the top."""
+        self._page_loading = False
+        top_index = self._top_index()
+        self._at_end = len(tasks) < TASK_PAGE_SIZE
+        
+        # Rows added incrementally may already be present
+        tasks = [task for task in tasks if not self.tree.exists(str(task.id))]
+        now = datetime.now()
+        for task in tasks:
+            self.tree.insert("", tk.END, iid=str(task.id), values=self._row_values(task),
+                             tags=self._row_tags(task, now))
+        self._window.extend(tasks)
+        self._store_tasks(tasks)
+        
+        # Trim the top of the window
+        excess = len(self._window) - TASK_PAGE_SIZE * TASK_WINDOW_PAGES
+        if excess > 0:
+            self._window_after = task_sort_key(self._window[excess - 1], self._sort_column)
+            self._forget_tasks(self._window[:excess])
+            del self._window[:excess]
+            top_index -= excess
         
-        # Filter by status
-        status_filter = self.status_filter.get()
-        if status_filter != "All":
-            filtered = [t for t in filtered if t.status == status_filter]
+        self._scroll_to_index(top_index)
+    
+    def _load_previous_page(self):
+        """Load the page before the window in the background."""
+        # One extra row becomes the cursor in front of the new window
+        self.get_filtered_tasks(
+            TASK_PAGE_SIZE + 1, self._on_previous_page_loaded,
+            before=task_sort_key(self._window[0], self._sort_column)
+        )
+    
+    def _on_previous_page_loaded(self, tasks):
+        """Prepend the previous page and drop rows beyond the window at the bottom."""
+        self._page_loading = False
+        top_index = self._top_index()
+        
+        if len(tasks) > TASK_PAGE_SIZE:
+            self._window_after = task_sort_key(tasks[0], self._sort_column)
+            tasks = tasks[1:]
+        else:
+            self._window_after = None
+        tasks = [task for task in tasks if not self.tree.exists(str(task.id))]
         
-        # Filter by priority
-        priority_filter = self.priority_filter.get()
-        if priority_filter != "All":
-            filtered = [t for t in filtered if t.priority == priority_filter]
+        now = datetime.now()
+        for index, task in enumerate(tasks):
+            self.tree.insert("", index, iid=str(task.id), values=self._row_values(task),
+                             tags=self._row_tags(task, now))
+        self._window[:0] = tasks
+        self._store_tasks(tasks)
+        top_index += len(tasks)
         
-        return filtered
+        # Trim the bottom of the window
+        excess = len(self._window) - TASK_PAGE_SIZE * TASK_WINDOW_PAGES
+        if excess > 0:
+            self._forget_tasks(self._window[-excess:])
+            del self._window[-excess:]
+            self._at_end = False
+        
+        self._scroll_to_index(top_index)
+    
+    def _filter_value(self, combo):
+        """Return the selected filter value, or None for "All"."""
+        value = combo.get()
+        return None if value == "All" else value
     
     def refresh_tasks(self):
-        """Reload tasks from database and update the view."""
-      
-        app_state.tasks = get_tasks_for_user(app_state.current_user.id)
+        """Reload the loaded window from database, keeping scroll position and selection."""
+        # Supersede any load still in flight
+        self._generation += 1
+        self._page_loading = False
         
-        # Get filtered tasks and update the display
-        filtered_tasks = self.get_filtered_tasks()
-        self.populate_tasks(filtered_tasks)
+        if self._search_text:
+            self._load_search_results()
+            return
+        
+        limit = max(TASK_PAGE_SIZE, len(self._window))
+        self.get_filtered_tasks(
+            limit, lambda tasks: self._on_window_loaded(tasks, limit),
+            after=self._window_after
+        )
+    
+    def _on_window_loaded(self, tasks, limit):
+        """Replace the loaded window with freshly loaded tasks."""
+        # The window may now start past the end (e.g. after deletions)
+        if not tasks and self._window_after is not None:
+            self._window_after = None
+            self.get_filtered_tasks(limit, lambda tasks: self._on_window_loaded(tasks, limit))
+            return
+        
+        self._at_end = len(tasks) < limit
+        self._show_window(tasks)
+    
+    def _show_window(self, tasks):
+        """Display tasks as the loaded window, keeping scroll position and selection."""
+        selection = self.tree.selection()
+        top_index = self._top_index()
+        
+        self._window = tasks
+        self.populate_tasks(self._window)
+        
+        # An unfiltered window that covers the whole list holds every task
+        complete = self._window_after is None and self._at_end and \
+            not self._search_text and \
+            self._filter_value(self.status_filter) is None and \
+            self._filter_value(self.priority_filter) is None
+        app_state.tasks = TaskStore(self._window, complete=complete)
+        
+        # Restore selection for rows that are still present
+        self.tree.selection_set([iid for iid in selection if self.tree.exists(iid)])
+        self._scroll_to_index(top_index)
+    
+    def _on_search_key(self, event=None):
+        """Debounce keystrokes in the search box."""
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DEBOUNCE_MS, self._run_search)
+    
+    def _run_search(self):
+        """Search for the current text once typing has paused."""
+        self._search_job = None
+        text = self.search_entry.get().strip()
+        if text == self._search_text:
+            return
+        
+        # Clearing the box goes back to the paged task list
+        self._search_text = text
+        self._window_after = None
+        self._window = []
+        self.refresh_tasks()
+        self.tree.yview_moveto(0)
+    
+    def _load_search_results(self):
+        """Run the current search in the background, dropping any older one."""
+        self._cancel_read(self._search_future)
+        self._search_future = self._submit_read(
+            search_tasks,
+            app_state.current_user.id,
+            self._search_text,
+            limit=SEARCH_LIMIT,
+            status=self._filter_value(self.status_filter),
+            priority=self._filter_value(self.priority_filter),
+            on_done=self._on_search_loaded
+        )
+    
+    def _on_search_loaded(self, tasks):
+        """Show ranked search results (no paging)."""
+        self._search_future = None
+        self._window_after = None
+        self._at_end = True
+        
+        # Results are ranked by relevance unless a column sort is chosen
+        if self._sort_column != "id":
+            tasks.sort(key=self._sort_key)
+        self._show_window(tasks)
+    
+    def _on_filter_change(self):
+        """Reload from the first page when a filter changes."""
+        self._window_after = None
+        
+        if app_state.tasks.complete:
+            # Every task is already in memory: filter with the store's indexes
+            self._generation += 1
+            self._page_loading = False
+            self._window = app_state.tasks.filter(
+                status=self._filter_value(self.status_filter),
+                priority=self._filter_value(self.priority_filter)
+            )
+            self._window.sort(key=self._sort_key)
+            self._at_end = True
+            self.populate_tasks(self._window)
+        else:
+            self._window = []
+            self.populate_tasks(self._window)
+            self.refresh_tasks()
+        
+        self.tree.yview_moveto(0)
+    
+    def _matches_filters(self, task):
+        """Return True if a task passes the current status and priority filters."""
+        status = self._filter_value(self.status_filter)
+        priority = self._filter_value(self.priority_filter)
+        return (status is None or task.status == status) and \
+            (priority is None or task.priority == priority)
+    
+    def _order_by(self):
+        """Return the storage order_by value for the current sort."""
+        return ("-" if self._descending else "") + self._sort_column
+    
+    def _sort_key(self, task):
+        """Return the key the task list is ordered by (matches the SQL order)."""
+        key = task_sort_key(task, self._sort_column)
+        return _Descending(key) if self._descending else key
+    
+    def _on_sort(self, column):
+        """Sort by a column heading; clicking it again reverses the order."""
+        sort_column = SORT_COLUMNS[column]
+        if sort_column == self._sort_column:
+            self._descending = not self._descending
+        else:
+            self._sort_column = sort_column
+            self._descending = False
+        
+        # Show the direction on the active heading
+        for name in SORT_COLUMNS:
+            arrow = ""
+            if name == column:
+                arrow = " \u25bc" if self._descending else " \u25b2"
+            self.tree.heading(name, text=name + arrow)
+        
+        # Start again from the first page of the new order
+        self._window_after = None
+        self._window = []
+        self.populate_tasks(self._window)
+        self.refresh_tasks()
+        self.tree.yview_moveto(0)
+    
+    def _insert_row(self, task):
+        """Insert a task at its sorted position if it falls inside the loaded window."""
+        # Search results are ranked, not sorted; new rows show on the next search
+        if self._search_text:
+            return
+        
+        key = self._sort_key(task)
+        keys = [self._sort_key(t) for t in self._window]
+        index = bisect.bisect(keys, key)
+        
+        if index == 0 and self._window_after is not None:
+            after = self._window_after
+            if not (_Descending(after) if self._descending else after) < key:
+                # Sorts before the window: it will arrive with an earlier page
+                return
+        if index == len(keys) and not self._at_end:
+            # Sorts after the window: it will arrive with a later page
+            return
+        
+        self.tree.insert("", index, iid=str(task.id), values=self._row_values(task),
+                         tags=self._row_tags(task))
+        self._window.insert(index, task)
+    
+    def _moved(self, task):
+        """Return True if an updated task no longer sorts between its neighbours."""
+        for index, loaded in enumerate(self._window):
+            if loaded.id == task.id:
+                break
+        else:
+            return False
+        
+        self._window[index] = task
+        key = self._sort_key(task)
+        if index > 0 and key < self._sort_key(self._window[index - 1]):
+            return True
+        if index + 1 < len(self._window) and self._sort_key(self._window[index + 1]) < key:
+            return True
+        return False
+    
+    def _remove_row(self, task_id):
+        """Remove a task's row if it is loaded."""
+        self._remove_rows([task_id])
+    
+    def _remove_rows(self, task_ids):
+        """Remove the loaded rows of several tasks with one tree.delete call."""
+        iids = [str(task_id) for task_id in task_ids if self.tree.exists(str(task_id))]
+        if not iids:
+            return
+        
+        self.tree.delete(*iids)
+        removed = set(task_ids)
+        self._window = [task for task in self._window if task.id not in removed]
+    
+    def apply_changes(self, inserted=(), updated=(), deleted=()):
+        """
+        Update only the rows for tasks that changed.
+        
+        inserted and updated are Task objects, deleted is task ids. Each
+        change costs a single tree.insert, tree.item or tree.delete (rows
+        removed together share one delete), and the current filters decide
+        whether a row is shown at all.
+        """
+        for task_id in deleted:
+            app_state.tasks.remove(task_id)
+            self.scheduler.remove(task_id)
+        
+        # Updated tasks that no longer pass the filters leave with the deletions
+        hidden = []
+        for task in updated:
+            app_state.tasks.update(task)
+            self.scheduler.update(task)
+            if not self._matches_filters(task):
+                hidden.append(task.id)
+        self._remove_rows(list(deleted) + hidden)
+        
+        hidden = set(hidden)
+        for task in updated:
+            iid = str(task.id)
+            if task.id in hidden:
+                pass
+            elif self.tree.exists(iid):
+                if self._moved(task):
+                    # The sorted column changed: move the row to its new place
+                    self._remove_row(task.id)
+                    self._insert_row(task)
+                else:
+                    self.tree.item(iid, values=self._row_values(task), tags=self._row_tags(task))
+            else:
+                self._insert_row(task)
+        
+        for task in inserted:
+            if self.tree.exists(str(task.id)):
+                # A change poll showed the new task before its save returned
+                self.apply_changes(updated=[task])
+                continue
+            app_state.tasks.add(task)
+            self.scheduler.update(task)
+            if self._matches_filters(task):
+                self._insert_row(task)
+    
+    def _load_due_dates(self):
+        """Load the upcoming deadlines of the current user into the scheduler."""
+        start, end = self.scheduler.horizon()
+        db_worker.submit_read(
+            get_upcoming_due, app_state.current_user.id, start, end,
+            on_done=lambda entries: self.scheduler.reset(entries, end),
+            on_error=self._on_db_error
+        )
+    
+    def _on_tasks_due(self, task_ids):
+        """Mark rows whose deadline just passed as overdue and remind the user."""
+        now = datetime.now()
+        titles = []
+        for task_id in task_ids:
+            task = app_state.tasks.get(task_id)
+            iid = str(task_id)
+            if task is None:
+                continue
+            if self.tree.exists(iid):
+                self.tree.item(iid, tags=self._row_tags(task, now))
+            titles.append(task.title)
+        
+        self.bell()
+        if len(titles) == len(task_ids):
+            self.status_label.config(text="Now overdue: " + ", ".join(titles))
+        else:
+            self.status_label.config(text=f"{len(task_ids)} tasks are now overdue")
+    
+    def _on_watcher_synced(self, _):
+        """Load the tasks and start checking for changes made elsewhere."""
+        if not self._watching:
+            return
+        self.refresh_tasks()
+        self._schedule_poll()
+    
+    def _on_sync_error(self, error):
+        """Report a failed sync and carry on (the first poll syncs again)."""
+        self._on_db_error(error)
+        self._on_watcher_synced(None)
+    
+    def _poll_changes(self):
+        """Check for changes made elsewhere on the DB worker."""
+        self._watch_job = None
+        db_worker.submit_read(self.watcher.poll, on_done=self._on_changes_polled,
+                              on_error=self._on_poll_error)
+    
+    def _schedule_poll(self):
+        """Check for changes again after CHANGE_POLL_INTERVAL_MS."""
+        if self._watching:
+            self._watch_job = self.after(CHANGE_POLL_INTERVAL_MS, self._poll_changes)
+    
+    def _on_changes_polled(self, changes):
+        """Apply changes made elsewhere to the store and the loaded rows."""
+        self._schedule_poll()
+        if not self._watching:
+            return
+        if changes is None:
+            self.refresh_tasks()
+            return
+        
+        # This view's own saves are already applied (and carry the same version)
+        tasks, deleted = changes
+        updated = [task for task in tasks
+                   if task.id not in app_state.tasks or app_state.tasks.get(task.id).version < task.version]
+        deleted = [task_id for task_id in deleted if task_id in app_state.tasks]
+        if updated or deleted:
+            self.apply_changes(updated=updated, deleted=deleted)
+        
+        # Tasks that landed outside the loaded window arrive with their page;
+        # keep the store to the window, as trimming does
+        if not app_state.tasks.complete:
+            for task in updated:
+                if not self.tree.exists(str(task.id)):
+                    app_state.tasks.remove(task.id)
+    
+    def _on_poll_error(self, error):
+        """Report a failed check for changes and keep polling."""
+        self._schedule_poll()
+        if self._watching:
+            self._on_db_error(error)
+    
+    def _on_destroy(self, event):
+        """Stop the deadline timer and change polling with the view."""
+        if event.widget is not self:
+            return
+        self.scheduler.stop()
+        self._watching = False
+        if self._watch_job is not None:
+            self.after_cancel(self._watch_job)
+            self._watch_job = None
     
     def get_selected_task(self):
         """
         Get the Task object for the selected row.
-  
+        
+        With several rows selected this is the first of them.
         """
         # Get selected item from Treeview
         selection = self.tree.selection()
@@ -149,16 +790,17 @@ class MainView(tk.Frame):
         task_id_str = selection[0]
         task_id = int(task_id_str)
         
-        # Find the corresponding Task in app_state.tasks
-        for task in app_state.tasks:
-            if task.id == task_id:
-                return task
-        
-        return None
+        # Look up the corresponding Task by id
+        return app_state.tasks.get(task_id)
+    
+    def get_selected_tasks(self):
+        """Get the Task objects for every selected row, in display order."""
+        tasks = (app_state.tasks.get(int(iid)) for iid in self.tree.selection())
+        return [task for task in tasks if task is not None]
     
     def _on_add_task(self):
         """Handle Add Task button."""
-        TaskForm(self, on_save=self.refresh_tasks)
+        TaskForm(self, on_save=lambda task: self.apply_changes(inserted=[task]))
     
     def _on_edit_task(self):
         """Handle Edit Task button."""
@@ -167,39 +809,120 @@ class MainView(tk.Frame):
         
         # If a task is selected, open TaskForm in edit mode
         if selected_task:
-            TaskForm(self, task=selected_task, on_save=self.refresh_tasks)
+            TaskForm(self, task=selected_task,
+                     on_save=lambda task: self.apply_changes(updated=[task]),
+                     on_reload=lambda task: self.apply_changes(updated=[task]))
     
     def _on_delete_task(self):
-        """Handle Delete Task button."""
-
-        selected_task = self.get_selected_task()
+        """Handle Delete Task button (deletes every selected task)."""
+        task_ids = [task.id for task in self.get_selected_tasks()]
+        if not task_ids:
+            return
+        if len(task_ids) > 1 and not messagebox.askyesno(
+                "Delete Tasks", f"Delete {len(task_ids)} tasks?", parent=self):
+            return
         
-        # If a task is selected, delete it
-        if selected_task:
-            # Delete from database
-            delete_task(selected_task.id)
-            
-            
-            app_state.tasks.remove(selected_task)
+        # Delete in the background and remove the rows once that is stored,
+        # so a failed delete leaves the tasks listed
+        self.submit_write(delete_tasks, task_ids,
+                          on_done=lambda _: self.apply_changes(deleted=task_ids))
+    
+    def _apply_to_selected(self, change, save, *args):
+        """
+        Change copies of every selected task, then save them in one write.
+        
+        change(task) returns True if it modified the task. save(task_ids,
+        *args) runs as a single transaction on the DB worker, and the view
+        is updated once for all changed tasks when it has been stored, so a
+        failed write leaves the list showing what is saved.
+        """
+        copies = [task.copy() for task in self.get_selected_tasks()]
+        tasks = [task for task in copies if change(task)]
+        if not tasks:
+            return
+        
+        self.submit_write(save, [task.id for task in tasks], *args,
+                          on_done=lambda versions: self._on_bulk_saved(tasks, versions))
+    
+    def _on_bulk_saved(self, tasks, versions):
+        """
+        Show the tasks of a bulk save once it is stored.
+        
+        A copy only takes the written version when it is the one after its
+        own. Otherwise the task was changed elsewhere since it was loaded
+        (or already held the new values), so the stored task is reloaded
+        rather than claiming a version this copy never had.
+        """
+        saved = []
+        stale = []
+        for task in tasks:
+            if versions.get(task.id) != task.version + 1:
+                stale.append(task.id)
+                continue
+            task.version += 1
+            task.mark_clean()
             
-            # Refresh the view
-            self.populate_tasks(app_state.tasks)
+            # A change poll may already have shown this version or a later one
+            current = app_state.tasks.get(task.id)
+            if current is not None and current.version < task.version:
+                saved.append(task)
+        
+        if saved:
+            self.apply_changes(updated=saved)
+        if stale:
+            self._reload_tasks(stale)
+    
+    def _reload_tasks(self, task_ids):
+        """Load the stored versions of some tasks and show them (or drop deleted ones)."""
+        def load():
+            return [task for task in map(get_task, task_ids) if task is not None]
+        
+        def show(tasks):
+            found = {task.id for task in tasks}
+            self.apply_changes(updated=tasks,
+                               deleted=[task_id for task_id in task_ids if task_id not in found])
+        
+        self._submit_read(load, on_done=show)
     
     def _on_complete_task(self):
-        """Handle Complete Task button."""
-
-        selected_task = self.get_selected_task()
+        """Handle Complete Task button (completes every selected task)."""
+        def change(task):
+            if task.status == "Completed":
+                return False
+            task.mark_completed()
+            return True
         
-        # If a task is selected, mark it as completed
-        if selected_task:
-            # Mark task as completed 
-            selected_task.mark_completed()
-            
-            # Update in database
-            update_task(selected_task)
-            
-            # Refresh the view
-            self.refresh_tasks()
+        self._apply_to_selected(change, complete_tasks)
+    
+    def _on_set_priority(self, priority):
+        """Give every selected task a priority."""
+        def change(task):
+            if task.priority == priority:
+                return False
+            task.priority = priority
+            task.touch()
+            return True
+        
+        self._apply_to_selected(change, set_tasks_priority, priority)
+    
+    def _on_set_category(self, category):
+        """Give every selected task a category."""
+        def change(task):
+            if task.category == category:
+                return False
+            task.category = category
+            task.touch()
+            return True
+        
+        self._apply_to_selected(change, set_tasks_category, category)
+    
+    def _on_set_other_category(self):
+        """Ask for a category name and give it to every selected task."""
+        if not self.tree.selection():
+            return
+        category = simpledialog.askstring("Set Category", "Category:", parent=self)
+        if category and category.strip():
+            self._on_set_category(category.strip())
     
     def _on_refresh(self):
         """Handle Refresh button."""
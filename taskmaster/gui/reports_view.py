@@ -1,9 +1,17 @@
 # Visual report screen (charts, stats)
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 from taskmaster.app_state import app_state
-from taskmaster.reports import count_by_status, count_by_category
+from taskmaster.config import PRIORITIES, STATUSES, CATEGORIES
+from taskmaster.reports import build_report, build_trends, can_report_in_memory
+from taskmaster.db_worker import db_worker
+from taskmaster.gui.charts import draw_bar_chart, draw_line_chart
+
+
+# Trend range choices -> days (None for all history)
+TREND_RANGES = {"Last 30 days": 30, "Last 90 days": 90, "Last year": 365, "All time": None}
+TREND_BUCKETS = ["Day", "Week", "Month"]
 
 
 class ReportsView(tk.Toplevel):
@@ -16,40 +24,159 @@ class ReportsView(tk.Toplevel):
         """
         super().__init__(parent)
         self.title("Task Reports")
-        self.geometry("400x300")
+        self.geometry("1000x650")
+        
+        # Latest TrendSeries, and a counter to ignore results of stale requests
+        self._trends = None
+        self._trend_request = 0
         
         self._build_ui()
     
     def _build_ui(self):
-        """Build the reports UI and display statistics."""
+        """Build the reports UI and load statistics."""
         # Title
         tk.Label(self, text="Task Statistics", font=("Arial", 16, "bold")).pack(pady=20)
         
-        # Get statistics
-        status_counts = count_by_status(app_state.tasks)
-        category_counts = count_by_category(app_state.tasks)
+        # Close button
+        tk.Button(self, text="Close", font=("Arial", 10), command=self.destroy, width=10).pack(side=tk.BOTTOM, pady=20)
         
-        # Status section
-        tk.Label(self, text="By Status:", font=("Arial", 12, "bold")).pack(pady=(10, 5), anchor=tk.W, padx=20)
+        body = tk.Frame(self)
+        body.pack(fill=tk.BOTH, expand=True)
         
-        for status, count in status_counts.items():
-            tk.Label(self, text=f"  {status}: {count}", font=("Arial", 10)).pack(anchor=tk.W, padx=40)
+        # Statistics are rendered into this frame once loaded
+        self.content = tk.Frame(body, width=330)
+        self.content.pack(side=tk.LEFT, fill=tk.Y)
+        self.content.pack_propagate(False)
         
-        # If no statuses, show message
-        if not status_counts:
-            tk.Label(self, text="  No tasks", font=("Arial", 10)).pack(anchor=tk.W, padx=40)
+        # Trend charts, drawn from the daily rollup
+        trends = tk.Frame(body)
+        trends.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 20))
         
-        # Category section
-        tk.Label(self, text="By Category:", font=("Arial", 12, "bold")).pack(pady=(20, 5), anchor=tk.W, padx=20)
+        controls = tk.Frame(trends)
+        controls.pack(fill=tk.X, pady=(0, 5))
+        tk.Label(controls, text="Trends:", font=("Arial", 12, "bold")).pack(side=tk.LEFT)
+        self.range_combo = ttk.Combobox(controls, values=list(TREND_RANGES), state="readonly", width=12)
+        self.range_combo.set("Last 90 days")
+        self.range_combo.pack(side=tk.LEFT, padx=5)
+        self.bucket_combo = ttk.Combobox(controls, values=TREND_BUCKETS, state="readonly", width=8)
+        self.bucket_combo.set("Day")
+        self.bucket_combo.pack(side=tk.LEFT, padx=5)
+        self.range_combo.bind("<<ComboboxSelected>>", lambda event: self._load_trends())
+        self.bucket_combo.bind("<<ComboboxSelected>>", lambda event: self._load_trends())
         
-        for category, count in category_counts.items():
-            category_name = category if category else "(No Category)"
-            tk.Label(self, text=f"  {category_name}: {count}", font=("Arial", 10)).pack(anchor=tk.W, padx=40)
+        self.canvas = tk.Canvas(trends, bg="white", highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Configure>", lambda event: self._draw_trends())
         
-        # If no categories, show message
-        if not category_counts:
-            tk.Label(self, text="  No tasks", font=("Arial", 10)).pack(anchor=tk.W, padx=40)
+        # Count in memory when every task is already loaded, otherwise in SQL
+        user_id = app_state.current_user.id
+        tasks = app_state.tasks if app_state.tasks.complete else None
+        if can_report_in_memory(tasks):
+            self._show_report(build_report(user_id, tasks))
+        else:
+            tk.Label(self.content, text="Loading...", font=("Arial", 10)).pack()
+            db_worker.submit_read(build_report, user_id, on_done=self._show_report,
+                                  on_error=self._on_report_error)
         
-        # Close button
-        tk.Button(self, text="Close", font=("Arial", 10), command=self.destroy, width=10).pack(pady=20)
-
+        self._load_trends()
+    
+    def _load_trends(self):
+        """Fetch the trend series for the selected range and bucket size."""
+        self._trend_request += 1
+        request = self._trend_request
+        
+        self._trends = None
+        self.canvas.delete("all")
+        self.canvas.create_text(10, 10, text="Loading...", anchor=tk.NW, font=("Arial", 10))
+        
+        db_worker.submit_read(
+            build_trends, app_state.current_user.id,
+            TREND_RANGES[self.range_combo.get()], self.bucket_combo.get().lower(),
+            on_done=lambda trends: self._show_trends(request, trends),
+            on_error=lambda error: self._on_trends_error(request, error)
+        )
+    
+    def _show_trends(self, request, trends):
+        """Draw a loaded trend series unless a newer one was requested."""
+        if not self.winfo_exists() or request != self._trend_request:
+            return
+        self._trends = trends
+        self._draw_trends()
+    
+    def _on_trends_error(self, request, error):
+        """Replace the loading message when the latest trend request failed."""
+        if not self.winfo_exists() or request != self._trend_request:
+            return
+        self.canvas.delete("all")
+        self.canvas.create_text(10, 10, text=f"Trends could not be loaded: {error}",
+                                anchor=tk.NW, font=("Arial", 10))
+    
+    def _draw_trends(self):
+        """Redraw the trend charts to fit the canvas."""
+        trends = self._trends
+        if trends is None:
+            return
+        
+        self.canvas.delete("all")
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height() // 3
+        
+        draw_bar_chart(self.canvas, 0, 0, width, height, "Created vs. completed", trends.starts, [
+            ("Created", trends.created, "#2196F3"),
+            ("Completed", trends.completed, "#4CAF50"),
+        ])
+        draw_line_chart(self.canvas, 0, height, width, height, "Open tasks", trends.starts, [
+            ("Open", trends.open, "#FF9800"),
+        ])
+        draw_line_chart(self.canvas, 0, 2 * height, width, height, "Overdue backlog", trends.starts, [
+            ("Overdue", trends.overdue, "#F44336"),
+        ])
+    
+    def _show_section(self, title, counts, names=None):
+        """Display one breakdown, listing names first in the given order."""
+        tk.Label(self.content, text=title, font=("Arial", 12, "bold")).pack(pady=(10, 5), anchor=tk.W, padx=20)
+        
+        # If no tasks, show message
+        if not counts:
+            tk.Label(self.content, text="  No tasks", font=("Arial", 10)).pack(anchor=tk.W, padx=40)
+            return
+        
+        ordered = [name for name in (names or []) if name in counts]
+        ordered += [name for name in counts if name not in ordered]
+        for name in ordered:
+            label = name if name else "(No Category)"
+            tk.Label(self.content, text=f"  {label}: {counts[name]}", font=("Arial", 10)).pack(anchor=tk.W, padx=40)
+    
+    def _on_report_error(self, error):
+        """Replace the loading message when the statistics could not be loaded."""
+        if not self.winfo_exists():
+            return
+        
+        for child in self.content.winfo_children():
+            child.destroy()
+        tk.Label(self.content, text="Statistics could not be loaded.", font=("Arial", 10)).pack()
+        messagebox.showerror("Task Reports", f"Could not load statistics: {error}", parent=self)
+    
+    def _show_report(self, report):
+        """Display every breakdown of a TaskReport."""
+        # The window may have been closed while loading
+        if not self.winfo_exists():
+            return
+        
+        for child in self.content.winfo_children():
+            child.destroy()
+        
+        # Summary section
+        tk.Label(self.content, text="Summary:", font=("Arial", 12, "bold")).pack(pady=(0, 5), anchor=tk.W, padx=20)
+        summary = [
+            f"Total: {report.total}",
+            f"Completed: {report.completed} ({report.completion_rate:.0%})",
+            f"Overdue: {report.overdue}",
+            f"Due this week: {report.due_this_week}",
+        ]
+        for line in summary:
+            tk.Label(self.content, text=f"  {line}", font=("Arial", 10)).pack(anchor=tk.W, padx=40)
+        
+        self._show_section("By Status:", report.by_status, STATUSES)
+        self._show_section("By Priority:", report.by_priority, PRIORITIES)
+        self._show_section("By Category:", report.by_category, CATEGORIES)
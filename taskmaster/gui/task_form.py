@@ -4,21 +4,27 @@ import tkinter as tk
 from tkinter import ttk
 from taskmaster.config import PRIORITIES
 from taskmaster.models import Task
-from taskmaster.storage import create_task, update_task
+from taskmaster.storage import create_task, update_task, get_task, get_task_description, ConflictError
 from taskmaster.app_state import app_state
+from taskmaster.db_worker import db_worker
 from taskmaster.utils import parse_due_date
 
 
 class TaskForm(tk.Toplevel):
     """Dialog to add or edit a task."""
     
-    def __init__(self, parent, on_save=None, task=None):
+    def __init__(self, parent, on_save=None, task=None, on_reload=None):
         """
         Initialize TaskForm.
         
+        on_save is called with the saved Task after it is written. The
+        form edits a copy of task, so task itself only changes through
+        on_save. on_reload is called with the stored task when a save
+        conflicts and the form shows the stored version instead.
         """
         super().__init__(parent)
         self.on_save = on_save
+        self.on_reload = on_reload
         self.task = task
         
         self.title("Add Task" if task is None else "Edit Task")
@@ -71,16 +77,30 @@ class TaskForm(tk.Toplevel):
             'bd': 2
         }
         
-        tk.Button(button_frame, text="Save", command=self._on_save_click, bg='#4CAF50', fg='black', **button_config).pack(side=tk.LEFT, padx=5, ipadx=20, ipady=8)
+        self.save_button = tk.Button(button_frame, text="Save", command=self._on_save_click, bg='#4CAF50', fg='black', **button_config)
+        self.save_button.pack(side=tk.LEFT, padx=5, ipadx=20, ipady=8)
         tk.Button(button_frame, text="Cancel", command=self._on_cancel_click, **button_config).pack(side=tk.LEFT, padx=5, ipadx=20, ipady=8)
+        
+        # Status line for pending/error messages
+        self.status_label = tk.Label(self, text="", font=("Arial", 10))
+        self.status_label.pack(pady=(0, 10))
     
     def _populate_fields(self):
         """Pre-fill fields with task data for edit mode."""
         # Set title
         self.title_entry.insert(0, self.task.title)
         
-        # Set description
-        self.description_text.insert("1.0", self.task.description)
+        # Set description; tasks from the list are loaded without one, so
+        # fetch it in the background and keep Save off until it arrives
+        if self.task.description_loaded:
+            self.description_text.insert("1.0", self.task.description or "")
+        else:
+            self.description_text.config(state=tk.DISABLED)
+            self.save_button.config(state=tk.DISABLED)
+            self.status_label.config(text="Loading description...")
+            db_worker.submit_read(get_task_description, self.task.id,
+                                  on_done=self._on_description_loaded,
+                                  on_error=self._on_description_error)
         
         # Set due date
         if self.task.due_date:
@@ -93,6 +113,32 @@ class TaskForm(tk.Toplevel):
         if self.task.category:
             self.category_entry.insert(0, self.task.category)
     
+    def _clear_fields(self):
+        """Empty every field (before showing another version of the task)."""
+        self.title_entry.delete(0, tk.END)
+        self.description_text.config(state=tk.NORMAL)
+        self.description_text.delete("1.0", tk.END)
+        self.due_date_entry.delete(0, tk.END)
+        self.category_entry.delete(0, tk.END)
+    
+    def _on_description_loaded(self, description):
+        """Show the fetched description and allow saving."""
+        if not self.winfo_exists():
+            return
+        
+        self.task.set_description_loaded(description)
+        self.description_text.config(state=tk.NORMAL)
+        self.description_text.insert("1.0", description or "")
+        self.save_button.config(state=tk.NORMAL)
+        self.status_label.config(text="")
+    
+    def _on_description_error(self, error):
+        """Report a description that could not be loaded; saving stays off."""
+        if not self.winfo_exists():
+            return
+        
+        self.status_label.config(text=f"Could not load description: {error}")
+    
     def _on_save_click(self):
         """Handle Save button click."""
         if self.task is None:
@@ -129,18 +175,8 @@ class TaskForm(tk.Toplevel):
             category=category
         )
         
-        # Save to database
-        create_task(task)
-        
-        # Add to app state
-        app_state.tasks.append(task)
-        
-        # Call on_save callback if provided
-        if self.on_save:
-            self.on_save()
-        
-        # Close dialog
-        self.destroy()
+        # Save to database in the background
+        self._submit(create_task, task)
     
     def _update_existing_task(self):
         """Update an existing task in the database."""
@@ -158,26 +194,76 @@ class TaskForm(tk.Toplevel):
         # Parse due date
         due_date = parse_due_date(due_date_str)
         
-        # Update task attributes
-        self.task.title = title
-        self.task.description = description
-        self.task.due_date = due_date
-        self.task.priority = priority
-        self.task.category = category
+        # Edit a copy: the list's task keeps its values unless the save succeeds
+        task = self.task.copy()
+        task.title = title
+        task.description = description
+        task.due_date = due_date
+        task.priority = priority
+        task.category = category
         
         # Call touch to update timestamp
-        self.task.touch()
-        
-        # Save to database
-        update_task(self.task)
+        task.touch()
         
-        # Call on_save callback if provided
+        # Save to database in the background
+        self._submit(update_task, task)
+    
+    def _submit(self, func, task):
+        """Run a storage write on the DB worker while showing it as pending."""
+        self.save_button.config(state=tk.DISABLED)
+        self.status_label.config(text="Saving...")
+        db_worker.submit_write(
+            func, task,
+            on_done=lambda result: self._on_saved(task),
+            on_error=self._on_save_error
+        )
+    
+    def _on_saved(self, task):
+        """Notify the caller and close the dialog once the task is saved."""
+        # Call on_save callback with the saved task if provided
         if self.on_save:
-            self.on_save()
+            self.on_save(task)
         
         # Close dialog
         self.destroy()
     
+    def _on_save_error(self, error):
+        """Keep the dialog open and report a failed save."""
+        if not self.winfo_exists():
+            return
+        
+        if isinstance(error, ConflictError):
+            # Someone else saved this task first: show their version before
+            # another save can overwrite it
+            self.status_label.config(text="This task was changed elsewhere; loading the saved version...")
+            db_worker.submit_read(get_task, self.task.id,
+                                  on_done=self._on_conflict_loaded, on_error=self._on_save_error)
+            return
+        
+        self.save_button.config(state=tk.NORMAL)
+        self.status_label.config(text=f"Save failed: {error}")
+    
+    def _on_conflict_loaded(self, latest):
+        """Show the stored version after a conflict and allow saving over it."""
+        if not self.winfo_exists():
+            return
+        
+        if latest is None:
+            self.status_label.config(text="This task was deleted elsewhere.")
+            return
+        
+        self.task = latest
+        self._clear_fields()
+        self._populate_fields()
+        if self.on_reload:
+            self.on_reload(latest)
+        
+        self.status_label.config(
+            text="This task was changed elsewhere; its saved version is shown.\n"
+                 "Make your changes again and Save, or Cancel."
+        )
+        self.save_button.config(state=tk.NORMAL)
+    
     def _on_cancel_click(self):
         """Handle Cancel button click."""
         self.destroy()
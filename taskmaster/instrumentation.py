@@ -0,0 +1,293 @@
+# Lightweight timing, slow-call logging and profiling hooks
+#
+# Off by default. Turn it on with TASKMASTER_INSTRUMENT=1 (or enable()),
+# and capture a cProfile of a whole run with TASKMASTER_PROFILE=path.
+# While disabled, a @timed function costs one flag check per call and
+# connections are not traced at all.
+
+import cProfile
+import functools
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from taskmaster.config import INSTRUMENT, SLOW_CALL_MS, SLOW_LOG_SIZE
+from taskmaster.utils import logger
+
+# Histogram bucket upper bounds in milliseconds (the last bucket is open)
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+enabled = INSTRUMENT
+
+_lock = threading.Lock()
+_stats = {}
+_slow_calls = deque(maxlen=SLOW_LOG_SIZE)
+
+# Statements run by the current thread's outermost timed call
+_local = threading.local()
+
+_profiler = None
+
+
+class CallStats:
+    """Call count, latency histogram and row count for one timed name."""
+
+    __slots__ = ("calls", "total_ms", "max_ms", "rows", "buckets")
+
+    def __init__(self):
+        """Initialize empty stats."""
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, elapsed_ms, rows):
+        """Record one call."""
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += rows
+        self.buckets[bisect_left(BUCKETS_MS, elapsed_ms)] += 1
+
+    def percentile(self, fraction):
+        """Estimate a latency percentile as the upper bound of its bucket."""
+        target = self.calls * fraction
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max_ms
+        return 0.0
+
+    def to_dict(self):
+        """Return the stats as a JSON-ready dict."""
+        return {
+            "calls": self.calls,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "rows": self.rows,
+            "histogram": dict(zip([f"<={bound}" for bound in BUCKETS_MS] + ["more"], self.buckets)),
+        }
+
+
+def enable():
+    """
+    Turn instrumentation on.
+
+    Only database connections opened afterwards record their statements,
+    so call this at startup.
+    """
+    global enabled
+    enabled = True
+
+
+def disable():
+    """Turn instrumentation off (recorded stats are kept)."""
+    global enabled
+    enabled = False
+
+
+def reset():
+    """Forget every recorded stat and slow call."""
+    with _lock:
+        _stats.clear()
+        _slow_calls.clear()
+
+
+def _count_rows(result):
+    """Return how many rows a timed function returned (0 if unknown)."""
+    if isinstance(result, int) and not isinstance(result, bool):
+        return result
+    try:
+        return len(result)
+    except TypeError:
+        return 0
+
+
+def record(name, elapsed_ms, rows=0, statements=None):
+    """
+    Add one call to the stats.
+
+    A slow call is also logged with its statements, unless statements is
+    None (a nested call: the outer call reports the same time).
+    """
+    slow = statements is not None and elapsed_ms >= SLOW_CALL_MS
+
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = CallStats()
+        stats.add(elapsed_ms, rows)
+
+        if slow:
+            _slow_calls.append({"name": name, "ms": round(elapsed_ms, 3), "rows": rows,
+                                "statements": list(statements)})
+
+    if slow:
+        logger.warning("Slow call %s: %.1f ms, %d rows%s", name, elapsed_ms, rows,
+                       "".join(f"\n    {sql.strip()}" for sql in statements))
+
+
+def timed(name=None):
+    """
+    Decorator recording the calls of a function under name.
+
+    name defaults to the function's module and qualified name. Nested
+    timed calls are recorded separately, but only the outermost timed call
+    on a thread is checked against SLOW_CALL_MS and logged with the SQL
+    statements it ran.
+    """
+    def decorator(func):
+        label = name or f"{func.__module__.replace('taskmaster.', '')}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+
+            outer = getattr(_local, "statements", None) is None
+            if outer:
+                _local.statements = []
+            result = None
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                statements = None
+                if outer:
+                    statements = _local.statements
+                    _local.statements = None
+                record(label, elapsed_ms, _count_rows(result), statements)
+
+        return wrapper
+    return decorator
+
+
+def trace_statement(sql):
+    """sqlite3 trace callback: remember statements run inside timed calls."""
+    statements = getattr(_local, "statements", None)
+    if statements is not None:
+        statements.append(sql)
+
+
+def explain(sql, params=()):
+    """
+    Return the EXPLAIN QUERY PLAN of a statement as indented lines.
+
+    Statements recorded by slow calls already have their parameters
+    filled in and can be passed as they are.
+    """
+    # Imported here: storage itself imports this module
+    from taskmaster.storage import db_manager
+
+    with db_manager.connection() as conn:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+
+    depth = {0: 0}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, 0) + 1
+        lines.append("  " * (depth[node_id] - 1) + detail)
+    return lines
+
+
+def snapshot(with_plans=False):
+    """
+    Return every stat and recent slow call as a JSON-ready dict.
+
+    with_plans adds the query plan of each recorded slow SELECT.
+    """
+    with _lock:
+        stats = {name: stats.to_dict() for name, stats in sorted(_stats.items())}
+        slow_calls = [dict(call) for call in _slow_calls]
+
+    if with_plans:
+        for call in slow_calls:
+            call["plans"] = [explain(sql) for sql in call["statements"]
+                             if sql.lstrip().upper().startswith("SELECT")]
+    return {"enabled": enabled, "slow_call_ms": SLOW_CALL_MS, "calls": stats, "slow_calls": slow_calls}
+
+
+def dump(file=None, with_plans=False):
+    """Write a readable table of the recorded stats (to the log by default)."""
+    data = snapshot(with_plans)
+    out = io.StringIO()
+
+    out.write(f"{'name':<36} {'calls':>7} {'total ms':>10} {'mean':>8} {'p50':>8} "
+              f"{'p95':>8} {'p99':>8} {'max':>8} {'rows':>9}\n")
+    for name, stats in data["calls"].items():
+        out.write(f"{name:<36} {stats['calls']:>7} {stats['total_ms']:>10.1f} {stats['mean_ms']:>8.2f} "
+                  f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8} "
+                  f"{stats['max_ms']:>8.1f} {stats['rows']:>9}\n")
+
+    for call in data["slow_calls"]:
+        out.write(f"slow: {call['name']} {call['ms']} ms, {call['rows']} rows\n")
+        for sql in call["statements"]:
+            out.write(f"    {' '.join(sql.split())}\n")
+        for plan in call.get("plans", ()):
+            out.write("".join(f"      | {line}\n" for line in plan))
+
+    if file is None:
+        logger.info("Instrumentation stats:\n%s", out.getvalue())
+    else:
+        file.write(out.getvalue())
+
+
+def dump_json(path, with_plans=False):
+    """Write the recorded stats to a JSON file."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot(with_plans), f, indent=2)
+
+
+def start_profiling():
+    """Start capturing a cProfile of every call on the current thread."""
+    global _profiler
+    _profiler = cProfile.Profile()
+    _profiler.enable()
+
+
+def stop_profiling(path=None, limit=30):
+    """
+    Stop the cProfile capture started by start_profiling.
+
+    Saves the raw stats to path (for snakeviz, pstats, ...) if given and
+    logs the top functions by cumulative time.
+    """
+    global _profiler
+    if _profiler is None:
+        return
+    _profiler.disable()
+
+    if path:
+        _profiler.dump_stats(path)
+    out = io.StringIO()
+    pstats.Stats(_profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+    logger.info("Profile%s:\n%s", f" saved to {path}" if path else "", out.getvalue())
+    _profiler = None
+
+
+def main(argv=None):
+    """Print the query plan of SQL given on the command line."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: python -m taskmaster.instrumentation \"SELECT ...\"", file=sys.stderr)
+        return 2
+
+    for line in explain(" ".join(argv)):
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,513 @@
+# Versioned schema migrations applied by DatabaseManager.init_db
+
+from datetime import datetime
+
+
+def _create_base_tables(conn):
+    """Create the original users and tasks tables."""
+    # Create users table
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            display_name TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL
+        )
+    """)
+
+    # Create tasks table
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT,
+            due_date TIMESTAMP,
+            priority TEXT NOT NULL,
+            status TEXT NOT NULL,
+            category TEXT,
+            created_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    """)
+
+
+def _add_task_indexes(conn):
+    """
+    Index the per-user status and priority filters of the task list.
+
+    Category and due date filters seek the sort indexes of migration 5.
+    """
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tasks_user_status_priority
+        ON tasks (user_id, status, priority)
+    """)
+    conn.execute("ANALYZE")
+
+
+def _epoch(column):
+    """SQL expression converting a stored timestamp string to epoch seconds."""
+    return f"""
+        CASE WHEN typeof({column}) = 'text'
+             THEN CAST(strftime('%s', {column}) AS INTEGER)
+             ELSE {column} END
+    """
+
+
+def _rebuild_table(conn, table, create_sql, columns, timestamp_columns):
+    """
+    Recreate a table from create_sql and copy its rows across.
+
+    Timestamp columns are converted to epoch seconds on the way. The
+    AUTOINCREMENT counter is carried over so deleted ids are not reused.
+    """
+    seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+
+    conn.execute(create_sql.format(table=f"{table}_new"))
+    select = ", ".join(_epoch(c) if c in timestamp_columns else c for c in columns)
+    conn.execute(f"""
+        INSERT INTO {table}_new ({", ".join(columns)})
+        SELECT {select} FROM {table}
+    """)
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+    if seq is not None:
+        conn.execute("""
+            UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?
+        """, (seq[0], table))
+
+
+def _store_epoch_timestamps(conn):
+    """Store timestamps as integer epoch seconds declared with the EPOCH type."""
+    _rebuild_table(conn, "users", """
+        CREATE TABLE {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            display_name TEXT NOT NULL,
+            created_at EPOCH NOT NULL,
+            updated_at EPOCH NOT NULL
+        )
+    """, ["id", "username", "display_name", "created_at", "updated_at"],
+        {"created_at", "updated_at"})
+
+    _rebuild_table(conn, "tasks", """
+        CREATE TABLE {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT,
+            due_date EPOCH,
+            priority TEXT NOT NULL,
+            status TEXT NOT NULL,
+            category TEXT,
+            created_at EPOCH NOT NULL,
+            updated_at EPOCH NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    """, ["id", "user_id", "title", "description", "due_date", "priority",
+          "status", "category", "created_at", "updated_at"],
+        {"due_date", "created_at", "updated_at"})
+
+    # Indexes are dropped with the old table
+    _add_task_indexes(conn)
+
+
+def _add_task_search(conn):
+    """Mirror task titles and descriptions into an FTS5 index kept in sync by triggers."""
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts
+        USING fts5(title, description, content='tasks', content_rowid='id')
+    """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO tasks_fts (rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+    """)
+
+    # Index the rows that already exist
+    conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+
+
+def _add_sort_indexes(conn):
+    """Index every sortable column as (user_id, sort expression, id) for keyset paging."""
+    # Expressions must match storage.ORDER_BY_COLUMNS exactly
+    expressions = {
+        "title": "title",
+        "due_date": "IFNULL(due_date, 9223372036854775807)",
+        "priority": "CASE priority WHEN 'Low' THEN 0 WHEN 'Medium' THEN 1 WHEN 'High' THEN 2 ELSE 1 END",
+        "status": "status",
+        "category": "IFNULL(category, '')",
+        "created_at": "created_at",
+    }
+    for name, expression in expressions.items():
+        conn.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_tasks_user_sort_{name}
+            ON tasks (user_id, {expression}, id)
+        """)
+    conn.execute("ANALYZE")
+
+
+def _add_task_versions(conn):
+    """Add a version counter to tasks for optimistic locking."""
+    # ADD COLUMN keeps the table (and its triggers) in place; existing rows get 1
+    conn.execute("ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+
+
+def _add_task_stats(conn):
+    """
+    Keep per-user task counts by status, priority and category in task_stats.
+
+    Triggers update the counts on every insert, update and delete, so a
+    report reads a handful of rows instead of counting the tasks. Rows
+    whose count drops to zero are removed.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS task_stats (
+            user_id INTEGER NOT NULL,
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (user_id, dimension, value)
+        ) WITHOUT ROWID
+    """)
+
+    # dimension -> (columns, value expression for a row alias); must match
+    # storage.TASK_STATS_DIMENSIONS
+    dimensions = {
+        "status": ("status", "{row}.status"),
+        "priority": ("priority", "{row}.priority"),
+        "category": ("category", "IFNULL({row}.category, '')"),
+    }
+    for dimension, (column, expression) in dimensions.items():
+        old = expression.format(row="old")
+        new = expression.format(row="new")
+        increment = f"""
+            INSERT INTO task_stats (user_id, dimension, value, count)
+            VALUES (new.user_id, '{dimension}', {new}, 1)
+            ON CONFLICT (user_id, dimension, value) DO UPDATE SET count = count + 1;
+        """
+        decrement = f"""
+            UPDATE task_stats SET count = count - 1
+            WHERE user_id = old.user_id AND dimension = '{dimension}' AND value = {old};
+            DELETE FROM task_stats
+            WHERE user_id = old.user_id AND dimension = '{dimension}' AND value = {old} AND count <= 0;
+        """
+
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS task_stats_{dimension}_insert AFTER INSERT ON tasks BEGIN
+                {increment}
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS task_stats_{dimension}_delete AFTER DELETE ON tasks BEGIN
+                {decrement}
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS task_stats_{dimension}_update AFTER UPDATE OF user_id, {column} ON tasks
+            WHEN old.user_id IS NOT new.user_id OR {old} IS NOT {new} BEGIN
+                {decrement}
+                {increment}
+            END
+        """)
+
+        # Count the rows that already exist
+        conn.execute(f"""
+            INSERT INTO task_stats (user_id, dimension, value, count)
+            SELECT user_id, '{dimension}', {expression.format(row="tasks")}, COUNT(*)
+            FROM tasks
+            GROUP BY 1, 3
+        """)
+
+    # Overdue and due-soon counts depend on the current time, so reports
+    # still count those, but only over open tasks
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tasks_user_open_due_date
+        ON tasks (user_id, due_date) WHERE status != 'Completed'
+    """)
+    conn.execute("ANALYZE")
+
+
+def _local_day(column):
+    """SQL for the local epoch day of an epoch seconds column holding a UTC time."""
+    return f"CAST(strftime('%s', {column}, 'unixepoch', 'localtime') AS INTEGER) / 86400"
+
+
+# SQL for the current local epoch day
+_LOCAL_TODAY = "CAST(strftime('%s', 'now', 'localtime') AS INTEGER) / 86400"
+
+
+def _overdue_from(row):
+    """
+    SQL for the day a row's task joins the overdue backlog if still open.
+
+    Due dates hold local midnights, so the due day needs no conversion.
+    """
+    return f"MAX({row}.due_date / 86400 + 1, {_local_day(row + '.created_at')})"
+
+
+# task_daily rows rebuilt from the current tasks, as if every task had been
+# inserted as it is now (events that left no trace in the rows, such as
+# deletions, are lost)
+TASK_DAILY_SELECT = f"""
+    WITH events (user_id, day, created, completed, open_delta, overdue_delta) AS (
+        SELECT user_id, {_local_day("created_at")}, 1, 0, 1, 0 FROM tasks
+        UNION ALL
+        SELECT user_id, {_overdue_from("tasks")}, 0, 0, 0, 1 FROM tasks
+        WHERE due_date IS NOT NULL
+        UNION ALL
+        SELECT user_id, {_local_day("updated_at")}, 0, 1, -1, 0 FROM tasks
+        WHERE status = 'Completed'
+        UNION ALL
+        SELECT user_id, MAX({_overdue_from("tasks")}, {_local_day("updated_at")}), 0, 0, 0, -1
+        FROM tasks
+        WHERE status = 'Completed' AND due_date IS NOT NULL
+    )
+    SELECT user_id, day, SUM(created), SUM(completed), SUM(open_delta), SUM(overdue_delta)
+    FROM events
+    GROUP BY user_id, day
+"""
+
+
+def _create_daily_triggers(conn):
+    """Create the triggers adding every task event to task_daily."""
+    def bump(row, day, changes, when="1"):
+        """Statement adding changes ({column: amount}) to a user's day."""
+        columns = ", ".join(changes)
+        amounts = ", ".join(str(amount) for amount in changes.values())
+        updates = ", ".join(f"{column} = {column} + excluded.{column}" for column in changes)
+        return f"""
+            INSERT INTO task_daily (user_id, day, {columns})
+            SELECT {row}.user_id, {day}, {amounts} WHERE {when}
+            ON CONFLICT (user_id, day) DO UPDATE SET {updates};
+        """
+
+    def open_task(row, day, when="1"):
+        """Statements recording that a row's task is open from day on."""
+        return (bump(row, day, {"open_delta": 1}, when)
+                + bump(row, f"MAX({_overdue_from(row)}, {day})", {"overdue_delta": 1},
+                       f"{when} AND {row}.due_date IS NOT NULL"))
+
+    def close_task(row, day, when="1"):
+        """Statements recording that a row's task is no longer open from day on."""
+        return (bump(row, day, {"open_delta": -1}, when)
+                + bump(row, f"MAX({_overdue_from(row)}, {day})", {"overdue_delta": -1},
+                       f"{when} AND {row}.due_date IS NOT NULL"))
+
+    created = _local_day("new.created_at")
+    updated = _local_day("new.updated_at")
+
+    # A task inserted as completed was open from its creation to its last update
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS task_daily_insert AFTER INSERT ON tasks BEGIN
+            {bump("new", created, {"created": 1})}
+            {open_task("new", created)}
+            {bump("new", updated, {"completed": 1}, "new.status = 'Completed'")}
+            {close_task("new", updated, "new.status = 'Completed'")}
+        END
+    """)
+
+    # Close the old state and open the new one; a due date change on an
+    # open task cancels out except for the overdue backlog
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS task_daily_update AFTER UPDATE OF user_id, status, due_date ON tasks
+        WHEN old.user_id IS NOT new.user_id OR old.status IS NOT new.status
+             OR old.due_date IS NOT new.due_date BEGIN
+            {close_task("old", updated, "old.status != 'Completed'")}
+            {open_task("new", updated, "new.status != 'Completed'")}
+            {bump("new", updated, {"completed": 1},
+                  "old.status != 'Completed' AND new.status = 'Completed'")}
+        END
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS task_daily_delete AFTER DELETE ON tasks
+        WHEN old.status != 'Completed' BEGIN
+            {close_task("old", _LOCAL_TODAY)}
+        END
+    """)
+
+
+def _add_daily_rollup(conn):
+    """
+    Roll task activity up into one task_daily row per user and day.
+
+    Days are whole local days since the epoch, like due dates (which hold
+    local midnights), so a task completed in the evening counts on that
+    day. Each row holds the tasks created and completed that day, plus the
+    day's change in open tasks and in overdue open tasks, so a running sum
+    of the deltas gives the burndown and overdue backlog on any day.
+    Triggers add every event as it happens; history from before this
+    migration is rebuilt from the current rows.
+
+    An open task joins the overdue backlog the day after it is due (or on
+    the day it was created, if later) and leaves it when it is closed.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS task_daily (
+            user_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            created INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0,
+            open_delta INTEGER NOT NULL DEFAULT 0,
+            overdue_delta INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, day)
+        ) WITHOUT ROWID
+    """)
+    _create_daily_triggers(conn)
+    conn.execute(f"""
+        INSERT INTO task_daily (user_id, day, created, completed, open_delta, overdue_delta)
+        {TASK_DAILY_SELECT}
+    """)
+
+
+def _add_task_changes(conn):
+    """
+    Log every task insert, update and delete in task_changes.
+
+    seq increases with every change (AUTOINCREMENT never reuses a value),
+    so a client that remembers the last seq it saw can read just the
+    changes after it. A task moved to another user is logged as deleted
+    for its old owner and updated for its new one. Only the latest 100000
+    changes are kept; a client that falls further behind reloads instead.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS task_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            op TEXT NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_task_changes_user_seq
+        ON task_changes (user_id, seq)
+    """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS task_changes_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO task_changes (task_id, user_id, op) VALUES (new.id, new.user_id, 'insert');
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS task_changes_update AFTER UPDATE ON tasks BEGIN
+            INSERT INTO task_changes (task_id, user_id, op)
+            SELECT old.id, old.user_id, 'delete' WHERE old.user_id IS NOT new.user_id;
+            INSERT INTO task_changes (task_id, user_id, op) VALUES (new.id, new.user_id, 'update');
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS task_changes_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO task_changes (task_id, user_id, op) VALUES (old.id, old.user_id, 'delete');
+        END
+    """)
+
+    # Trim the log in steps of 1000 rows rather than on every change
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS task_changes_prune AFTER INSERT ON task_changes
+        WHEN new.seq % 1000 = 0 BEGIN
+            DELETE FROM task_changes WHERE seq <= new.seq - 100000;
+        END
+    """)
+
+
+def _store_epoch_applied_at(conn):
+    """
+    Declare schema_version.applied_at as EPOCH.
+
+    Databases created before this held epoch seconds in a TIMESTAMP
+    column, which sqlite3's built-in TIMESTAMP converter cannot read.
+    """
+    _rebuild_table(conn, "schema_version", """
+        CREATE TABLE {table} (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at EPOCH NOT NULL
+        )
+    """, ["version", "name", "applied_at"], {"applied_at"})
+
+
+# Ordered list of (version, name, step). Never edit or reorder a step that
+# has shipped; add a new one at the end instead.
+MIGRATIONS = [
+    (1, "create base tables", _create_base_tables),
+    (2, "add task indexes", _add_task_indexes),
+    (3, "store timestamps as epoch seconds", _store_epoch_timestamps),
+    (4, "add full-text task search", _add_task_search),
+    (5, "add keyset sort indexes", _add_sort_indexes),
+    (6, "add task version column", _add_task_versions),
+    (7, "add task stats table", _add_task_stats),
+    (8, "add daily task rollup", _add_daily_rollup),
+    (9, "add task change log", _add_task_changes),
+    (10, "store migration times as epoch seconds", _store_epoch_applied_at),
+]
+
+
+def get_schema_version(conn):
+    """
+    Return the highest applied migration version (0 for a new database).
+
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at EPOCH NOT NULL
+        )
+    """)
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def apply_migrations(conn):
+    """
+    Apply every pending migration in order, one transaction per step.
+
+    Returns the list of versions that were applied.
+    """
+    current = get_schema_version(conn)
+    applied = []
+
+    for version, name, step in MIGRATIONS:
+        if version <= current:
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have applied this step while we waited
+            row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+            if (row[0] or 0) >= version:
+                conn.execute("COMMIT")
+                continue
+
+            step(conn)
+            conn.execute("""
+                INSERT INTO schema_version (version, name, applied_at)
+                VALUES (?, ?, ?)
+            """, (version, name, datetime.utcnow()))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        applied.append(version)
+
+    return applied
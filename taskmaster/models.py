@@ -1,11 +1,24 @@
 # BaseModel, User, Task (OOP)
 
 from datetime import datetime
+from functools import lru_cache
 from taskmaster import config
+from taskmaster.utils import overdue_cutoff, from_epoch
+
+
+# Sets for fast validation of Task fields
+_PRIORITIES = frozenset(config.PRIORITIES)
+_STATUSES = frozenset(config.STATUSES)
 
 
 class BaseModel:
-    """Base class for shared fields and behavior."""
+    """Base class for shared fields and behavior.
+    
+    Models use __slots__ instead of a per-instance __dict__, which keeps
+    large task lists compact in memory.
+    """
+    
+    __slots__ = ("id", "created_at", "updated_at")
     
     def __init__(self, id=None, created_at=None, updated_at=None):
         """
@@ -13,8 +26,15 @@ class BaseModel:
         
         """
         self.id = id
-        self.created_at = created_at or datetime.utcnow()
-        self.updated_at = updated_at or datetime.utcnow()
+        
+        # Only look up the current time when a timestamp is missing
+        if created_at and updated_at:
+            self.created_at = created_at
+            self.updated_at = updated_at
+        else:
+            now = datetime.utcnow()
+            self.created_at = created_at or now
+            self.updated_at = updated_at or now
     
     def touch(self):
         """Update the updated_at timestamp to current time."""
@@ -34,6 +54,8 @@ class BaseModel:
 class User(BaseModel):
     """Represent a user profile."""
     
+    __slots__ = ("username", "display_name")
+    
     def __init__(self, username, display_name, id=None, created_at=None, updated_at=None):
         """
         Initialize a User.
@@ -43,6 +65,18 @@ class User(BaseModel):
         self.username = username.strip().lower() if username else ""
         self.display_name = display_name
     
+    @classmethod
+    def from_row(cls, row):
+        """
+        Build a User from a trusted database row.
+        
+        The row holds (id, username, display_name, created_at, updated_at).
+        Normalization and timestamp defaults are skipped.
+        """
+        user = cls.__new__(cls)
+        user.id, user.username, user.display_name, user.created_at, user.updated_at = row
+        return user
+    
     def __repr__(self):
         return f"User(id={self.id}, username='{self.username}', display_name='{self.display_name}')"
     
@@ -50,8 +84,52 @@ class User(BaseModel):
         return f"{self.display_name} (@{self.username})"
 
 
-class Task(BaseModel):
-    """Represent an individual task."""
+# Task columns whose changes are tracked for partial updates
+TRACKED_FIELDS = frozenset({
+    "user_id", "title", "description", "due_date", "priority", "status", "category", "updated_at"
+})
+
+_object_setattr = object.__setattr__
+
+# Due dates are local midnights, so a list holds few distinct ones; the
+# datetimes are immutable and can be shared between tasks
+_due_date_from_epoch = lru_cache(maxsize=4096)(from_epoch)
+
+# Timestamps a task built by from_list_row decodes on first access, with
+# their index in its _epochs
+_LAZY_TIMESTAMPS = {"created_at": 0, "updated_at": 1}
+
+
+class _TaskFields(BaseModel):
+    """Slot layout of Task, without change tracking (see Task.from_row)."""
+    
+    __slots__ = ("user_id", "title", "description", "due_date", "priority", "status", "category",
+                 "version", "_dirty", "_epochs")
+
+
+# Slot descriptors of the tracked fields: reading one raises
+# AttributeError for an unset slot instead of calling Task.__getattr__
+_FIELD_SLOTS = {name: getattr(_TaskFields, name) for name in TRACKED_FIELDS}
+_EPOCHS_SLOT = _TaskFields._epochs
+
+
+class Task(_TaskFields):
+    """Represent an individual task.
+    
+    Assigning a tracked field a different value records it as changed, so
+    storage.update_task can write just those columns. A task built with
+    Task(...) counts as entirely changed until it is saved; one loaded
+    with from_row starts clean.
+    
+    Tasks loaded for lists (from_list_row) leave description unset; it is
+    fetched from the database by description_loader on first access.
+    Their created_at and updated_at are kept as epoch seconds until read.
+    """
+    
+    __slots__ = ()
+    
+    # Set by storage: loader(task_id) returns a stored description
+    description_loader = None
     
     def __init__(self, user_id, title, description, due_date, priority, status, category,
                  id=None, created_at=None, updated_at=None):
@@ -59,6 +137,7 @@ class Task(BaseModel):
         Initialize a Task.
         
         """
+        self._dirty = TRACKED_FIELDS
         super().__init__(id, created_at, updated_at)
         self.user_id = user_id
         self.title = title
@@ -66,12 +145,133 @@ class Task(BaseModel):
         self.due_date = due_date
         
         # Validate priority
-        self.priority = priority if priority in config.PRIORITIES else "Medium"
+        self.priority = priority if priority in _PRIORITIES else "Medium"
         
         # Validate status
-        self.status = status if status in config.STATUSES else "Pending"
+        self.status = status if status in _STATUSES else "Pending"
         
         self.category = category
+        
+        # Bumped on every update; storage rejects writes from stale copies
+        self.version = 1
+    
+    @classmethod
+    def from_row(cls, row):
+        """
+        Build a Task from a trusted database row.
+        
+        The row holds (id, user_id, title, description, due_date, priority,
+        status, category, created_at, updated_at, version), as written by
+        storage. Validation and timestamp defaults are skipped.
+        """
+        # Fill the untracked layout class, then switch to Task: assignments
+        # skip __setattr__, which would make loading several times slower
+        task = _TaskFields.__new__(_TaskFields)
+        (task.id, task.user_id, task.title, task.description, task.due_date,
+         task.priority, task.status, task.category, task.created_at, task.updated_at,
+         task.version) = row
+        task._dirty = None
+        task.__class__ = cls
+        return task
+    
+    @classmethod
+    def from_list_row(cls, row):
+        """
+        Build a Task from a database row without its description.
+        
+        The row holds the from_row columns minus description, with the
+        timestamps as undecoded epoch seconds (see storage.LIST_COLUMNS).
+        Lists only show the due date, so created_at and updated_at are
+        decoded on first access. The description is loaded on first
+        access, or by set_description_loaded.
+        """
+        task = _TaskFields.__new__(_TaskFields)
+        (task.id, task.user_id, task.title, due_date, task.priority, task.status,
+         task.category, created_at, updated_at, task.version) = row
+        task.due_date = None if due_date is None else _due_date_from_epoch(due_date)
+        task._epochs = (created_at, updated_at)
+        task._dirty = None
+        task.__class__ = cls
+        return task
+    
+    def __getattr__(self, name):
+        """Load the description or decode a timestamp of a task built by from_list_row."""
+        # Only called for unset slots, so other attributes are never looked up here
+        if name == "description" and self.id is not None and Task.description_loader is not None:
+            description = Task.description_loader(self.id)
+            _object_setattr(self, "description", description)
+            return description
+        if name in _LAZY_TIMESTAMPS:
+            try:
+                epochs = _EPOCHS_SLOT.__get__(self)
+            except AttributeError:
+                pass
+            else:
+                value = from_epoch(epochs[_LAZY_TIMESTAMPS[name]])
+                _object_setattr(self, name, value)
+                return value
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+    
+    def __setattr__(self, name, value):
+        """Set an attribute, recording tracked fields whose value changes."""
+        if name in TRACKED_FIELDS:
+            dirty = self._dirty
+            if dirty is None:
+                if self._differs(name, value):
+                    _object_setattr(self, "_dirty", {name})
+            elif dirty is not TRACKED_FIELDS and name not in dirty:
+                if self._differs(name, value):
+                    dirty.add(name)
+        _object_setattr(self, name, value)
+    
+    def _differs(self, name, value):
+        """Return whether value differs from a field (always true if unloaded)."""
+        try:
+            return _FIELD_SLOTS[name].__get__(self) != value
+        except AttributeError:
+            return True
+    
+    @property
+    def description_loaded(self):
+        """Whether the description is in memory (not waiting to be loaded)."""
+        try:
+            _FIELD_SLOTS["description"].__get__(self)
+        except AttributeError:
+            return False
+        return True
+    
+    def set_description_loaded(self, description):
+        """Fill in a description fetched from the database, without marking it changed."""
+        _object_setattr(self, "description", description)
+    
+    def copy(self):
+        """
+        Return an independent copy with the same values and recorded changes.
+        
+        Editing the copy leaves this task untouched; an unloaded description
+        stays unloaded in the copy.
+        """
+        task = _TaskFields.__new__(_TaskFields)
+        for cls in (BaseModel, _TaskFields):
+            for name in cls.__slots__:
+                slot = getattr(cls, name)
+                try:
+                    slot.__set__(task, slot.__get__(self))
+                except AttributeError:
+                    pass
+        if isinstance(self._dirty, set):
+            task._dirty = set(self._dirty)
+        task.__class__ = type(self)
+        return task
+    
+    @property
+    def changed_fields(self):
+        """Names of the tracked fields changed since the task was loaded or saved."""
+        return frozenset(self._dirty or ())
+    
+    def mark_clean(self):
+        """Forget recorded changes (called by storage after a save)."""
+        self._dirty = None
     
     def mark_completed(self):
         """Mark this task as completed and update timestamp."""
@@ -80,12 +280,14 @@ class Task(BaseModel):
     
     def is_overdue(self, now):
         """
-        Check if this task is overdue.
-     
+        Check if this task is overdue at local time now.
+        
+        An open task is overdue once its due day has ended (see
+        utils.due_deadline).
         """
         if self.status == "Completed":
             return False
         if self.due_date is None:
             return False
-        return self.due_date < now
+        return self.due_date < overdue_cutoff(now)
 
@@ -1,36 +1,191 @@
 # Simple functions to compute report stats
 
+from datetime import date, datetime, timedelta
+from taskmaster.config import REPORT_IN_MEMORY_LIMIT
+from taskmaster.instrumentation import timed
+from taskmaster.storage import get_task_stats, count_due_tasks, get_daily_rollup
+from taskmaster.utils import overdue_cutoff
 
-def count_by_status(tasks):
+# Trend bucket sizes accepted by build_trends
+BUCKETS = ("day", "week", "month")
+
+_EPOCH = date(1970, 1, 1)
+
+
+class TaskReport:
+    """Every report breakdown for one user's tasks."""
+    
+    def __init__(self):
+        """Initialize an empty report."""
+        self.total = 0
+        self.by_status = {}
+        self.by_category = {}
+        self.by_priority = {}
+        self.overdue = 0
+        self.due_this_week = 0
+    
+    @property
+    def completed(self):
+        """Number of completed tasks."""
+        return self.by_status.get("Completed", 0)
+    
+    @property
+    def completion_rate(self):
+        """Fraction of tasks that are completed (0.0 when there are none)."""
+        return self.completed / self.total if self.total else 0.0
+    
+    def add(self, status, category, priority, count=1, overdue=0, due_soon=0):
+        """Fold count tasks with the given fields into the report."""
+        self.total += count
+        self.by_status[status] = self.by_status.get(status, 0) + count
+        self.by_category[category] = self.by_category.get(category, 0) + count
+        self.by_priority[priority] = self.by_priority.get(priority, 0) + count
+        self.overdue += overdue
+        self.due_this_week += due_soon
+
+
+@timed()
+def report_from_tasks(tasks, now):
     """
-    Compute status counts from a list of tasks.
+    Compute a TaskReport from in-memory tasks in one pass.
     
+    now is local time. Open tasks are overdue once their due day has
+    ended (see utils.due_deadline); the others due before a week from now
+    are due this week.
     """
-    counts = {}
+    cutoff = overdue_cutoff(now)
+    week_end = now + timedelta(days=7)
+    report = TaskReport()
     
     for task in tasks:
-        status = task.status
-        if status in counts:
-            counts[status] += 1
-        else:
-            counts[status] = 1
+        overdue = due_soon = 0
+        if task.status != "Completed" and task.due_date is not None:
+            overdue = task.due_date < cutoff
+            due_soon = cutoff <= task.due_date < week_end
+        report.add(task.status, task.category, task.priority, 1, overdue, due_soon)
     
-    return counts
+    return report
 
 
-def count_by_category(tasks):
+@timed()
+def report_from_db(user_id, now):
     """
-    Compute category counts from a list of tasks.
+    Build a TaskReport from the stored task_stats counts.
     
+    Status, priority and category counts are read, not recounted; only
+    open tasks due within the week are scanned for the date counts.
     """
-    counts = {}
+    report = TaskReport()
+    breakdowns = {"status": report.by_status, "priority": report.by_priority,
+                  "category": report.by_category}
     
-    for task in tasks:
-        category = task.category
-        if category in counts:
-            counts[category] += 1
-        else:
-            counts[category] = 1
+    for dimension, value, count in get_task_stats(user_id):
+        breakdowns[dimension][value] = count
+    
+    report.total = sum(report.by_status.values())
+    report.overdue, report.due_this_week = count_due_tasks(user_id, overdue_cutoff(now), now + timedelta(days=7))
+    return report
+
+
+def can_report_in_memory(tasks):
+    """Return True if tasks (or None) is small enough for the Python pass."""
+    return tasks is not None and len(tasks) <= REPORT_IN_MEMORY_LIMIT
+
+
+@timed()
+def build_report(user_id, tasks=None, now=None):
+    """
+    Compute every report breakdown for a user.
+    
+    tasks is the user's full task set if it is already in memory. Small
+    in-memory sets are counted in Python; otherwise the counts come from
+    the task_stats table. now defaults to the current local time.
+    """
+    now = now or datetime.now()
     
-    return counts
+    if can_report_in_memory(tasks):
+        return report_from_tasks(tasks, now)
+    return report_from_db(user_id, now)
 
+
+def _bucket_start(day, bucket):
+    """Return the first date of the bucket containing day (weeks start on Monday)."""
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(start, bucket):
+    """Return the first date of the bucket after the one starting at start."""
+    if bucket == "week":
+        return start + timedelta(days=7)
+    if bucket == "month":
+        return (start + timedelta(days=31)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+class TrendSeries:
+    """Task activity per day, week or month, oldest bucket first.
+    
+    created and completed count the tasks created and completed in each
+    bucket; open and overdue are the open and overdue task counts at the
+    end of each bucket.
+    """
+    
+    def __init__(self, bucket):
+        """Initialize an empty series."""
+        self.bucket = bucket
+        self.starts = []
+        self.created = []
+        self.completed = []
+        self.open = []
+        self.overdue = []
+    
+    def __len__(self):
+        """Number of buckets."""
+        return len(self.starts)
+
+
+@timed()
+def build_trends(user_id, days=90, bucket="day", today=None):
+    """
+    Build a TrendSeries of the last days days (every day if None) from task_daily.
+    
+    The series covers whole buckets, so the first one may start before
+    the range, and ends with today (local). Reads one pre-aggregated row
+    per active day, whatever the number of tasks.
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown trend bucket {bucket!r}")
+    
+    today = today or datetime.now().date()
+    first = _bucket_start(today - timedelta(days=days - 1), bucket) if days else _EPOCH
+    open_count, overdue, rows = get_daily_rollup(user_id, (first - _EPOCH).days, (today - _EPOCH).days)
+    
+    if days is None:
+        first = _bucket_start(_EPOCH + timedelta(days=rows[0][0]), bucket) if rows else today
+    
+    series = TrendSeries(bucket)
+    index = 0
+    start = first
+    while start <= today:
+        end = (_next_bucket(start, bucket) - _EPOCH).days
+        created = completed = 0
+        while index < len(rows) and rows[index][0] < end:
+            _, day_created, day_completed, open_delta, overdue_delta = rows[index]
+            created += day_created
+            completed += day_completed
+            open_count += open_delta
+            overdue += overdue_delta
+            index += 1
+        
+        series.starts.append(start)
+        series.created.append(created)
+        series.completed.append(completed)
+        series.open.append(open_count)
+        series.overdue.append(overdue)
+        start = _next_bucket(start, bucket)
+    
+    return series
@@ -0,0 +1,202 @@
+# Wake-up timer for task deadlines (drives overdue highlighting and reminders)
+
+import argparse
+import heapq
+import sys
+import threading
+from datetime import datetime, timedelta
+from taskmaster.config import DUE_HORIZON_HOURS
+from taskmaster.storage import db_manager, get_upcoming_due, get_user_by_username, get_task
+from taskmaster.utils import logger, due_deadline, overdue_cutoff
+
+
+class DueScheduler:
+    """Min-heap of upcoming task deadlines with a single wake-up timer.
+
+    A task's deadline is the end of its local due day (utils.due_deadline),
+    when Task.is_overdue starts returning True. Only open tasks whose
+    deadline falls within the horizon (the local midnight after
+    DUE_HORIZON_HOURS from the last load) are kept. The timer is set for
+    the earliest deadline, so nothing runs between deadlines however many
+    tasks there are. When deadlines pass, on_due(task_ids) is called; when
+    the horizon is reached, on_reload() should call reset with the next
+    horizon's due dates.
+
+    With a Tk root the timer is root.after and callbacks run on the Tk
+    thread. Without one (headless) it is a threading.Timer and callbacks
+    run on the timer thread.
+    """
+
+    def __init__(self, on_due, on_reload, root=None):
+        """
+        Initialize an empty DueScheduler.
+
+        """
+        self.on_due = on_due
+        self.on_reload = on_reload
+        self.root = root
+
+        # (deadline, task_id) entries; an entry is stale unless _due still
+        # maps its task to that deadline (removal is lazy)
+        self._heap = []
+        self._due = {}
+        self._until = None
+
+        self._timer = None
+        self._timer_due = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Number of scheduled tasks."""
+        return len(self._due)
+
+    def horizon(self, now=None):
+        """
+        Return the (start, end) due date range to load for a reset at local time now.
+
+        Tasks due in it are not overdue yet and become overdue by end,
+        which is also the horizon to pass to reset.
+        """
+        now = now or datetime.now()
+        return overdue_cutoff(now), due_deadline(now + timedelta(hours=DUE_HORIZON_HOURS))
+
+    def reset(self, entries, until):
+        """
+        Replace the schedule with (task_id, due_date) entries loaded for a horizon.
+
+        """
+        with self._lock:
+            self._due = {task_id: due_deadline(due_date) for task_id, due_date in entries}
+            self._heap = [(deadline, task_id) for task_id, deadline in self._due.items()]
+            heapq.heapify(self._heap)
+            self._until = until
+        self._arm()
+
+    def load(self, user_id, now=None):
+        """Query the next horizon's deadlines for a user and reset to them."""
+        start, end = self.horizon(now)
+        self.reset(get_upcoming_due(user_id, start, end), end)
+
+    def update(self, task, now=None):
+        """Schedule, move or drop a task after it was created or edited."""
+        deadline = due_deadline(task.due_date) if task.due_date is not None else None
+        now = now or datetime.now()
+
+        with self._lock:
+            if (self._until is None or task.status == "Completed" or deadline is None
+                    or not now < deadline <= self._until):
+                self._due.pop(task.id, None)
+                return
+            if self._due.get(task.id) == deadline:
+                return
+            self._due[task.id] = deadline
+            heapq.heappush(self._heap, (deadline, task.id))
+        self._arm()
+
+    def remove(self, task_id):
+        """Drop a deleted task (its heap entry is discarded when reached)."""
+        with self._lock:
+            self._due.pop(task_id, None)
+
+    def stop(self):
+        """Cancel the pending wake-up."""
+        with self._lock:
+            self._cancel()
+            self._until = None
+
+    def _cancel(self):
+        """Cancel the current timer (lock held)."""
+        if self._timer is not None:
+            if self.root is not None:
+                self.root.after_cancel(self._timer)
+            else:
+                self._timer.cancel()
+        self._timer = None
+        self._timer_due = None
+
+    def _arm(self):
+        """Set the timer for the earliest live deadline, or the horizon end."""
+        with self._lock:
+            heap = self._heap
+            while heap and self._due.get(heap[0][1]) != heap[0][0]:
+                heapq.heappop(heap)
+
+            if self._until is None:
+                return
+            wake_at = heap[0][0] if heap else self._until
+            if wake_at == self._timer_due:
+                return
+
+            self._cancel()
+            delay = max((wake_at - datetime.now()).total_seconds(), 0)
+            if self.root is not None:
+                self._timer = self.root.after(int(delay * 1000) + 1, self._wake)
+            else:
+                self._timer = threading.Timer(delay, self._wake)
+                self._timer.daemon = True
+                self._timer.start()
+            self._timer_due = wake_at
+
+    def _wake(self):
+        """Report the deadlines that have passed, then wait for the next one."""
+        now = datetime.now()
+        due = []
+
+        with self._lock:
+            self._timer = None
+            self._timer_due = None
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                deadline, task_id = heapq.heappop(heap)
+                if self._due.get(task_id) == deadline:
+                    del self._due[task_id]
+                    due.append(task_id)
+            reload = self._until is not None and now >= self._until
+
+        if due:
+            self.on_due(due)
+        if reload:
+            self.on_reload()
+        else:
+            self._arm()
+
+
+def main(argv=None):
+    """Print a reminder for each of a user's tasks as it becomes overdue."""
+    parser = argparse.ArgumentParser(description="Print TaskMaster due date reminders.")
+    parser.add_argument("username")
+    args = parser.parse_args(argv)
+
+    db_manager.init_db()
+    user = get_user_by_username(args.username)
+    if user is None:
+        print(f"No user named {args.username!r}", file=sys.stderr)
+        return 1
+
+    def on_due(task_ids):
+        for task_id in task_ids:
+            task = get_task(task_id)
+            if task is not None:
+                print(f"Overdue: {task.title} (due {task.due_date:%m/%d/%Y})", flush=True)
+
+    def on_reload():
+        logger.info("Loading the next %d hours of deadlines", DUE_HORIZON_HOURS)
+        scheduler.load(user.id)
+
+    scheduler = DueScheduler(on_due, on_reload)
+    scheduler.load(user.id)
+    print(f"Watching {len(scheduler)} deadlines in the next {DUE_HORIZON_HOURS} hours "
+          f"for {user.username} (Ctrl+C to stop)")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.stop()
+        db_manager.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,442 @@
+# Headless HTTP/JSON API over taskmaster.storage
+#
+# Usage:
+#     python -m taskmaster.server [--host HOST] [--port PORT]
+#
+# Endpoints (request and response bodies are JSON):
+#     POST   /users                          {"username", "display_name"}
+#     GET    /users/USERNAME
+#     GET    /users/USERNAME/tasks           ?status=&priority=&category=&due_before=
+#                                            &order_by=&limit=&after=
+#     POST   /users/USERNAME/tasks           task fields
+#     GET    /users/USERNAME/search          ?q=&limit=&status=&priority=
+#     GET    /users/USERNAME/report
+#     GET    /users/USERNAME/changes         ?after= (the "seq" of the previous response;
+#                                            omit it to get the current seq)
+#     GET    /tasks/ID
+#     PATCH  /tasks/ID                       changed task fields, plus the "version"
+#                                            last read to reject stale writes (409)
+#     DELETE /tasks/ID
+#     GET    /debug/stats                    ?plans=1 (see taskmaster.instrumentation)
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+from taskmaster import instrumentation
+from taskmaster.config import (
+    SERVER_HOST, SERVER_PORT, SERVER_MAX_PAGE_SIZE, TASK_PAGE_SIZE, SEARCH_LIMIT, PRIORITIES, STATUSES
+)
+from taskmaster.models import Task, User
+from taskmaster.reports import build_report
+from taskmaster.storage import (
+    db_manager, create_user, get_user_by_username, create_task, get_task, update_task, delete_task,
+    query_tasks, search_tasks, task_sort_key, get_change_seq, get_task_changes, query_cache, ConflictError
+)
+from taskmaster.utils import logger
+
+# Task fields a client may set, which of them are ISO dates, the values
+# allowed for some of the rest, and which may be null
+TASK_FIELDS = ["title", "description", "due_date", "priority", "status", "category"]
+DATE_FIELDS = {"due_date", "created_at", "updated_at"}
+CHOICE_FIELDS = {"priority": PRIORITIES, "status": STATUSES}
+NULLABLE_FIELDS = {"description", "due_date", "category"}
+
+
+class HTTPError(Exception):
+    """An error response with a status code and message."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def task_to_json(task):
+    """Convert a Task into a JSON-ready dict (dates as ISO strings)."""
+    data = {"id": task.id, "user_id": task.user_id, "version": task.version}
+    for field in TASK_FIELDS + ["created_at", "updated_at"]:
+        value = getattr(task, field)
+        if field in DATE_FIELDS and value is not None:
+            value = value.isoformat()
+        data[field] = value
+    return data
+
+
+def user_to_json(user):
+    """Convert a User into a JSON-ready dict."""
+    return {
+        "id": user.id,
+        "username": user.username,
+        "display_name": user.display_name,
+        "created_at": user.created_at.isoformat(),
+    }
+
+
+def _parse_date(field, value):
+    """
+    Parse an ISO date from a request, or None for null/empty.
+
+    Dates with a UTC offset are converted to naive local time, which is
+    how dates are stored.
+    """
+    if value is None or value == "":
+        return None
+    try:
+        value = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{field} must be an ISO date")
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _check_strings(body, fields, nullable=()):
+    """Reject fields of a request body that are present but not strings."""
+    for field in fields:
+        if field not in body:
+            continue
+        value = body[field]
+        if not isinstance(value, str) and not (value is None and field in nullable):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"{field} must be a string")
+
+
+def _check_choices(body):
+    """Reject a priority or status the task list does not know."""
+    for field, choices in CHOICE_FIELDS.items():
+        if field in body and body[field] not in choices:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"{field} must be one of {', '.join(choices)}")
+
+
+def _parse_int(params, name, default, maximum=None):
+    """Read a positive integer query parameter."""
+    value = params.get(name, default)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer")
+    if value < 1:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must be positive")
+    return min(value, maximum) if maximum else value
+
+
+def _parse_cursor(value):
+    """Decode an "after" cursor returned as "next" by a previous page."""
+    if value is None:
+        return None
+    try:
+        sort_value, task_id = json.loads(value)
+    except (TypeError, ValueError):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "after must be a cursor returned as next")
+
+    # Cursors hold a sort value and a task id; anything else (such as a
+    # list, which cannot key the query cache) was not returned by us
+    if (isinstance(sort_value, bool) or not isinstance(sort_value, (str, int, float, type(None)))
+            or isinstance(task_id, bool) or not isinstance(task_id, int)):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "after must be a cursor returned as next")
+    return (sort_value, task_id)
+
+
+class TaskMasterHandler(BaseHTTPRequestHandler):
+    """Routes JSON requests to storage calls.
+
+    ThreadingHTTPServer runs each connection on its own thread; storage
+    calls check connections out of the shared DatabaseManager pool, so
+    concurrent clients never open a connection per request.
+    """
+
+    # Keep-alive connections (every response sets Content-Length). Headers
+    # and body are separate writes, so Nagle's algorithm would hold the
+    # body back until the client's delayed ACK (~40 ms per request)
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_version = "TaskMaster"
+
+    # (method, path pattern, handler method name)
+    ROUTES = [
+        ("POST", r"/users", "create_user"),
+        ("GET", r"/users/([^/]+)", "get_user"),
+        ("GET", r"/users/([^/]+)/tasks", "list_tasks"),
+        ("POST", r"/users/([^/]+)/tasks", "create_task"),
+        ("GET", r"/users/([^/]+)/search", "search_tasks"),
+        ("GET", r"/users/([^/]+)/report", "get_report"),
+        ("GET", r"/users/([^/]+)/changes", "list_changes"),
+        ("GET", r"/tasks/(\d+)", "get_task"),
+        ("PATCH", r"/tasks/(\d+)", "update_task"),
+        ("DELETE", r"/tasks/(\d+)", "delete_task"),
+        ("GET", r"/debug/stats", "get_stats"),
+    ]
+    ROUTES = [(method, re.compile(pattern + "$"), name) for method, pattern, name in ROUTES]
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method):
+        """Find the route for the request and send its JSON result."""
+        url = urlsplit(self.path)
+        self.params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+        try:
+            allowed = False
+            for route_method, pattern, name in self.ROUTES:
+                match = pattern.match(url.path)
+                if not match:
+                    continue
+                allowed = True
+                if route_method == method:
+                    args = [unquote(group) for group in match.groups()]
+                    status, body = getattr(self, "handle_" + name)(*args)
+                    break
+            else:
+                if allowed:
+                    raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {url.path}")
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"No such resource: {url.path}")
+        except HTTPError as error:
+            status, body = error.status, {"error": error.message}
+        except ConflictError as error:
+            status, body = HTTPStatus.CONFLICT, {"error": str(error)}
+        except Exception:
+            logger.exception("Request %s %s failed", method, self.path)
+            status, body = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+
+        self._send_json(status, body)
+
+    def _send_json(self, status, body):
+        """Write a JSON response."""
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self):
+        """Read the request body as a JSON object."""
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Request body must be JSON")
+        if not isinstance(body, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+        return body
+
+    def _user(self, username):
+        """Look up a user by username or fail with 404."""
+        user = get_user_by_username(username)
+        if user is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No such user: {username}")
+        return user
+
+    def _task(self, task_id):
+        """Look up a task by id or fail with 404."""
+        task = get_task(int(task_id))
+        if task is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No such task: {task_id}")
+        return task
+
+    def handle_create_user(self):
+        body = self._read_json()
+        _check_strings(body, ["username", "display_name"], nullable={"display_name"})
+        username = (body.get("username") or "").strip().lower()
+        if not username:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "username is required")
+        if get_user_by_username(username) is not None:
+            raise HTTPError(HTTPStatus.CONFLICT, f"User already exists: {username}")
+
+        # Another request may create the same user between the check and the insert
+        try:
+            user = create_user(User(username=username, display_name=body.get("display_name") or username.capitalize()))
+        except sqlite3.IntegrityError:
+            raise HTTPError(HTTPStatus.CONFLICT, f"User already exists: {username}")
+        return HTTPStatus.CREATED, user_to_json(user)
+
+    def handle_get_user(self, username):
+        return HTTPStatus.OK, user_to_json(self._user(username))
+
+    def handle_list_tasks(self, username):
+        """One page of tasks; pass the returned next cursor as after for the next page."""
+        user = self._user(username)
+        params = self.params
+        order_by = params.get("order_by", "id")
+        limit = _parse_int(params, "limit", TASK_PAGE_SIZE, SERVER_MAX_PAGE_SIZE)
+
+        try:
+            tasks = query_tasks(
+                user.id,
+                status=params.get("status"),
+                priority=params.get("priority"),
+                category=params.get("category"),
+                due_before=_parse_date("due_before", params.get("due_before")),
+                order_by=order_by,
+                limit=limit,
+                after=_parse_cursor(params.get("after")),
+                description=True
+            )
+        except ValueError as error:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(error))
+
+        next_cursor = None
+        if len(tasks) == limit:
+            next_cursor = json.dumps(task_sort_key(tasks[-1], order_by))
+        return HTTPStatus.OK, {"tasks": [task_to_json(task) for task in tasks], "next": next_cursor}
+
+    def handle_create_task(self, username):
+        user = self._user(username)
+        body = self._read_json()
+        _check_strings(body, TASK_FIELDS, NULLABLE_FIELDS)
+        if not body.get("title"):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "title is required")
+        _check_choices(body)
+
+        task = Task(
+            user_id=user.id,
+            title=body["title"],
+            description=body.get("description") or "",
+            due_date=_parse_date("due_date", body.get("due_date")),
+            priority=body.get("priority"),
+            status=body.get("status"),
+            category=body.get("category") or ""
+        )
+        create_task(task)
+        return HTTPStatus.CREATED, task_to_json(task)
+
+    def handle_search_tasks(self, username):
+        user = self._user(username)
+        params = self.params
+        tasks = search_tasks(
+            user.id,
+            params.get("q", ""),
+            limit=_parse_int(params, "limit", SEARCH_LIMIT, SERVER_MAX_PAGE_SIZE),
+            status=params.get("status"),
+            priority=params.get("priority"),
+            description=True
+        )
+        return HTTPStatus.OK, {"tasks": [task_to_json(task) for task in tasks]}
+
+    def handle_get_report(self, username):
+        report = build_report(self._user(username).id)
+        return HTTPStatus.OK, {
+            "total": report.total,
+            "completed": report.completed,
+            "completion_rate": report.completion_rate,
+            "overdue": report.overdue,
+            "due_this_week": report.due_this_week,
+            "by_status": report.by_status,
+            "by_priority": report.by_priority,
+            "by_category": report.by_category,
+        }
+
+    def handle_list_changes(self, username):
+        """
+        Tasks changed since the seq passed as after.
+
+        "reload" is true when the changes are no longer all logged; fetch
+        the task list again and continue from the returned seq.
+        """
+        user = self._user(username)
+        after = self.params.get("after")
+        if after is None:
+            return HTTPStatus.OK, {"seq": get_change_seq(), "reload": False, "tasks": [], "deleted": []}
+        if not after.isdigit():
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "after must be a seq returned by a previous request")
+
+        seq, tasks, deleted = get_task_changes(user.id, int(after), description=True)
+        if tasks is None:
+            return HTTPStatus.OK, {"seq": seq, "reload": True, "tasks": [], "deleted": []}
+        return HTTPStatus.OK, {"seq": seq, "reload": False,
+                               "tasks": [task_to_json(task) for task in tasks], "deleted": deleted}
+
+    def handle_get_task(self, task_id):
+        return HTTPStatus.OK, task_to_json(self._task(task_id))
+
+    def handle_update_task(self, task_id):
+        task = self._task(task_id)
+        body = self._read_json()
+
+        # Without a version the client overwrites whatever is stored now
+        if "version" in body:
+            if isinstance(body["version"], bool):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "version must be an integer")
+            task.version = _parse_int(body, "version", None)
+        _check_strings(body, TASK_FIELDS, NULLABLE_FIELDS)
+        _check_choices(body)
+
+        for field in TASK_FIELDS:
+            if field not in body:
+                continue
+            value = body[field]
+            if field in DATE_FIELDS:
+                value = _parse_date(field, value)
+            setattr(task, field, value)
+        if not task.title:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "title is required")
+
+        task.touch()
+        update_task(task)
+        return HTTPStatus.OK, task_to_json(task)
+
+    def handle_delete_task(self, task_id):
+        self._task(task_id)
+        delete_task(int(task_id))
+        return HTTPStatus.NO_CONTENT, None
+
+    def handle_get_stats(self):
+        """Instrumentation stats (empty unless TASKMASTER_INSTRUMENT=1) and query cache counters."""
+        stats = instrumentation.snapshot(with_plans=self.params.get("plans") == "1")
+        stats["query_cache"] = query_cache.stats()
+        return HTTPStatus.OK, stats
+
+    def log_message(self, format, *args):
+        """Log requests through the taskmaster logger at debug level."""
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def make_server(host=SERVER_HOST, port=SERVER_PORT):
+    """Create a threaded HTTP server (port 0 picks a free port)."""
+    server = ThreadingHTTPServer((host, port), TaskMasterHandler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Serve the TaskMaster JSON API.")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    args = parser.parse_args(argv)
+
+    db_manager.init_db()
+    server = make_server(args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"Serving TaskMaster API on http://{host}:{port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        db_manager.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
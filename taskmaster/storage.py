@@ -2,227 +2,1030 @@
 
 import sqlite3
 import os
-from taskmaster.config import DB_PATH, DATA_DIR
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+from datetime import datetime
+from taskmaster.config import (
+    DB_PATH, DATA_DIR, DB_POOL_SIZE, DB_STATEMENT_CACHE_SIZE, DB_CACHE_SIZE_KB, DB_MMAP_SIZE,
+    DB_BUSY_TIMEOUT_MS, DB_BUSY_RETRIES, DB_BUSY_BACKOFF_SECONDS, BULK_CHUNK_SIZE, CHANGE_BATCH_LIMIT
+)
+from taskmaster import instrumentation
+from taskmaster.cache import QueryCache
+from taskmaster.instrumentation import timed
+from taskmaster.migrations import apply_migrations, TASK_DAILY_SELECT
+from taskmaster.models import Task, User
+from taskmaster.utils import logger, to_epoch, from_epoch
+
+# Datetimes are stored as integer epoch seconds, and columns declared
+# EPOCH are decoded back to datetimes by sqlite3 itself
+sqlite3.register_adapter(datetime, to_epoch)
+sqlite3.register_converter("EPOCH", from_epoch)
+
+
+class ConflictError(Exception):
+    """A task was changed by someone else since it was loaded."""
+    
+    def __init__(self, task_id):
+        super().__init__(f"Task {task_id} was changed by someone else; reload it and try again")
+        self.task_id = task_id
+
+
+def _is_busy(error):
+    """Return True if an OperationalError means another connection holds the lock."""
+    message = str(error)
+    return "locked" in message or "busy" in message
 
 
 class DatabaseManager:
-    """Handles SQLite database connections and operations."""
+    """Handles SQLite database connections and operations.
+
+    Connections are kept open in a small pool and reused across calls, so
+    each helper pays for a query instead of a connect/close round trip.
+    """
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool_size: int = DB_POOL_SIZE):
         """
-        Initialize DatabaseManager with database path
+        Initialize DatabaseManager with database path and pool size.
         
 
         """
         self.db_path = db_path
+        self.pool_size = pool_size
+        
+        # Idle connections ready for reuse (most recently used first)
+        self._pool = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._closed = False
+        
+        # Connection currently checked out by this thread (for nesting)
+        self._local = threading.local()
+        
+        # Never-used connection whose data_version shows commits by any other
+        self._monitor = None
+        self._monitor_lock = threading.Lock()
     
     def get_connection(self):
         """
-        Get a connection to the SQLite database.
+        Open a new connection to the SQLite database.
         
+        The connection runs in autocommit mode; transactions are started
+        explicitly by transaction(). The caller owns the connection and
+        must close it. Helpers should use connection() instead.
 
         """
-        return sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=DB_BUSY_TIMEOUT_MS / 1000,
+            cached_statements=DB_STATEMENT_CACHE_SIZE,
+            detect_types=sqlite3.PARSE_DECLTYPES
+        )
+        
+        # Per-connection tuning (WAL itself is persisted by init_db)
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = -{DB_CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE}")
+        
+        # Statements are only traced (for slow-call logs) while instrumented
+        if instrumentation.enabled:
+            conn.set_trace_callback(instrumentation.trace_statement)
+        return conn
+    
+    def _acquire(self):
+        """Take an idle connection from the pool or open a new one."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("DatabaseManager has been closed")
+        
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        
+        # Open a new connection if the pool is not full yet
+        with self._lock:
+            can_open = self._opened < self.pool_size
+            if can_open:
+                self._opened += 1
+        
+        if can_open:
+            try:
+                return self.get_connection()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+        
+        # Otherwise wait for another thread to give one back
+        return self._pool.get()
+    
+    def _release(self, conn):
+        """Return a connection to the pool (or close it after shutdown)."""
+        if self._closed:
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+        else:
+            self._pool.put(conn)
+    
+    @contextmanager
+    def connection(self):
+        """
+        Check out a pooled connection for the duration of a with block.
+        
+        Nested calls on the same thread reuse the outer connection.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+        
+        conn = self._acquire()
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._release(conn)
+    
+    def _begin(self, conn, immediate):
+        """
+        Start a transaction, retrying while other writers hold the lock.
+        
+        Each attempt already waits up to the busy timeout inside SQLite;
+        between attempts the backoff doubles, with jitter so processes
+        that collided do not retry in lockstep.
+        """
+        statement = "BEGIN IMMEDIATE" if immediate else "BEGIN"
+        delay = DB_BUSY_BACKOFF_SECONDS
+        
+        for attempt in range(DB_BUSY_RETRIES + 1):
+            try:
+                conn.execute(statement)
+                return
+            except sqlite3.OperationalError as error:
+                if not _is_busy(error) or attempt == DB_BUSY_RETRIES:
+                    raise
+            time.sleep(delay * random.uniform(0.5, 1.5))
+            delay *= 2
+    
+    def in_transaction(self):
+        """Return True if this thread's checked-out connection is inside a transaction."""
+        conn = getattr(self._local, "conn", None)
+        return conn is not None and conn.in_transaction
+    
+    @contextmanager
+    def transaction(self, immediate=False):
+        """
+        Run a with block inside a transaction.
+        
+        Commits on success and rolls back on error. A nested transaction
+        joins the outer one instead of committing on its own. immediate
+        takes the write lock up front (BEGIN IMMEDIATE); use it for every
+        write so a transaction never has to upgrade a stale read snapshot.
+        """
+        with self.connection() as conn:
+            if conn.in_transaction:
+                yield conn
+                return
+            
+            self._begin(conn, immediate)
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                # A failed COMMIT leaves the transaction open; never pool
+                # a connection inside one
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+    
+    def data_version(self):
+        """
+        Return a value that changes whenever any connection commits a change.
+        
+        Reads PRAGMA data_version on a connection of its own that never
+        writes, so commits from this process and from other processes
+        both show up. Costs one PRAGMA, without touching the tables.
+        """
+        with self._monitor_lock:
+            if self._monitor is None:
+                self._monitor = sqlite3.connect(self.db_path, check_same_thread=False,
+                                                isolation_level=None)
+            return self._monitor.execute("PRAGMA data_version").fetchone()[0]
+    
+    def close(self):
+        """Close all pooled connections. Call once on shutdown."""
+        self._closed = True
+        
+        with self._monitor_lock:
+            if self._monitor is not None:
+                self._monitor.close()
+                self._monitor = None
+        
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
     
     def init_db(self):
         """
-        Initialize the database by creating tables if they don't exist.
+        Initialize the database and bring its schema up to date.
+        
+        Existing databases are upgraded in place by the pending steps in
+        taskmaster.migrations.
         """
         # Ensure data directory exists
         os.makedirs(DATA_DIR, exist_ok=True)
         
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Create users table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                display_name TEXT NOT NULL,
-                created_at TIMESTAMP NOT NULL,
-                updated_at TIMESTAMP NOT NULL
-            )
-        """)
-        
-        # Create tasks table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                title TEXT NOT NULL,
-                description TEXT,
-                due_date TIMESTAMP,
-                priority TEXT NOT NULL,
-                status TEXT NOT NULL,
-                category TEXT,
-                created_at TIMESTAMP NOT NULL,
-                updated_at TIMESTAMP NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
-
+        with self.connection() as conn:
+            # WAL lets readers run while a write is in progress
+            conn.execute("PRAGMA journal_mode = WAL")
+            apply_migrations(conn)
 
 
 db_manager = DatabaseManager(DB_PATH)
 
 
-def create_user(user):
+def _cache_version():
+    """Database identity and data_version, so swapping db_manager also resets the cache."""
+    return id(db_manager), db_manager.data_version()
+
+
+# Rows of repeated reads (user lookups, task list pages). Writes below
+# invalidate the users they touch; commits from elsewhere clear it
+query_cache = QueryCache(_cache_version)
+
+
+def _cached_rows(sql, params, tags):
+    """Return the rows of a SELECT, from query_cache when possible."""
+    key = (sql, tuple(params))
+    rows, epoch = query_cache.get(key)
+    if rows is None:
+        with db_manager.connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        query_cache.put(key, rows, tags, epoch)
+    return rows
+
+
+@contextmanager
+def _write_transaction():
     """
-    Insert a new user into the database.
+    Run a write transaction, then invalidate the cached reads it affects.
     
+    Yields (conn, stale): add the tag of every cached read the write
+    changes to stale, e.g. ("user", user_id) when a user's tasks change.
+    Commits made elsewhere since the last check are noticed while
+    the write lock is held, before this write's own commit hides them.
+    Only a commit landing between this COMMIT and the data_version read
+    that follows it can go unnoticed, until the cache TTL.
     """
-    conn = db_manager.get_connection()
-    cursor = conn.cursor()
+    stale = set()
+    # Inside a caller's transaction nothing is committed yet: leave the
+    # outer commit to be noticed as a change by the next read
+    nested = db_manager.in_transaction()
     
-    cursor.execute("""
-        INSERT INTO users (username, display_name, created_at, updated_at)
-        VALUES (?, ?, ?, ?)
-    """, (user.username, user.display_name, user.created_at, user.updated_at))
+    with db_manager.transaction(immediate=True) as conn:
+        if not nested:
+            query_cache.validate()
+        yield conn, stale
     
-    user.id = cursor.lastrowid
+    query_cache.invalidate(*stale)
+    if not nested:
+        query_cache.mark_synced()
+
+
+@timed()
+def create_user(user):
+    """
+    Insert a new user into the database.
     
-    conn.commit()
-    conn.close()
+    """
+    with _write_transaction() as (conn, stale):
+        cursor = conn.execute("""
+            INSERT INTO users (username, display_name, created_at, updated_at)
+            VALUES (?, ?, ?, ?)
+        """, (user.username, user.display_name, user.created_at, user.updated_at))
+        
+        user.id = cursor.lastrowid
+        stale.add(("username", user.username))
     
     return user
 
 
+@timed()
 def get_user_by_username(username):
     """
     Fetch a user by username.
     
     """
-    from taskmaster.models import User
-    
-    conn = db_manager.get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
+    username = username.strip().lower()
+    rows = _cached_rows("""
         SELECT id, username, display_name, created_at, updated_at
         FROM users
         WHERE username = ?
-    """, (username.strip().lower(),))
+    """, (username,), [("username", username)])
     
-    row = cursor.fetchone()
-    conn.close()
-    
-    if row:
-        return User(
-            username=row[1],
-            display_name=row[2],
-            id=row[0],
-            created_at=row[3],
-            updated_at=row[4]
-        )
+    if rows:
+        return User.from_row(rows[0])
     
     return None
 
 
+@timed()
 def create_task(task):
     """
     Insert a new task into the database.
     
     """
-    conn = db_manager.get_connection()
-    cursor = conn.cursor()
+    with _write_transaction() as (conn, stale):
+        cursor = conn.execute("""
+            INSERT INTO tasks (user_id, title, description, due_date, priority, status, category, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (task.user_id, task.title, task.description, task.due_date, 
+              task.priority, task.status, task.category, task.created_at, task.updated_at))
+        
+        task.id = cursor.lastrowid
+        stale.add(("user", task.user_id))
+    
+    task.mark_clean()
+    return task
+
+
+# Columns selected for Task rows, in Task.from_row order
+TASK_COLUMNS = "id, user_id, title, description, due_date, priority, status, category, created_at, updated_at, version"
+
+# Columns selected for task lists, in Task.from_list_row order. Lists never
+# show descriptions, which can be kilobytes each; they load on demand.
+# Timestamps are selected as +column, which has no declared type, so the
+# EPOCH converter is skipped and from_list_row decodes only what is read
+LIST_COLUMNS = "id, user_id, title, +due_date, priority, status, category, +created_at, +updated_at, version"
+
+# Sort keys accepted by query_tasks (prefix with "-" for descending).
+# Each expression is never NULL, so (expression, id) pairs can be used as
+# keyset cursors, and must match the (user_id, expression, id) indexes from
+# migration 5 ("id" is served by the rowid order of any of them).
+NO_DUE_DATE = 2 ** 63 - 1
+ORDER_BY_COLUMNS = {
+    "id": "id",
+    "title": "title",
+    "due_date": f"IFNULL(due_date, {NO_DUE_DATE})",
+    "priority": "CASE priority WHEN 'Low' THEN 0 WHEN 'Medium' THEN 1 WHEN 'High' THEN 2 ELSE 1 END",
+    "status": "status",
+    "category": "IFNULL(category, '')",
+    "created_at": "created_at",
+}
+
+# Python equivalents of ORDER_BY_COLUMNS, used to build cursors from tasks
+_PRIORITY_RANKS = {"Low": 0, "Medium": 1, "High": 2}
+_SORT_VALUES = {
+    "id": lambda task: task.id,
+    "title": lambda task: task.title,
+    "due_date": lambda task: to_epoch(task.due_date) if task.due_date else NO_DUE_DATE,
+    "priority": lambda task: _PRIORITY_RANKS.get(task.priority, 1),
+    "status": lambda task: task.status,
+    "category": lambda task: task.category or "",
+    "created_at": lambda task: to_epoch(task.created_at),
+}
+
+
+def task_sort_key(task, order_by):
+    """
+    Return the (value, id) keyset cursor of a task for a sort key.
     
-    cursor.execute("""
-        INSERT INTO tasks (user_id, title, description, due_date, priority, status, category, created_at, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (task.user_id, task.title, task.description, task.due_date, 
-          task.priority, task.status, task.category, task.created_at, task.updated_at))
+    The direction prefix of order_by is ignored.
+    """
+    return (_SORT_VALUES[order_by.lstrip("-")](task), task.id)
+
+
+@timed()
+def query_tasks(user_id, status=None, priority=None, category=None, due_before=None,
+                order_by="id", limit=None, offset=0, after=None, before=None, description=False):
+    """
+    Load the tasks for a user that match the given filters.
     
-    task.id = cursor.lastrowid
+    Filters left as None are not applied. Filtering, ordering and paging
+    all happen in SQL, so only matching rows are turned into Task objects.
     
-    conn.commit()
-    conn.close()
+    after and before are keyset cursors from task_sort_key: the page
+    starts right after (or ends right before) that task. Seeking through
+    the sort index costs the same at any depth, unlike a large offset.
     
-    return task
+    Descriptions are left out unless description is true; see
+    Task.from_list_row.
+    """
+    clauses = ["user_id = ?"]
+    params = [user_id]
+    
+    if status is not None:
+        clauses.append("status = ?")
+        params.append(status)
+    if priority is not None:
+        clauses.append("priority = ?")
+        params.append(priority)
+    # Category and due date filters are written as their sort expressions so
+    # they can seek the sort indexes; a missing category counts as ""
+    if category is not None:
+        clauses.append(f"{ORDER_BY_COLUMNS['category']} = ?")
+        params.append(category)
+    if due_before is not None:
+        clauses.append(f"{ORDER_BY_COLUMNS['due_date']} < ?")
+        params.append(due_before)
+    
+    # Validate the sort key so it can be formatted into the SQL safely
+    descending = order_by.startswith("-")
+    order_by = order_by.lstrip("-")
+    if order_by not in ORDER_BY_COLUMNS:
+        raise ValueError(f"Cannot order tasks by {order_by!r}")
+    expression = ORDER_BY_COLUMNS[order_by]
+    
+    # Paging backwards scans in the opposite direction, then flips the page
+    reverse = before is not None
+    cursor = before if reverse else after
+    scan_descending = descending != reverse
+    
+    if cursor is not None:
+        # The plain bound lets SQLite seek the expression index; the row
+        # value comparison then breaks ties on id
+        op = "<" if scan_descending else ">"
+        clauses.append(f"{expression} {op}= ? AND ({expression}, id) {op} (?, ?)")
+        params.extend([cursor[0], cursor[0], cursor[1]])
+    
+    direction = "DESC" if scan_descending else "ASC"
+    sql = f"""
+        SELECT {TASK_COLUMNS if description else LIST_COLUMNS}
+        FROM tasks
+        WHERE {" AND ".join(clauses)}
+        ORDER BY {expression} {direction}, id {direction}
+    """
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+    
+    rows = _cached_rows(sql, params, [("user", user_id)])
+    
+    if reverse:
+        rows = rows[::-1]
+    from_row = Task.from_row if description else Task.from_list_row
+    return [from_row(row) for row in rows]
 
 
-def get_tasks_for_user(user_id):
+def _fts_query(text):
     """
-    Load all tasks for a given user.
+    Turn free text into an FTS5 query matching every word as a prefix.
+    
+    Words are quoted so punctuation typed by the user is never parsed as
+    FTS5 syntax.
+    """
+    words = text.split()
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+
+
+@timed()
+def search_tasks(user_id, query, limit=50, status=None, priority=None, description=False):
+    """
+    Full-text search a user's task titles and descriptions.
     
+    Results are ranked best match first (bm25). status, priority and
+    description are applied like in query_tasks.
     """
-    from taskmaster.models import Task
-    from datetime import datetime
+    match = _fts_query(query)
+    if not match:
+        return []
     
-    conn = db_manager.get_connection()
-    cursor = conn.cursor()
+    clauses = ["tasks_fts MATCH ?", "tasks.user_id = ?"]
+    params = [match, user_id]
     
-    cursor.execute("""
-        SELECT id, user_id, title, description, due_date, priority, status, category, created_at, updated_at
-        FROM tasks
-        WHERE user_id = ?
-    """, (user_id,))
+    if status is not None:
+        clauses.append("tasks.status = ?")
+        params.append(status)
+    if priority is not None:
+        clauses.append("tasks.priority = ?")
+        params.append(priority)
     
-    rows = cursor.fetchall()
-    conn.close()
+    params.append(limit)
+    columns = ", ".join(f"tasks.{column}" if column[0] != "+" else f"+tasks.{column[1:]}"
+                        for column in (TASK_COLUMNS if description else LIST_COLUMNS).split(", "))
     
-    tasks = []
-    for row in rows:
-        # Convert due_date string back to datetime if present
-        due_date = None
-        if row[4]:
-            try:
-                due_date = datetime.fromisoformat(row[4])
-            except (ValueError, AttributeError):
-                due_date = None
-        
-        task = Task(
-            user_id=row[1],
-            title=row[2],
-            description=row[3],
-            due_date=due_date,
-            priority=row[5],
-            status=row[6],
-            category=row[7],
-            id=row[0],
-            created_at=row[8],
-            updated_at=row[9]
-        )
-        tasks.append(task)
+    rows = _cached_rows(f"""
+        SELECT {columns}
+        FROM tasks_fts
+        JOIN tasks ON tasks.id = tasks_fts.rowid
+        WHERE {" AND ".join(clauses)}
+        ORDER BY bm25(tasks_fts)
+        LIMIT ?
+    """, params, [("user", user_id)])
+    
+    from_row = Task.from_row if description else Task.from_list_row
+    return [from_row(row) for row in rows]
+
+
+@timed()
+def get_task(task_id):
+    """
+    Fetch a single task by id, or None if it does not exist.
+    
+    """
+    with db_manager.connection() as conn:
+        row = conn.execute(f"""
+            SELECT {TASK_COLUMNS}
+            FROM tasks
+            WHERE id = ?
+        """, (task_id,)).fetchone()
+    
+    if row:
+        return Task.from_row(row)
+    
+    return None
+
+
+@timed()
+def get_task_description(task_id):
+    """
+    Fetch the description of a task, or None if the task does not exist.
+    
+    Used to fill in tasks loaded without one (see Task.from_list_row).
+    """
+    with db_manager.connection() as conn:
+        row = conn.execute("SELECT description FROM tasks WHERE id = ?", (task_id,)).fetchone()
+    
+    return row[0] if row else None
+
+
+Task.description_loader = get_task_description
+
+
+@timed()
+def get_tasks_for_user(user_id, description=False):
+    """
+    Load all tasks for a given user.
     
-    return tasks
+    """
+    return query_tasks(user_id, description=description)
 
 
+# Columns update_task may write, in a fixed order so each combination
+# maps to one cached statement
+UPDATE_COLUMNS = ["user_id", "title", "description", "due_date", "priority", "status", "category", "updated_at"]
+
+# Most ids bound into one IN (...) list (SQLite builds before 3.32 allow 999 variables)
+MAX_IN_IDS = 500
+
+
+@timed()
 def update_task(task):
     """
     Update an existing task in the database.
+    
+    Only the columns in task.changed_fields are written, so completing a
+    task does not rewrite its description. The write only applies if the
+    stored version still matches task.version; otherwise ConflictError is
+    raised and nothing changes. On success task.version is incremented.
+    """
+    changed = task.changed_fields
+    if not changed:
+        return
+    columns = [column for column in UPDATE_COLUMNS if column in changed]
+    
+    with _write_transaction() as (conn, stale):
+        if "user_id" in changed:
+            row = conn.execute("SELECT user_id FROM tasks WHERE id = ?", (task.id,)).fetchone()
+            if row:
+                stale.add(("user", row[0]))
+        
+        cursor = conn.execute(f"""
+            UPDATE tasks
+            SET {", ".join(f"{column} = ?" for column in columns)}, version = version + 1
+            WHERE id = ? AND version = ?
+        """, [getattr(task, column) for column in columns] + [task.id, task.version])
+        
+        if cursor.rowcount == 0:
+            raise ConflictError(task.id)
+        stale.add(("user", task.user_id))
+    
+    task.version += 1
+    task.mark_clean()
+
+
+def _set_task_fields(task_ids, values, now=None):
+    """
+    Give many tasks the same column values in one transaction.
+    
+    values maps UPDATE_COLUMNS names to values. Tasks that already hold
+    those values are left alone. Returns {task_id: new version} for the
+    tasks that changed.
+    """
+    columns = [column for column in UPDATE_COLUMNS if column in values]
+    params = [values[column] for column in columns]
+    now = now or datetime.utcnow()
+    versions = {}
+    
+    with _write_transaction() as (conn, stale):
+        for chunk in _chunks(task_ids, MAX_IN_IDS):
+            rows = conn.execute(f"""
+                SELECT id, version, user_id FROM tasks
+                WHERE id IN ({", ".join("?" * len(chunk))})
+                  AND ({" OR ".join(f"{column} IS NOT ?" for column in columns)})
+            """, chunk + params).fetchall()
+            if not rows:
+                continue
+            
+            conn.execute(f"""
+                UPDATE tasks
+                SET {", ".join(f"{column} = ?" for column in columns)}, updated_at = ?,
+                    version = version + 1
+                WHERE id IN ({", ".join("?" * len(rows))})
+            """, params + [now] + [row[0] for row in rows])
+            versions.update((task_id, version + 1) for task_id, version, _ in rows)
+            stale.update(("user", user_id) for _, _, user_id in rows)
+    
+    return versions
+
+
+@timed()
+def complete_tasks(task_ids, now=None):
+    """
+    Mark many tasks as completed with one UPDATE per MAX_IN_IDS ids.
+    
+    Only status, updated_at and version are written. Returns
+    {task_id: new version} for the tasks that were not already completed.
+    """
+    return _set_task_fields(task_ids, {"status": "Completed"}, now)
+
+
+@timed()
+def set_tasks_priority(task_ids, priority, now=None):
     """
-    conn = db_manager.get_connection()
-    cursor = conn.cursor()
+    Give many tasks the same priority in one transaction.
     
-    cursor.execute("""
-        UPDATE tasks
-        SET user_id = ?, title = ?, description = ?, due_date = ?, 
-            priority = ?, status = ?, category = ?, updated_at = ?
-        WHERE id = ?
-    """, (task.user_id, task.title, task.description, task.due_date,
-          task.priority, task.status, task.category, task.updated_at, task.id))
+    Returns {task_id: new version} for the tasks that changed.
+    """
+    return _set_task_fields(task_ids, {"priority": priority}, now)
+
+
+@timed()
+def set_tasks_category(task_ids, category, now=None):
+    """
+    Give many tasks the same category in one transaction.
     
-    conn.commit()
-    conn.close()
+    Returns {task_id: new version} for the tasks that changed.
+    """
+    return _set_task_fields(task_ids, {"category": category}, now)
 
 
+@timed()
 def delete_task(task_id):
     """
     Delete a task by id.
     
     """
-    conn = db_manager.get_connection()
-    cursor = conn.cursor()
+    with _write_transaction() as (conn, stale):
+        row = conn.execute("SELECT user_id FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        if row is None:
+            return
+        conn.execute("""
+            DELETE FROM tasks
+            WHERE id = ?
+        """, (task_id,))
+        stale.add(("user", row[0]))
+
+
+def _chunks(iterable, size):
+    """Yield lists of up to size items from any iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+@timed()
+def create_tasks(tasks, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Insert many tasks with executemany, one transaction per chunk.
+    
+    tasks can be any iterable (including a generator), so memory use is
+    bounded by chunk_size. Each task's id is set. Returns the number of
+    tasks inserted.
+    """
+    count = 0
+    
+    for chunk in _chunks(tasks, chunk_size):
+        with _write_transaction() as (conn, stale):
+            # With AUTOINCREMENT and the write lock held, new ids follow the counter
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'tasks'").fetchone()
+            next_id = (row[0] if row else 0) + 1
+            
+            conn.executemany("""
+                INSERT INTO tasks (user_id, title, description, due_date, priority, status, category, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(task.user_id, task.title, task.description, task.due_date,
+                   task.priority, task.status, task.category, task.created_at, task.updated_at)
+                  for task in chunk])
+            stale.update(("user", task.user_id) for task in chunk)
+        
+        for offset, task in enumerate(chunk):
+            task.id = next_id + offset
+            task.mark_clean()
+        count += len(chunk)
+    
+    return count
+
+
+@timed()
+def update_tasks(tasks, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Update many tasks with executemany, one transaction per chunk.
+    
+    As in update_task, only each task's changed_fields are written (one
+    executemany per distinct set of columns), so descriptions that were
+    never loaded are never read. Versions are checked like in update_task:
+    if any task in a chunk is stale the whole chunk is rolled back and
+    ConflictError is raised (earlier chunks stay committed). Returns the
+    number of tasks updated; tasks without changes are skipped.
+    """
+    count = 0
+    
+    for chunk in _chunks(tasks, chunk_size):
+        # Changed tasks grouped by the columns to write
+        groups = {}
+        for task in chunk:
+            changed = task.changed_fields
+            if changed:
+                columns = tuple(column for column in UPDATE_COLUMNS if column in changed)
+                groups.setdefault(columns, []).append(task)
+        if not groups:
+            continue
+        
+        with _write_transaction() as (conn, stale):
+            # Check every version first, with the write lock held: after
+            # the UPDATE a skipped row cannot be told from a written one
+            changed = [task for group in groups.values() for task in group]
+            expected = {task.id: task.version for task in changed}
+            if len(expected) != len(changed):
+                seen = set()
+                for task in changed:
+                    if task.id in seen:
+                        raise ConflictError(task.id)
+                    seen.add(task.id)
+            for ids in _chunks(list(expected), MAX_IN_IDS):
+                rows = conn.execute(f"""
+                    SELECT id, version, user_id FROM tasks WHERE id IN ({", ".join("?" * len(ids))})
+                """, ids).fetchall()
+                current = {task_id: version for task_id, version, _ in rows}
+                for task_id in ids:
+                    if current.get(task_id) != expected[task_id]:
+                        raise ConflictError(task_id)
+                # Tasks moved to another user also change their old owner's lists
+                stale.update(("user", user_id) for _, _, user_id in rows)
+            
+            for columns, group in groups.items():
+                conn.executemany(f"""
+                    UPDATE tasks
+                    SET {", ".join(f"{column} = ?" for column in columns)}, version = version + 1
+                    WHERE id = ?
+                """, [[getattr(task, column) for column in columns] + [task.id] for task in group])
+                stale.update(("user", task.user_id) for task in group)
+        
+        for group in groups.values():
+            for task in group:
+                task.version += 1
+                task.mark_clean()
+                count += 1
+    
+    return count
+
+
+@timed()
+def delete_tasks(task_ids, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Delete many tasks by id, one transaction per chunk.
+    
+    Selections from the UI fit in one chunk, so they are deleted
+    atomically.
+    """
+    for chunk in _chunks(task_ids, chunk_size):
+        with _write_transaction() as (conn, stale):
+            for ids in _chunks(chunk, MAX_IN_IDS):
+                stale.update(("user", row[0]) for row in conn.execute(f"""
+                    SELECT DISTINCT user_id FROM tasks WHERE id IN ({", ".join("?" * len(ids))})
+                """, ids))
+            conn.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in chunk])
+
+
+def iter_tasks(user_id, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Yield every task of a user, fetching chunk_size rows at a time.
+    
+    Unlike get_tasks_for_user this never holds the whole list in memory.
+    """
+    with db_manager.connection() as conn:
+        cursor = conn.execute(f"""
+            SELECT {TASK_COLUMNS}
+            FROM tasks
+            WHERE user_id = ?
+            ORDER BY id
+        """, (user_id,))
+        
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            for row in rows:
+                yield Task.from_row(row)
+
+
+# Dimensions counted in task_stats: name -> value expression. Must match
+# the triggers from migration 7
+TASK_STATS_DIMENSIONS = {
+    "status": "status",
+    "priority": "priority",
+    "category": "IFNULL(category, '')",
+}
+
+# Live (user_id, dimension, value, count) rows that task_stats should hold
+TASK_STATS_SELECT = " UNION ALL ".join(
+    f"SELECT user_id, '{dimension}', {expression}, COUNT(*) FROM tasks GROUP BY 1, 3"
+    for dimension, expression in TASK_STATS_DIMENSIONS.items()
+)
+
+
+@timed()
+def get_task_stats(user_id):
+    """
+    Return a user's stored task counts as (dimension, value, count) rows.
+    
+    The counts are kept current by triggers, so this reads one row per
+    status, priority and category rather than counting tasks. Tasks
+    without a category are counted under "".
+    """
+    with db_manager.connection() as conn:
+        return conn.execute("""
+            SELECT dimension, value, count
+            FROM task_stats
+            WHERE user_id = ?
+        """, (user_id,)).fetchall()
+
+
+@timed()
+def count_due_tasks(user_id, cutoff, week_end):
+    """
+    Count a user's open tasks that are overdue and due before week_end.
+    
+    Returns (overdue, due_soon): open tasks due before cutoff (see
+    utils.overdue_cutoff), and open tasks due between cutoff and
+    week_end. Only open tasks due before week_end are scanned, through a
+    partial index.
+    """
+    with db_manager.connection() as conn:
+        overdue, due_soon = conn.execute("""
+            SELECT SUM(due_date < ?), SUM(due_date >= ?)
+            FROM tasks
+            WHERE user_id = ? AND status != 'Completed' AND due_date < ?
+        """, (cutoff, cutoff, user_id, week_end)).fetchone()
+    return overdue or 0, due_soon or 0
+
+
+@timed()
+def get_upcoming_due(user_id, start, end):
+    """
+    Return (id, due_date) for a user's open tasks due in [start, end).
+    
+    Ordered by due date, through the partial index of open tasks.
+    """
+    with db_manager.connection() as conn:
+        return conn.execute("""
+            SELECT id, due_date
+            FROM tasks
+            WHERE user_id = ? AND status != 'Completed' AND due_date >= ? AND due_date < ?
+            ORDER BY due_date
+        """, (user_id, start, end)).fetchall()
+
+
+@timed()
+def check_task_stats(rebuild=False):
+    """
+    Compare task_stats with live counts of the tasks table.
+    
+    Returns the differing (user_id, dimension, value, stored, actual)
+    rows, where a missing row counts as 0. With rebuild, task_stats is
+    then refilled from the live counts in the same transaction.
+    """
+    with db_manager.transaction(immediate=rebuild) as conn:
+        rows = conn.execute(f"""
+            WITH live (user_id, dimension, value, count) AS ({TASK_STATS_SELECT}),
+                 keys AS (SELECT user_id, dimension, value FROM live
+                          UNION SELECT user_id, dimension, value FROM task_stats)
+            SELECT keys.user_id, keys.dimension, keys.value,
+                   IFNULL(stats.count, 0), IFNULL(live.count, 0)
+            FROM keys
+            LEFT JOIN task_stats AS stats USING (user_id, dimension, value)
+            LEFT JOIN live USING (user_id, dimension, value)
+            WHERE IFNULL(stats.count, 0) != IFNULL(live.count, 0)
+            ORDER BY 1, 2, 3
+        """).fetchall()
+        
+        if rebuild:
+            conn.execute("DELETE FROM task_stats")
+            conn.execute(f"INSERT INTO task_stats (user_id, dimension, value, count) {TASK_STATS_SELECT}")
+    
+    if rows:
+        logger.warning("task_stats differs from the tasks table in %d rows%s",
+                       len(rows), " (rebuilt)" if rebuild else "")
+    return rows
+
+
+@timed()
+def get_daily_rollup(user_id, first_day, last_day):
+    """
+    Read a user's task_daily rows for a range of local epoch days (inclusive).
     
-    cursor.execute("""
-        DELETE FROM tasks
-        WHERE id = ?
-    """, (task_id,))
+    Returns (open, overdue, rows): the open and overdue task counts at the
+    start of first_day, and (day, created, completed, open_delta,
+    overdue_delta) rows for the days in range that had any activity.
+    """
+    with db_manager.transaction() as conn:
+        open_count, overdue = conn.execute("""
+            SELECT IFNULL(SUM(open_delta), 0), IFNULL(SUM(overdue_delta), 0)
+            FROM task_daily
+            WHERE user_id = ? AND day < ?
+        """, (user_id, first_day)).fetchone()
+        rows = conn.execute("""
+            SELECT day, created, completed, open_delta, overdue_delta
+            FROM task_daily
+            WHERE user_id = ? AND day BETWEEN ? AND ?
+            ORDER BY day
+        """, (user_id, first_day, last_day)).fetchall()
     
-    conn.commit()
-    conn.close()
+    return open_count, overdue, rows
+
 
+@timed()
+def get_change_seq():
+    """Return the seq of the latest logged task change (0 if none)."""
+    with db_manager.connection() as conn:
+        return conn.execute("SELECT IFNULL(MAX(seq), 0) FROM task_changes").fetchone()[0]
+
+
+@timed()
+def get_task_changes(user_id, after_seq, limit=CHANGE_BATCH_LIMIT, description=False):
+    """
+    Return the changes to a user's tasks logged after after_seq.
+    
+    Returns (seq, tasks, deleted): the seq to pass next time, the current
+    state of the tasks that were inserted or updated, and the ids of the
+    tasks that were deleted or moved to another user. Several changes to
+    one task collapse into its latest state. Only the user's log entries
+    after after_seq are read, through the (user_id, seq) index.
+    
+    tasks and deleted are None when the changes cannot be replayed: some
+    were already pruned from the log, or there are more than limit. Reload
+    everything instead.
+    """
+    with db_manager.transaction() as conn:
+        seq, first = conn.execute("""
+            SELECT (SELECT IFNULL(MAX(seq), 0) FROM task_changes),
+                   (SELECT MIN(seq) FROM task_changes)
+        """).fetchone()
+        if first is not None and after_seq < first - 1:
+            return seq, None, None
+        
+        rows = conn.execute("""
+            SELECT task_id, op
+            FROM task_changes
+            WHERE user_id = ? AND seq > ?
+            ORDER BY seq
+            LIMIT ?
+        """, (user_id, after_seq, limit + 1)).fetchall()
+        if len(rows) > limit:
+            return seq, None, None
+        
+        # Latest operation per task
+        ops = dict(rows)
+        deleted = [task_id for task_id, op in ops.items() if op == "delete"]
+        changed = [task_id for task_id, op in ops.items() if op != "delete"]
+        
+        columns = TASK_COLUMNS if description else LIST_COLUMNS
+        from_row = Task.from_row if description else Task.from_list_row
+        tasks = []
+        for ids in _chunks(changed, MAX_IN_IDS):
+            tasks.extend(from_row(row) for row in conn.execute(f"""
+                SELECT {columns}
+                FROM tasks
+                WHERE user_id = ? AND id IN ({", ".join("?" * len(ids))})
+            """, [user_id] + ids))
+    
+    # A logged task that is no longer the user's counts as deleted
+    found = {task.id for task in tasks}
+    deleted.extend(task_id for task_id in changed if task_id not in found)
+    return seq, tasks, deleted
@@ -0,0 +1,202 @@
+# Streaming CSV / JSON Lines import and export of tasks
+#
+# Usage:
+#     python -m taskmaster.transfer export USERNAME tasks.csv
+#     python -m taskmaster.transfer import USERNAME tasks.jsonl
+
+import argparse
+import csv
+import json
+import sys
+from datetime import datetime
+from taskmaster.config import PRIORITIES, STATUSES
+from taskmaster.models import Task
+from taskmaster.storage import db_manager, get_user_by_username, create_tasks, iter_tasks
+
+# Columns written to and read from files
+FIELDS = ["title", "description", "due_date", "priority", "status", "category", "created_at", "updated_at"]
+DATE_FIELDS = {"due_date", "created_at", "updated_at"}
+CHOICE_FIELDS = {"priority": PRIORITIES, "status": STATUSES}
+
+
+class RecordError(ValueError):
+    """A record in an import file that cannot be turned into a task."""
+
+    def __init__(self, line, message):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+
+
+def _format_for(path):
+    """Return "csv" or "jsonl" based on a file extension."""
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith(".jsonl") or path.endswith(".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Unsupported file type: {path} (use .csv or .jsonl)")
+
+
+def task_to_record(task):
+    """
+    Convert a Task into a flat dict of strings for export.
+
+    """
+    record = {}
+    for field in FIELDS:
+        value = getattr(task, field)
+        if field in DATE_FIELDS:
+            value = value.isoformat() if value else ""
+        record[field] = value if value is not None else ""
+    return record
+
+
+def record_to_task(record, user_id):
+    """
+    Convert an imported dict back into a Task for the given user.
+
+    Missing or empty dates become None (timestamps default to now), and a
+    missing priority or status gets the Task default. Raises ValueError
+    for a record without a title or with a field that is not a string, a
+    bad date or an unknown priority or status.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("expected an object of task fields")
+    for field in FIELDS:
+        value = record.get(field)
+        if value is not None and not isinstance(value, str):
+            raise ValueError(f"{field} must be a string")
+    if not record.get("title"):
+        raise ValueError("title is required")
+    for field, choices in CHOICE_FIELDS.items():
+        value = record.get(field)
+        if value and value not in choices:
+            raise ValueError(f"{field} must be one of {', '.join(choices)}, not {value!r}")
+
+    dates = {}
+    for field in DATE_FIELDS:
+        value = record.get(field)
+        try:
+            dates[field] = datetime.fromisoformat(value) if value else None
+        except ValueError:
+            raise ValueError(f"{field} must be an ISO date, not {value!r}")
+
+    return Task(
+        user_id=user_id,
+        title=record["title"],
+        description=record.get("description") or "",
+        due_date=dates["due_date"],
+        priority=record.get("priority"),
+        status=record.get("status"),
+        category=record.get("category") or "",
+        created_at=dates["created_at"],
+        updated_at=dates["updated_at"]
+    )
+
+
+def read_records(path):
+    """
+    Yield (line number, record) for each task in a CSV or JSON Lines file.
+
+    The line number is where the record ends. Raises RecordError for a
+    line that is not JSON.
+    """
+    file_format = _format_for(path)
+
+    with open(path, newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+        else:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield number, json.loads(line)
+                except ValueError as error:
+                    raise RecordError(number, f"invalid JSON ({error})")
+
+
+def write_records(path, records):
+    """Write dicts to a CSV or JSON Lines file one at a time. Returns the count."""
+    file_format = _format_for(path)
+    count = 0
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            for record in records:
+                writer.writerow(record)
+                count += 1
+        else:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+                count += 1
+
+    return count
+
+
+def _read_tasks(user_id, path):
+    """Yield a Task per record of a file, raising RecordError for a bad record."""
+    for line, record in read_records(path):
+        try:
+            yield record_to_task(record, user_id)
+        except ValueError as error:
+            raise RecordError(line, str(error))
+
+
+def import_tasks(user_id, path):
+    """
+    Stream tasks from a file into the database in batched transactions.
+
+    The whole file is checked first, so a bad record raises RecordError
+    (with its line number) before any task is stored. Returns the number
+    of tasks imported.
+    """
+    for _ in _read_tasks(user_id, path):
+        pass
+    return create_tasks(_read_tasks(user_id, path))
+
+
+def export_tasks(user_id, path):
+    """
+    Stream every task of a user into a file.
+
+    Returns the number of tasks exported.
+    """
+    return write_records(path, (task_to_record(task) for task in iter_tasks(user_id)))
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Import or export TaskMaster tasks.")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("username")
+    parser.add_argument("path", help="a .csv or .jsonl file")
+    args = parser.parse_args(argv)
+
+    db_manager.init_db()
+    try:
+        user = get_user_by_username(args.username)
+        if user is None:
+            print(f"No such user: {args.username}", file=sys.stderr)
+            return 1
+
+        try:
+            if args.command == "import":
+                count = import_tasks(user.id, args.path)
+                print(f"Imported {count} tasks for {user}")
+            else:
+                count = export_tasks(user.id, args.path)
+                print(f"Exported {count} tasks for {user}")
+        except (OSError, ValueError) as error:
+            print(f"Could not {args.command} {args.path}: {error}", file=sys.stderr)
+            return 1
+    finally:
+        db_manager.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,8 @@
 # Small helpers: validation + basic logging setup
 
+import calendar
 import logging
-from datetime import datetime
+from datetime import datetime, time, timedelta
 
 # Configure basic logging
 logging.basicConfig(level=logging.INFO)
@@ -9,6 +10,9 @@ logging.basicConfig(level=logging.INFO)
 # Create module-level logger
 logger = logging.getLogger("taskmaster")
 
+# Naive datetimes are treated as UTC when stored as epoch seconds
+EPOCH = datetime(1970, 1, 1)
+
 
 def parse_due_date(text: str):
     """
@@ -28,3 +32,44 @@ def parse_due_date(text: str):
     except ValueError:
         return None
 
+
+def due_deadline(due_date: datetime):
+    """
+    Return the moment a task due on due_date becomes overdue.
+    
+    Due dates are local calendar days (see parse_due_date), so a task is
+    overdue once its due day has ended: from local midnight after it.
+    """
+    return datetime.combine(due_date.date(), time()) + timedelta(days=1)
+
+
+def overdue_cutoff(now: datetime):
+    """
+    Return the first due date that is not overdue at local time now.
+    
+    A task is overdue exactly when its due_date is before this (the start
+    of now's day), which is the same as due_deadline(due_date) <= now.
+    """
+    return datetime.combine(now.date(), time())
+
+
+def to_epoch(value: datetime):
+    """
+    Convert a naive datetime into integer seconds since the epoch.
+    
+    Sub-second precision is dropped.
+    """
+    return calendar.timegm(value.timetuple())
+
+
+def from_epoch(seconds):
+    """
+    Convert integer seconds since the epoch back into a naive datetime.
+    
+    """
+    seconds = int(seconds)
+    try:
+        return datetime.utcfromtimestamp(seconds)
+    except (OverflowError, OSError, ValueError):
+        # Some platforms reject timestamps before 1970
+        return EPOCH + timedelta(seconds=seconds)
@@ -0,0 +1,98 @@
+# Follows the task change log, so every open client sees the others' edits
+
+import argparse
+import sys
+import time
+from taskmaster.config import CHANGE_POLL_INTERVAL_MS
+from taskmaster import storage
+
+
+class ChangeWatcher:
+    """Reports changes to a user's tasks made by any connection or process.
+
+    poll() first reads PRAGMA data_version (see DatabaseManager.data_version),
+    which costs the same however many tasks there are. Only when another
+    commit has happened does it read the user's task_changes rows after
+    the last seq it saw, so an idle poll never touches the tables.
+
+    Not thread-safe: poll from one thread at a time.
+    """
+
+    def __init__(self, user_id):
+        """
+        Initialize a ChangeWatcher for a user.
+
+        """
+        self.user_id = user_id
+        self.seq = None
+        self._version = None
+
+    def sync(self):
+        """Start from the current state: earlier changes are never reported."""
+        self._version = storage.db_manager.data_version()
+        self.seq = storage.get_change_seq()
+
+    def poll(self):
+        """
+        Return the changes since the last poll as (tasks, deleted).
+
+        tasks are the inserted and updated tasks (without descriptions) and
+        deleted the ids of tasks that were deleted or moved to another user.
+        Returns None when the changes cannot be replayed one by one and
+        everything should be reloaded.
+        """
+        if self.seq is None:
+            self.sync()
+            return [], []
+
+        # Read before the log, so a commit landing in between is seen again
+        version = storage.db_manager.data_version()
+        if version == self._version:
+            return [], []
+        self._version = version
+
+        self.seq, tasks, deleted = storage.get_task_changes(self.user_id, self.seq)
+        if tasks is None:
+            return None
+        return tasks, deleted
+
+
+def main(argv=None):
+    """Print changes to a user's tasks as they are committed."""
+    parser = argparse.ArgumentParser(description="Print changes to a user's TaskMaster tasks.")
+    parser.add_argument("username")
+    parser.add_argument("--interval", type=int, default=CHANGE_POLL_INTERVAL_MS,
+                        help="milliseconds between checks")
+    args = parser.parse_args(argv)
+
+    storage.db_manager.init_db()
+    user = storage.get_user_by_username(args.username)
+    if user is None:
+        print(f"No user named {args.username!r}", file=sys.stderr)
+        return 1
+
+    watcher = ChangeWatcher(user.id)
+    watcher.sync()
+    print(f"Watching tasks of {user.username} from change {watcher.seq} (Ctrl+C to stop)")
+
+    try:
+        while True:
+            time.sleep(args.interval / 1000)
+            changes = watcher.poll()
+            if changes is None:
+                print(f"Too many changes to list; reload (now at change {watcher.seq})", flush=True)
+                continue
+            tasks, deleted = changes
+            for task in tasks:
+                print(f"Changed: {task.id} {task.title} [{task.status}] v{task.version}", flush=True)
+            for task_id in deleted:
+                print(f"Deleted: {task_id}", flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        storage.db_manager.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())